@@ -11,18 +11,37 @@ import argparse
 import json
 import math
 import re
-import statistics
-import subprocess
 import sys
-from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, field, is_dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
-
-import lizard
-
-ROOT_SENTINEL = {"Library", "Logs", "obj", "ProjectSettings", "UserSettings", ".git"}
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from metrics_common import (
+    MONO_BEHAVIOUR_CLASS_ID,
+    Buffer,
+    PrefabWeight,
+    build_guid_index,
+    call_with_deadline,
+    decode,
+    decode_lines,
+    field_references,
+    iter_cs_files,
+    iter_yaml_documents,
+    line_of,
+    line_offsets,
+    open_source,
+    prefab_weight,
+    read_meta_guid,
+    script_guid,
+    walk_project,
+)
+
+# Seconds one file may take before calculate_metrics keeps only its line counts.
+DEFAULT_FILE_TIMEOUT = 30.0
 
 # Keywords that should not be interpreted as identifiers for method invocations.
 CONTROL_KEYWORDS = {
@@ -46,6 +65,97 @@ CONTROL_KEYWORDS = {
     "yield",
 }
 
+# Unity message methods invoked by the engine once per (fixed) frame.
+FRAME_MESSAGES = {"Update", "FixedUpdate", "LateUpdate"}
+
+# Roots for the per-frame cost report; OnGUI may run several times per frame.
+FRAME_COST_ROOTS = FRAME_MESSAGES | {"OnGUI"}
+
+# Value types whose construction does not allocate on the managed heap.
+VALUE_TYPES = {
+    "Vector2",
+    "Vector3",
+    "Vector4",
+    "Vector2Int",
+    "Vector3Int",
+    "Quaternion",
+    "Color",
+    "Color32",
+    "Rect",
+    "RectInt",
+    "Bounds",
+    "BoundsInt",
+    "Ray",
+    "Ray2D",
+    "Plane",
+    "Matrix4x4",
+    "LayerMask",
+    "ContactFilter2D",
+    "KeyValuePair",
+    "TimeSpan",
+    "DateTime",
+    "Guid",
+    "bool",
+    "byte",
+    "char",
+    "decimal",
+    "double",
+    "float",
+    "int",
+    "long",
+    "short",
+    "uint",
+    "ulong",
+    "ushort",
+}
+
+# (kind, pattern, weight) for known-expensive Unity APIs and allocation sites.
+FRAME_HAZARD_PATTERNS: Tuple[Tuple[str, re.Pattern[str], int], ...] = (
+    ("find_objects", re.compile(r"\bFind(?:First|Any)?Objects?(?:OfType|ByType)\s*[<(]"), 20),
+    ("instantiate", re.compile(r"\bInstantiate\s*[<(]"), 15),
+    ("gameobject_find", re.compile(r"\bGameObject\.Find(?:WithTag|GameObjectsWithTag|GameObjectWithTag)?\s*\("), 10),
+    ("send_message", re.compile(r"\b(?:SendMessage|BroadcastMessage)\s*\("), 8),
+    ("get_component", re.compile(r"\bGetComponents?(?:InChildren|InParent)?\s*[<(]"), 5),
+    ("destroy", re.compile(r"\bDestroy(?:Immediate)?\s*\("), 5),
+    ("debug_log", re.compile(r"\bDebug\.Log(?:Warning|Error|Format|Exception)?\s*\("), 4),
+    ("camera_main", re.compile(r"\bCamera\.main\b"), 2),
+)
+
+LINQ_PATTERN = re.compile(
+    r"\.(?:Where|Select|SelectMany|OrderBy|OrderByDescending|ThenBy|GroupBy|Distinct|Any|All|"
+    r"First|FirstOrDefault|Last|LastOrDefault|Single|SingleOrDefault|Count|Sum|Average|"
+    r"ToList|ToArray|ToDictionary|Concat|Except|Intersect|Union|Skip|Take|Reverse)\s*\("
+)
+LINQ_WEIGHT = 4
+
+STRING_CONCAT_PATTERN = re.compile(
+    r"""\$@?"|"\s*\+(?![+=])|(?<![+])\+\s*(?=[$@]*")|\bstring\.(?:Format|Concat|Join)\s*\("""
+)
+STRING_CONCAT_WEIGHT = 3
+STATEMENT_BOUNDARY_PATTERN = re.compile(r"[;{}]")
+
+ALLOCATION_PATTERN = re.compile(r"\bnew\b\s*(?P<type>[A-Za-z_][A-Za-z0-9_.]*)?\s*(?P<next>[<\[({])")
+ALLOCATION_WEIGHT = 3
+
+# (category, kind, pattern) for calls that stall the main thread when they run
+# on an async or coroutine chain. ``UnityWebRequest.Result`` is an enum, not a task.
+BLOCKING_CALL_PATTERNS: Tuple[Tuple[str, str, re.Pattern[str]], ...] = (
+    ("blocking_wait", "task_result", re.compile(r"(?<!UnityWebRequest)\.Result\b")),
+    ("blocking_wait", "task_wait", re.compile(r"\.Wait\s*\(|\bTask\.Wait(?:All|Any)\s*\(")),
+    ("blocking_wait", "get_result", re.compile(r"\.GetAwaiter\s*\(\s*\)\s*\.GetResult\s*\(")),
+    ("blocking_wait", "thread_sleep", re.compile(r"\bThread\.Sleep\s*\(")),
+    ("sync_io", "file", re.compile(r"\bFile\.(?:ReadAll|WriteAll|AppendAll|Open|Copy|Move|Delete)\w*\s*\(")),
+    ("sync_io", "directory", re.compile(r"\bDirectory\.(?:Get|Enumerate)(?:Files|Directories)\s*\(")),
+    ("sync_io", "stream", re.compile(r"\bnew\s+(?:StreamReader|StreamWriter|FileStream)\b|\.ReadToEnd\s*\(")),
+    ("sync_io", "network", re.compile(r"\bnew\s+WebClient\b|\.(?:DownloadString|DownloadData|UploadString|GetResponse)\s*\(")),
+    ("sync_io", "resources_load", re.compile(r"\bResources\.Load(?:All)?\s*[<(]")),
+)
+
+# Work that is cheap once but allocates or searches on every streamed chunk.
+PER_CHUNK_PATTERNS: Tuple[Tuple[str, re.Pattern[str]], ...] = tuple(
+    (kind, pattern) for kind, pattern, _ in FRAME_HAZARD_PATTERNS if kind != "camera_main"
+) + (("reflection", re.compile(r"\.Get(?:Properties|Property|Methods|Method|Fields|Field)\s*\(")),)
+
 
 @dataclass
 class MethodMetrics:
@@ -59,6 +169,39 @@ class MethodMetrics:
     complexity: int
     parameter_count: int
     fan_out_calls: Set[str] = field(default_factory=set)
+    fan_in: int = 0
+    frame_hazards: List["FrameHazard"] = field(default_factory=list)
+    is_coroutine: bool = False
+    is_async: bool = False
+    spawn_sites: List["SpawnSite"] = field(default_factory=list)
+    async_hazards: List["AsyncHazard"] = field(default_factory=list)
+    primary_author: Optional[str] = None
+    primary_author_share: float = 0.0
+    author_count: int = 0
+
+
+@dataclass
+class AsyncHazard:
+    category: str
+    kind: str
+    line: int
+    snippet: str
+
+
+@dataclass
+class SpawnSite:
+    line: int
+    argument: str
+    fields: List[str]
+    in_loop: bool
+
+
+@dataclass
+class FrameHazard:
+    kind: str
+    line: int
+    snippet: str
+    weight: int
 
 
 @dataclass
@@ -82,6 +225,65 @@ class ClassMetrics:
     fan_out_classes: Set[str] = field(default_factory=set)
     fan_in: int = 0
     cbo: int = 0
+    primary_author: Optional[str] = None
+    primary_author_share: float = 0.0
+    author_count: int = 0
+
+
+@dataclass
+class CallGraph:
+    """Resolved method call graph in compressed-sparse-row form.
+
+    The callees of ``methods[i]`` are ``targets[offsets[i]:offsets[i + 1]]``.
+    """
+
+    methods: List[MethodMetrics]
+    offsets: array
+    targets: array
+
+    def callees(self, index: int) -> array:
+        return self.targets[self.offsets[index] : self.offsets[index + 1]]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def fan_in(self) -> array:
+        counts = array("i", [0]) * len(self.methods)
+        for caller in range(len(self.methods)):
+            for callee in self.callees(caller):
+                if callee != caller:
+                    counts[callee] += 1
+        return counts
+
+    def reachable_from(
+        self,
+        roots: Iterable[int],
+        within: Optional[Callable[[int], bool]] = None,
+        parents: Optional[Dict[int, int]] = None,
+    ) -> List[int]:
+        """Breadth-first order of methods reachable from ``roots``.
+
+        When ``parents`` is given it receives the caller through which each
+        non-root method was first reached, i.e. a shortest call chain.
+        """
+        visited = bytearray(len(self.methods))
+        queue = deque()
+        for root in roots:
+            if not visited[root]:
+                visited[root] = 1
+                queue.append(root)
+        order: List[int] = []
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for callee in self.callees(current):
+                if not visited[callee] and (within is None or within(callee)):
+                    visited[callee] = 1
+                    if parents is not None:
+                        parents[callee] = current
+                    queue.append(callee)
+        return order
 
 
 @dataclass
@@ -95,24 +297,51 @@ class FileMetrics:
     cyclomatic_total: int
     functions: List[MethodMetrics] = field(default_factory=list)
     classes: List[ClassMetrics] = field(default_factory=list)
+    # Set when analysis ran out of time and only line counts were taken.
+    timed_out: bool = False
 
 
-def iter_cs_files(root: Path) -> Iterable[Path]:
-    for path in root.rglob("*.cs"):
-        try:
-            relative = path.relative_to(root)
-        except ValueError:
-            continue
-        if any(part in ROOT_SENTINEL for part in relative.parts):
-            continue
-        yield path
+NAMESPACE_PATTERN = re.compile(rb"\bnamespace\s+([A-Za-z0-9_.]+)")
+BRACE_PATTERN = re.compile(rb"[{}]")
+
+# Comments and string/char literals in one alternation, so ``//`` inside a
+# string is not mistaken for a comment. An unterminated block comment runs to
+# the end of the file, as it does for the compiler; requiring ``*/`` would
+# rescan the rest of the file from every such ``/*``.
+SOURCE_NOISE_PATTERN = re.compile(
+    rb"""
+    //[^\n]*
+    |/\*.*?(?:\*/|\Z)
+    |(?:\$@|@\$|@)"(?:[^"]|"")*"
+    |\$?"(?:\\.|[^"\\\n])*"
+    |'(?:\\.|[^'\\\n])+'
+    """,
+    re.VERBOSE | re.DOTALL,
+)
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="ignore")
 
 
-def count_using_statements(lines: Sequence[str]) -> int:
+def iter_lines(buf: Buffer, offsets: array) -> Iterator[str]:
+    for number in range(1, len(offsets) + 1):
+        yield decode_lines(buf, offsets, number, number).rstrip("\r\n")
+
+
+def blank_comments_and_strings(buf: Buffer) -> bytes:
+    """Single-pass bytes equivalent of ``strip_comments_and_strings``."""
+
+    def replace(match: re.Match[bytes]) -> bytes:
+        token = match.group(0)
+        if token.startswith(b"/"):
+            return b"\n" * token.count(b"\n")
+        return b" " * len(token)
+
+    return SOURCE_NOISE_PATTERN.sub(replace, buf)
+
+
+def count_using_statements(lines: Iterable[str]) -> int:
     count = 0
     for line in lines:
         stripped = line.strip()
@@ -157,175 +386,309 @@ def split_bases(bases_str: str) -> List[str]:
     return result
 
 
-def class_pattern() -> re.Pattern[str]:
-    return re.compile(
-        r"""
-        (?P<attr>(?:\[[^\]]*\]\s*)*)
-        (?P<modifiers>(?:public|private|protected|internal|static|sealed|abstract|
-                        partial|new|readonly|unsafe|ref|record)\s+)*
-        (?P<kind>class|struct|interface|record)
-        \s+
-        (?P<name>[A-Za-z_][A-Za-z0-9_<>]*)
-        (?P<bases>\s*:\s*[^{]+)?
-        \s*\{
-        """,
-        re.MULTILINE | re.VERBOSE,
-    )
+TYPE_MODIFIERS = (
+    "public", "private", "protected", "internal", "static", "sealed", "abstract",
+    "partial", "new", "readonly", "unsafe", "ref", "record",
+)
+
+
+@dataclass
+class TypeHeader:
+    """``[attributes] modifiers kind Name : bases {`` up to and including the brace."""
+
+    start: int
+    end: int
+    kind: str
+    name: str
+    bases: Optional[str]
+
+
+class TypeHeaderScanner:
+    """Finds type declaration headers in linear time.
+
+    Keywords are found with a lookahead regex; the name, bases and opening
+    brace are matched forward and attributes/modifiers are walked backward
+    from the keyword, never past the previous header. The next ``{`` is
+    cached across keywords, so headers without a body do not rescan the rest
+    of the file.
+    """
+
+    def __init__(self, binary: bool) -> None:
+        def convert(text: str):
+            return text.encode() if binary else text
+
+        self.keyword = re.compile(convert(r"(?=(class|struct|interface|record))"))
+        self.name = re.compile(convert(r"\s+([A-Za-z_][A-Za-z0-9_<>]*)"))
+        self.space = re.compile(convert(r"\s*"))
+        self.modifiers = [convert(word) for word in TYPE_MODIFIERS]
+        self.open_brace, self.colon = convert("{"), convert(":")
+        self.open_bracket, self.close_bracket = convert("["), convert("]")
+        self.decode = (lambda value: value.decode("utf-8", "ignore")) if binary else (lambda value: value)
+
+    def finditer(self, source: Buffer | str) -> Iterator[TypeHeader]:
+        floor = 0
+        next_brace = 0
+        for keyword in self.keyword.finditer(source):
+            position = keyword.start()
+            if position < floor:
+                continue
+            name = self.name.match(source, keyword.end(1))
+            if not name:
+                continue
+            after = self.space.match(source, name.end()).end()
+            following = source[after : after + 1]
+            if following == self.open_brace:
+                brace, bases = after, None
+            elif following == self.colon:
+                if next_brace != -1 and next_brace <= after:
+                    next_brace = source.find(self.open_brace, after + 1)
+                if next_brace == -1:
+                    # No brace anywhere further on, so no later header can match either.
+                    return
+                # ``:`` must be followed by at least one character before the brace.
+                if next_brace == after + 1:
+                    continue
+                brace, bases = next_brace, self.decode(source[name.end() : next_brace])
+            else:
+                continue
+            yield TypeHeader(
+                start=self.prefix_start(source, position, floor),
+                end=brace + 1,
+                kind=self.decode(keyword.group(1)),
+                name=self.decode(name.group(1)),
+                bases=bases,
+            )
+            floor = brace + 1
+
+    def prefix_start(self, source: Buffer | str, position: int, floor: int) -> int:
+        """Walk back over ``modifier\\s+`` words, then ``[attribute]\\s*`` groups."""
+
+        def skip_space(index: int) -> int:
+            while index > floor and source[index - 1 : index].isspace():
+                index -= 1
+            return index
+
+        while True:
+            end = skip_space(position)
+            if end == position:
+                break
+            word = next(
+                (w for w in self.modifiers if end - len(w) >= floor and source[end - len(w) : end] == w),
+                None,
+            )
+            if word is None:
+                break
+            position = end - len(word)
+        while True:
+            end = skip_space(position)
+            if end == floor or source[end - 1 : end] != self.close_bracket:
+                break
+            # Attribute bodies hold no "]", so the earliest "[" after the previous "]" opens it.
+            previous = source.rfind(self.close_bracket, floor, end - 1)
+            opening = source.find(self.open_bracket, max(previous + 1, floor), end - 1)
+            if opening == -1:
+                break
+            position = opening
+        return position
+
+
+TEXT_HEADERS = TypeHeaderScanner(binary=False)
+BINARY_HEADERS = TypeHeaderScanner(binary=True)
+
+
+STRING_LITERAL_PATTERN = re.compile(
+    r"""
+    (?:@?"(?:[^"]|"")*")      # verbatim or normal strings
+    |(?:\$@"(?:[^"]|"")*")    # interpolated verbatim
+    |(?:\$"(?:\\.|[^"\\])*")  # interpolated
+    |'(?:\\.|[^'\\])'         # char
+    """,
+    re.VERBOSE | re.DOTALL,
+)
 
 
 def clean_string_literals(text: str) -> str:
     # Replace string and char literals with spaces to avoid false positives.
-    string_pattern = re.compile(
-        r"""
-        (?:@?"(?:[^"]|"")*")      # verbatim or normal strings
-        |(?:\$@"(?:[^"]|"")*")    # interpolated verbatim
-        |(?:\$"(?:\\.|[^"\\])*")  # interpolated
-        |'(?:\\.|[^'\\])'         # char
-        """,
-        re.VERBOSE | re.DOTALL,
-    )
-    return string_pattern.sub(lambda m: " " * len(m.group(0)), text)
+    return STRING_LITERAL_PATTERN.sub(lambda m: " " * len(m.group(0)), text)
+
+
+def blank_string_contents(text: str) -> str:
+    """Like ``clean_string_literals``, but keep each string's prefix and quotes."""
+
+    def blank(match: re.Match[str]) -> str:
+        literal = match.group(0)
+        if literal.startswith("'"):
+            return " " * len(literal)
+        opening = literal.index('"') + 1
+        return literal[:opening] + " " * (len(literal) - opening - 1) + '"'
+
+    return STRING_LITERAL_PATTERN.sub(blank, text)
+
+
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?(?:\*/|\Z)", re.DOTALL)
 
 
 def remove_comments(text: str) -> str:
-    no_block = re.sub(r"/\*.*?\*/", lambda m: "\n" * m.group(0).count("\n"), text, flags=re.DOTALL)
+    no_block = BLOCK_COMMENT_PATTERN.sub(lambda m: "\n" * m.group(0).count("\n"), text)
     return re.sub(r"//.*", "", no_block)
 
 
-def extract_class_blocks(file_text: str, rel_path: str) -> List[ClassMetrics]:
+def extract_class_blocks(buf: Buffer, rel_path: str, offsets: Optional[array] = None) -> List[ClassMetrics]:
+    """Locate type declarations by byte offset; only the header match is decoded."""
+    if offsets is None:
+        offsets = line_offsets(buf)
     matches = []
-    pattern = class_pattern()
-    for match in pattern.finditer(file_text):
-        brace_index = match.end() - 1
-        body_start = brace_index
-        depth = 0
-        idx = body_start
-        while idx < len(file_text):
-            ch = file_text[idx]
-            if ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-                if depth == 0:
-                    break
-            idx += 1
-        if depth != 0:
+    closing: Optional[Dict[int, int]] = None
+    namespace_starts: List[int] = []
+    namespace_names: List[str] = []
+    for header in BINARY_HEADERS.finditer(buf):
+        if closing is None:
+            closing = matching_braces(buf)
+            for match in NAMESPACE_PATTERN.finditer(buf):
+                namespace_starts.append(match.start())
+                namespace_names.append(match.group(1).decode("ascii"))
+        body_end = closing.get(header.end - 1)
+        if body_end is None:
             continue
-        body_end = idx
-        prefix = file_text[: match.start()]
-        namespace = parse_namespace(prefix)
-        class_body = file_text[body_start + 1 : body_end]
-        start_line = prefix.count("\n") + 1
-        end_line = file_text[: body_end].count("\n") + 1
-        bases = split_bases(match.group("bases") or "")
+        preceding = bisect_left(namespace_starts, header.start)
         metrics = ClassMetrics(
-            name=match.group("name").strip(),
-            kind="record" if match.group("kind") == "record" else match.group("kind"),
+            name=header.name.strip(),
+            kind=header.kind,
             file_path=rel_path,
-            start_line=start_line,
-            end_line=end_line,
-            namespace=namespace,
-            bases_raw=bases,
+            start_line=line_of(offsets, header.start),
+            end_line=line_of(offsets, body_end),
+            namespace=namespace_names[preceding - 1] if preceding else None,
+            bases_raw=split_bases(header.bases or ""),
         )
-        matches.append((metrics, class_body))
-    return [m for m, _ in matches]
+        matches.append(metrics)
+    return matches
+
+
+def matching_braces(buf: Buffer) -> Dict[int, int]:
+    """Offset of the matching ``}`` for every ``{`` that is closed, in one pass."""
+    closing: Dict[int, int] = {}
+    stack: List[int] = []
+    for brace in BRACE_PATTERN.finditer(buf):
+        if brace.group(0) == b"{":
+            stack.append(brace.start())
+        elif stack:
+            closing[stack.pop()] = brace.start()
+    return closing
+
+
+def class_body(class_text: str) -> str:
+    """Text between the braces of a declaration produced by ``extract_class_blocks``."""
+    header = next(TEXT_HEADERS.finditer(class_text), None)
+    start = header.end if header else class_text.find("{") + 1
+    end = class_text.rfind("}")
+    return class_text[start : end if end >= start else len(class_text)]
 
 
 def extract_fields_from_class(class_body: str) -> Set[str]:
-    fields: Set[str] = set()
+    return extract_fields([class_body])
+
+
+FIELD_MODIFIERS = (
+    "public",
+    "private",
+    "protected",
+    "internal",
+    "static",
+    "readonly",
+    "volatile",
+    "const",
+    "unsafe",
+    "new",
+    "sealed",
+    "virtual",
+    "override",
+    "abstract",
+    "extern",
+    "partial",
+)
+# Attribute lists leading a member, such as [Header("...")] [SerializeField].
+LEADING_ATTRIBUTES_PATTERN = re.compile(r"\s*(?:\[[^\]]*\]\s*)*")
+
+
+def iter_field_statements(chunks: Iterable[str]) -> Iterator[str]:
+    """Statements at depth 0 of a class body given as consecutive chunks, attributes included.
+
+    Chunks are the body with member bodies cut out; brace depth carries over
+    between chunks, and a statement never spans a cut.
+    """
     depth = 0
-    buffer = []
-    stripped_body = clean_string_literals(remove_comments(class_body))
-    for ch in stripped_body:
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth = max(0, depth - 1)
-        if depth == 0:
-            if ch == ";":
-                statement = "".join(buffer).strip()
-                buffer = []
-                if not statement or "=>" in statement or "(" in statement:
-                    continue
-                statement = re.sub(r"\[[^\]]*\]\s*", "", statement)
-                declarators = statement.split()
-                if not declarators:
-                    continue
-                # Remove modifiers
-                modifiers = {
-                    "public",
-                    "private",
-                    "protected",
-                    "internal",
-                    "static",
-                    "readonly",
-                    "volatile",
-                    "const",
-                    "unsafe",
-                    "new",
-                    "sealed",
-                    "virtual",
-                    "override",
-                    "abstract",
-                    "extern",
-                    "partial",
-                }
-                declarators = [token for token in declarators if token not in modifiers]
-                if not declarators:
-                    continue
-                # Rehydrate string after removing modifiers for more precise parsing.
-                left_part = re.sub(
-                    r"\b(?:public|private|protected|internal|static|readonly|volatile|const|unsafe|new|sealed|virtual|override|abstract|extern|partial)\b",
-                    "",
-                    statement,
-                ).strip()
-                if not left_part:
+    for chunk in chunks:
+        buffer = []
+        for ch in clean_string_literals(remove_comments(chunk)):
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth = max(0, depth - 1)
+                if depth == 0:
+                    # a member body just closed; its signature is not a field
+                    buffer = []
                     continue
-                segments = split_declarators(left_part)
-                if len(segments) <= 1:
-                    name_token = left_part.split()[-1]
-                    name_token = name_token.split("=")[0].strip()
-                    if name_token.endswith("[]"):
-                        name_token = name_token[:-2]
-                    fields.add(name_token)
+            if depth == 0:
+                if ch == ";":
+                    yield "".join(buffer)
+                    buffer = []
                 else:
-                    type_prefix = segments[0].split()
-                    type_tokens = type_prefix[:-1] if len(type_prefix) > 1 else []
-                    decls = segments[-1].split(",")
-                    for decl in decls:
-                        name_token = decl.split("=")[0].strip()
-                        if " " in name_token:
-                            name_token = name_token.split()[-1]
-                        if name_token.endswith("[]"):
-                            name_token = name_token[:-2]
-                        if name_token:
-                            fields.add(name_token)
-            else:
-                buffer.append(ch)
-        else:
-            if depth < 0:
-                depth = 0
-            # ignore inner content
-    return {name for name in fields if name and name[0].isalpha()}
+                    buffer.append(ch)
 
 
-def split_declarators(segment: str) -> List[str]:
+def split_attributes(statement: str) -> Tuple[str, str]:
+    """(leading attribute lists, rest) of a class-level statement."""
+    end = LEADING_ATTRIBUTES_PATTERN.match(statement).end()
+    return statement[:end], statement[end:]
+
+
+def field_names(statement: str) -> List[str]:
+    """Names a depth-0 statement declares as fields; empty for anything else."""
+    declarators = field_declarators(split_attributes(statement)[1])
+    if not declarators:
+        return []
+    # A method or delegate signature ends with its parameter list.
+    if declarators[0].endswith(")"):
+        return []
+    first = [token for token in declarators[0].split() if token not in FIELD_MODIFIERS]
+    if len(first) < 2:
+        return []
+    names = [first[-1]] + [declarator.split()[-1] for declarator in declarators[1:] if declarator.split()]
+    return [name for name in names if name.isidentifier()]
+
+
+def extract_fields(chunks: Iterable[str]) -> Set[str]:
+    """Fields declared at depth 0 of a class body given as consecutive chunks."""
+    return {name for statement in iter_field_statements(chunks) for name in field_names(statement)}
+
+
+def field_declarators(declaration: str) -> List[str]:
+    """Depth-0 comma-separated declarators, each cut before its initializer.
+
+    Empty for an expression-bodied member. Angle brackets only nest in the
+    type, since ``<`` in an initializer may be a comparison.
+    """
     parts: List[str] = []
     current: List[str] = []
     depth = 0
-    for ch in segment:
-        if ch in "<([{":
+    initializer = False
+    for index, ch in enumerate(declaration):
+        if ch in "([{" or (ch == "<" and not initializer):
             depth += 1
-        elif ch in ">)]}":
+        elif ch in ")]}" or (ch == ">" and not initializer):
             depth = max(0, depth - 1)
-        if ch == "," and depth == 0:
-            if current:
-                parts.append("".join(current).strip())
-                current = []
+        elif depth == 0 and ch == ",":
+            parts.append("".join(current).strip())
+            current = []
+            initializer = False
             continue
-        current.append(ch)
-    if current:
-        parts.append("".join(current).strip())
+        elif depth == 0 and ch == "=" and not initializer:
+            if declaration.startswith("=>", index):
+                return []
+            initializer = True
+        if not initializer:
+            current.append(ch)
+    parts.append("".join(current).strip())
     return parts
 
 
@@ -392,6 +755,175 @@ def compute_method_calls(method_text: str) -> Set[str]:
     return calls
 
 
+def compute_frame_hazards(method_text: str, start_line: int, uses_linq: bool) -> List[FrameHazard]:
+    without_comments = remove_comments(method_text)
+    cleaned = clean_string_literals(without_comments)
+    found: List[Tuple[int, str, str, int]] = []
+
+    for kind, pattern, weight in FRAME_HAZARD_PATTERNS:
+        for match in pattern.finditer(cleaned):
+            found.append((match.start(), kind, match.group(0), weight))
+    if uses_linq:
+        for match in LINQ_PATTERN.finditer(cleaned):
+            found.append((match.start(), "linq", match.group(0), LINQ_WEIGHT))
+    for match in ALLOCATION_PATTERN.finditer(cleaned):
+        type_name = (match.group("type") or "").rsplit(".", 1)[-1]
+        if type_name in VALUE_TYPES:
+            continue
+        # Target-typed ``new()`` and ``new[]`` carry no type name and are counted.
+        found.append((match.start(), "allocation", match.group(0), ALLOCATION_WEIGHT))
+    # Concatenation needs the quotes ``cleaned`` removes, so it is matched on
+    # text that keeps them around blanked contents. A statement such as
+    # "a" + b + "c" matches at each operator but is one hazard.
+    quoted = blank_string_contents(without_comments)
+    boundaries = [match.start() for match in STATEMENT_BOUNDARY_PATTERN.finditer(quoted)]
+    concat_statements: Set[int] = set()
+    for match in STRING_CONCAT_PATTERN.finditer(quoted):
+        statement = bisect_left(boundaries, match.start())
+        if statement not in concat_statements:
+            concat_statements.add(statement)
+            found.append((match.start(), "string_concat", match.group(0).strip(), STRING_CONCAT_WEIGHT))
+
+    found.sort()
+    return [
+        FrameHazard(
+            kind=kind,
+            line=start_line + without_comments.count("\n", 0, offset),
+            snippet=snippet,
+            weight=weight,
+        )
+        for offset, kind, snippet, weight in found
+    ]
+
+
+LOOP_KEYWORD_PATTERN = re.compile(r"\b(for|foreach|while|do)\b")
+INSTANTIATE_CALL_PATTERN = re.compile(r"\bInstantiate\s*(?:<[^>()]*>)?\s*\(\s*(?P<arg>[A-Za-z_][A-Za-z0-9_.]*)")
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+
+def matching_close(text: str, open_index: int) -> int:
+    """Index of the bracket closing ``text[open_index]``, or ``len(text)`` if unbalanced."""
+    pairs = {"(": ")", "{": "}"}
+    opener = text[open_index]
+    closer = pairs[opener]
+    depth = 0
+    for index in range(open_index, len(text)):
+        ch = text[index]
+        if ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(text)
+
+
+def loop_spans(cleaned: str) -> List[Tuple[int, int, str]]:
+    """(start, end, keyword) of each loop body in comment/string-free method text."""
+    spans: List[Tuple[int, int, str]] = []
+    for match in LOOP_KEYWORD_PATTERN.finditer(cleaned):
+        keyword = match.group(1)
+        cursor = match.end()
+        if keyword == "foreach" and cleaned[: match.start()].rstrip().endswith("await"):
+            keyword = "await foreach"
+        if keyword != "do":
+            paren = cleaned.find("(", cursor)
+            if paren == -1:
+                continue
+            if keyword == "while" and cleaned[cursor:paren].strip():
+                continue
+            cursor = matching_close(cleaned, paren) + 1
+            if keyword == "while" and cleaned[cursor:].lstrip().startswith(";"):
+                # trailing ``while (...);`` of a do-loop
+                continue
+        body_start = len(cleaned) - len(cleaned[cursor:].lstrip())
+        if body_start < len(cleaned) and cleaned[body_start] == "{":
+            spans.append((body_start, matching_close(cleaned, body_start), keyword))
+        else:
+            end = cleaned.find(";", body_start)
+            spans.append((body_start, end if end != -1 else len(cleaned), keyword))
+    return spans
+
+
+def method_modifiers(method_text: str) -> Tuple[bool, bool]:
+    """(is_coroutine, is_async) judged from the declaration before the parameter list."""
+    header = method_text.split("(", 1)[0]
+    return bool(re.search(r"\bIEnumerator\b", header)), bool(re.search(r"\basync\b", header))
+
+
+def compute_spawn_sites(method_text: str, start_line: int, fields: Set[str]) -> List[SpawnSite]:
+    cleaned = strip_comments_and_strings(method_text)
+    sites: List[SpawnSite] = []
+    spans = None
+    for match in INSTANTIATE_CALL_PATTERN.finditer(cleaned):
+        if spans is None:
+            spans = loop_spans(cleaned)
+        argument = match.group("arg")
+        name = argument[5:] if argument.startswith("this.") else argument
+        name = name.split(".", 1)[0]
+        if name in fields:
+            candidates = [name]
+        else:
+            # Follow one local alias, e.g. ``var prefab = isPlayer ? a : b;``.
+            assignment = re.search(rf"\b{re.escape(name)}\s*=(?!=)\s*([^;]+);", cleaned[: match.start()])
+            rhs = IDENTIFIER_PATTERN.findall(assignment.group(1)) if assignment else []
+            candidates = sorted({ident for ident in rhs if ident in fields})
+        sites.append(
+            SpawnSite(
+                line=start_line + cleaned.count("\n", 0, match.start()),
+                argument=argument,
+                fields=candidates,
+                in_loop=any(start < match.start() <= end for start, end, _ in spans),
+            )
+        )
+    return sites
+
+
+def stream_loop_spans(cleaned: str) -> List[Tuple[int, int]]:
+    """Loop bodies that run once per streamed chunk or frame.
+
+    That is ``await foreach`` loops and any loop whose body awaits or yields.
+    """
+    return [
+        (start, end)
+        for start, end, keyword in loop_spans(cleaned)
+        if keyword == "await foreach" or re.search(r"\b(?:await|yield\s+return)\b", cleaned[start:end])
+    ]
+
+
+def compute_async_hazards(method_text: str, start_line: int, uses_linq: bool) -> List[AsyncHazard]:
+    cleaned = strip_comments_and_strings(method_text)
+    found: List[Tuple[int, str, str, str]] = []
+    for category, kind, pattern in BLOCKING_CALL_PATTERNS:
+        for match in pattern.finditer(cleaned):
+            found.append((match.start(), category, kind, match.group(0)))
+
+    spans = stream_loop_spans(cleaned) if re.search(r"\b(?:await|yield)\b", cleaned) else []
+    if spans:
+        per_chunk = list(PER_CHUNK_PATTERNS)
+        if uses_linq:
+            per_chunk.append(("linq", LINQ_PATTERN))
+        for kind, pattern in per_chunk:
+            for match in pattern.finditer(cleaned):
+                if any(start < match.start() <= end for start, end in spans):
+                    found.append((match.start(), "per_chunk", kind, match.group(0)))
+        for match in ALLOCATION_PATTERN.finditer(cleaned):
+            type_name = (match.group("type") or "").rsplit(".", 1)[-1]
+            if type_name not in VALUE_TYPES and any(start < match.start() <= end for start, end in spans):
+                found.append((match.start(), "per_chunk", "allocation", match.group(0)))
+
+    found.sort()
+    return [
+        AsyncHazard(
+            category=category,
+            kind=kind,
+            line=start_line + cleaned.count("\n", 0, offset),
+            snippet=snippet.strip(),
+        )
+        for offset, category, kind, snippet in found
+    ]
+
+
 def compute_lcom(method_usages: List[Set[str]]) -> float:
     if len(method_usages) <= 1:
         return 0.0
@@ -411,28 +943,116 @@ def compute_rfc(method_calls: List[Set[str]], method_count: int) -> int:
     return method_count + len(unique_calls)
 
 
-def analyze_cs_file(path: Path, root: Path) -> FileMetrics:
+def lizard_source(buf: Buffer) -> str:
+    """Decoded source for lizard, with an unterminated final block comment closed.
+
+    lizard's tokenizer rescans the rest of the file from every ``/*`` inside
+    an unterminated comment. The comment already runs to the end of the file,
+    so closing it there keeps its meaning and the scan linear.
+    """
+    text = decode(buf)
+    if buf.rfind(b"/*") > buf.rfind(b"*/"):
+        last = None
+        for last in SOURCE_NOISE_PATTERN.finditer(buf):
+            pass
+        token = last.group(0) if last else b""
+        if token.startswith(b"/*") and not (len(token) >= 4 and token.endswith(b"*/")):
+            text += "*/"
+    return text
+
+
+def analyze_cs_file(path: Path, root: Path, timeout: Optional[float] = None) -> FileMetrics:
+    """Analyze one file; past ``timeout`` seconds fall back to line counts only."""
+    try:
+        return call_with_deadline(analyze_cs_path, (path, root), timeout)
+    except TimeoutError:
+        return line_count_metrics(path, root)
+
+
+def analyze_cs_path(path: Path, root: Path) -> FileMetrics:
+    with open_source(path) as buf:
+        return analyze_cs_buffer(buf, path, root)
+
+
+def line_count_metrics(path: Path, root: Path) -> FileMetrics:
+    """Linear-time fallback: LOC and usings without classes or functions."""
+    from loc_metrics import classify_lines
+
+    with open_source(path) as buf:
+        counts = classify_lines(buf)
+        using_count = count_using_statements(iter_lines(buf, line_offsets(buf)))
+    return FileMetrics(
+        path=path.relative_to(root).as_posix(),
+        total_lines=counts.total,
+        blank_lines=counts.blank,
+        comment_lines=counts.comment,
+        code_lines=counts.code_lines,
+        using_count=using_count,
+        cyclomatic_total=0,
+        timed_out=True,
+    )
+
+
+def member_gaps(cls: ClassMetrics) -> List[Tuple[int, int]]:
+    """Line ranges of a class not covered by its methods, in order."""
+    gaps: List[Tuple[int, int]] = []
+    line = cls.start_line
+    for first, last in sorted((method.start_line, method.end_line) for method in cls.methods):
+        first, last = max(first, cls.start_line), min(last, cls.end_line)
+        if first > last:
+            continue
+        if first > line:
+            gaps.append((line, first - 1))
+        line = max(line, last + 1)
+    if line <= cls.end_line:
+        gaps.append((line, cls.end_line))
+    return gaps
+
+
+def class_body_chunks(buf: Buffer, offsets: array, cls: ClassMetrics, identifiers: Set[str]) -> Iterator[str]:
+    """Decode the class body one member gap at a time, for ``extract_fields``.
+
+    Identifiers in each cleaned gap are added to ``identifiers`` on the way,
+    so the gaps are decoded once for fields and fan-out alike.
+    """
+    for first, last in member_gaps(cls):
+        text = decode_lines(buf, offsets, first, last)
+        identifiers.update(IDENTIFIER_PATTERN.findall(strip_comments_and_strings(text)))
+        if first == cls.start_line:
+            header = next(TEXT_HEADERS.finditer(text), None)
+            text = text[header.end :] if header else text
+        if last == cls.end_line:
+            end = text.rfind("}")
+            text = text[:end] if end >= 0 else text
+        yield text
+
+
+def analyze_cs_buffer(buf: Buffer, path: Path, root: Path) -> FileMetrics:
+    """Analyze a mapped C# file, decoding only the class and method slices metrics need."""
+    import lizard
+
+    from loc_metrics import classify_lines
+
     relative_path = path.relative_to(root).as_posix()
-    content = read_text(path)
-    lines = content.splitlines()
-    total_lines = len(lines)
-    blank_lines = sum(1 for line in lines if not line.strip())
-    using_count = count_using_statements(lines)
-    lizard_info = lizard.analyze_file(str(path))
-    code_lines = lizard_info.nloc
-    comment_lines = max(total_lines - blank_lines - code_lines, 0)
+    offsets = line_offsets(buf)
+    # Same line classification as loc_metrics, so both report the same counts.
+    counts = classify_lines(buf)
+    using_count = count_using_statements(iter_lines(buf, offsets))
+    # lizard tokenizes decoded text; this is the only full-size copy and it is
+    # released as soon as the call returns.
+    lizard_info = lizard.analyze_file.analyze_source_code(str(path), lizard_source(buf))
 
     file_metrics = FileMetrics(
         path=relative_path,
-        total_lines=total_lines,
-        blank_lines=blank_lines,
-        comment_lines=comment_lines,
-        code_lines=code_lines,
+        total_lines=counts.total,
+        blank_lines=counts.blank,
+        comment_lines=counts.comment,
+        code_lines=counts.code_lines,
         using_count=using_count,
         cyclomatic_total=0,
     )
 
-    class_blocks = extract_class_blocks(content, relative_path)
+    class_blocks = extract_class_blocks(buf, relative_path, offsets)
     file_metrics.classes.extend(class_blocks)
 
     for func in lizard_info.function_list:
@@ -455,34 +1075,49 @@ def analyze_cs_file(path: Path, root: Path) -> FileMetrics:
         file_metrics.functions.append(method)
         file_metrics.cyclomatic_total += func.cyclomatic_complexity
 
+    uses_linq = buf.find(b"System.Linq") != -1
     class_lookup = {cls.name: cls for cls in class_blocks}
     for method in file_metrics.functions:
         if method.class_name and method.class_name in class_lookup:
             class_lookup[method.class_name].methods.append(method)
 
     for cls in class_blocks:
-        class_slice = content.splitlines()[cls.start_line - 1 : cls.end_line]
-        class_text = "\n".join(class_slice)
-        cls.fields = extract_fields_from_class(class_text)
+        # Only member gaps and method slices are decoded, never the whole class.
+        identifiers: Set[str] = set()
+        cls.fields = extract_fields(class_body_chunks(buf, offsets, cls, identifiers))
         method_usages: List[Set[str]] = []
         method_calls: List[Set[str]] = []
         fan_out_classes: Set[str] = set()
 
+        # Method text is sliced by line, so methods sharing lines (minified or
+        # one-line members) share every result; compute each span once.
+        span_results: Dict[Tuple[int, int], Tuple] = {}
         for method in cls.methods:
-            method_lines = content.splitlines()[method.start_line - 1 : method.end_line]
-            method_text = "\n".join(method_lines)
-            usage = compute_method_field_usage(method_text, cls.fields)
-            calls = compute_method_calls(method_text)
+            span = (method.start_line, method.end_line)
+            if span not in span_results:
+                method_text = decode_lines(buf, offsets, method.start_line, method.end_line)
+                identifiers.update(IDENTIFIER_PATTERN.findall(strip_comments_and_strings(method_text)))
+                span_results[span] = (
+                    compute_method_field_usage(method_text, cls.fields),
+                    compute_method_calls(method_text),
+                    compute_frame_hazards(method_text, method.start_line, uses_linq),
+                    method_modifiers(method_text),
+                    compute_spawn_sites(method_text, method.start_line, cls.fields),
+                    compute_async_hazards(method_text, method.start_line, uses_linq),
+                )
+            usage, calls, frame_hazards, modifiers, spawn_sites, async_hazards = span_results[span]
             method_usages.append(usage)
             method_calls.append(calls)
-            method.fan_out_calls = calls
+            method.fan_out_calls = set(calls)
+            method.frame_hazards = list(frame_hazards)
+            method.is_coroutine, method.is_async = modifiers
+            method.spawn_sites = list(spawn_sites)
+            method.async_hazards = list(async_hazards)
 
         cls.wmc = sum(m.complexity for m in cls.methods)
         cls.rfc = compute_rfc(method_calls, len(cls.methods))
         cls.lcom = compute_lcom(method_usages)
 
-        cleaned_class_text = strip_comments_and_strings(class_text)
-        identifiers = set(re.findall(r"\b([A-Za-z_][A-Za-z0-9_]*)\b", cleaned_class_text))
         for ident in identifiers:
             if ident != cls.name:
                 fan_out_classes.add(ident)
@@ -491,7 +1126,309 @@ def analyze_cs_file(path: Path, root: Path) -> FileMetrics:
     return file_metrics
 
 
-def aggregate_metrics(files: List[FileMetrics]) -> Dict[str, object]:
+def class_ancestry(name: str, lookup: Dict[str, ClassMetrics]) -> List[str]:
+    chain: List[str] = []
+    current = lookup.get(name)
+    while current and current.name not in chain:
+        chain.append(current.name)
+        current = lookup.get(current.base_class) if current.base_class else None
+    return chain
+
+
+def resolve_callees(
+    method: MethodMetrics,
+    symbols: Dict[str, List[int]],
+    methods: List[MethodMetrics],
+    class_lookup: Dict[str, ClassMetrics],
+) -> List[int]:
+    owner = class_lookup.get(method.class_name) if method.class_name else None
+    ancestry = class_ancestry(owner.name, class_lookup) if owner else []
+    dependencies = owner.fan_out_classes if owner else set()
+    resolved: Set[int] = set()
+    for call in method.fan_out_calls:
+        candidates = symbols.get(call)
+        if not candidates:
+            continue
+        # Prefer the caller's own class hierarchy; otherwise only accept
+        # targets in classes the caller is already known to depend on.
+        local = [idx for idx in candidates if methods[idx].class_name in ancestry]
+        if local:
+            resolved.update(local)
+            continue
+        resolved.update(idx for idx in candidates if methods[idx].class_name in dependencies)
+    return sorted(resolved)
+
+
+def build_call_graph(methods: List[MethodMetrics], classes: List[ClassMetrics]) -> CallGraph:
+    symbols: Dict[str, List[int]] = defaultdict(list)
+    for index, method in enumerate(methods):
+        symbols[method.name].append(index)
+    class_lookup = build_class_lookup(classes)
+
+    offsets = array("i", [0])
+    targets = array("i")
+    for method in methods:
+        targets.extend(resolve_callees(method, symbols, methods, class_lookup))
+        offsets.append(len(targets))
+    return CallGraph(methods=methods, offsets=offsets, targets=targets)
+
+
+def summarize_call_graph(graph: CallGraph, top: int = 10) -> Dict[str, object]:
+    methods = graph.methods
+    fan_in = graph.fan_in()
+    for method, count in zip(methods, fan_in):
+        method.fan_in = count
+
+    frame_roots = [idx for idx, method in enumerate(methods) if method.name in FRAME_MESSAGES]
+    roots_report = []
+    for root in frame_roots:
+        reach = graph.reachable_from([root])[1:]
+        roots_report.append(
+            {
+                "method": methods[root].qualified_name,
+                "file": methods[root].file_path,
+                "line": methods[root].start_line,
+                "reachable_methods": len(reach),
+                "reachable_complexity": sum(methods[idx].complexity for idx in reach),
+                "reachable": [methods[idx].qualified_name for idx in reach],
+            }
+        )
+    roots_report.sort(key=lambda item: (-item["reachable_complexity"], item["method"]))
+    per_frame = graph.reachable_from(frame_roots)
+
+    ranked = sorted(range(len(methods)), key=lambda idx: (-fan_in[idx], methods[idx].qualified_name))
+    return {
+        "nodes": len(methods),
+        "edges": graph.edge_count,
+        "frame_roots": roots_report,
+        "per_frame_reachable_methods": len(per_frame),
+        "per_frame_reachable_complexity": sum(methods[idx].complexity for idx in per_frame),
+        "top_fan_in": [
+            {
+                "method": methods[idx].qualified_name,
+                "file": methods[idx].file_path,
+                "fan_in": fan_in[idx],
+            }
+            for idx in ranked[:top]
+            if fan_in[idx]
+        ],
+    }
+
+
+def summarize_frame_costs(graph: CallGraph, classes: List[ClassMetrics]) -> List[Dict[str, object]]:
+    """Rank classes by the weighted hazards reachable from their frame methods.
+
+    Only callees inside the class hierarchy are followed, since calls into
+    other components are reported against those components' own roots.
+    """
+    methods = graph.methods
+    class_lookup = build_class_lookup(classes)
+    roots_by_class: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for index, method in enumerate(methods):
+        if method.class_name and method.name in FRAME_COST_ROOTS:
+            roots_by_class[(method.file_path, method.class_name)].append(index)
+
+    report: List[Dict[str, object]] = []
+    for (file_path, class_name), roots in roots_by_class.items():
+        ancestry = set(class_ancestry(class_name, class_lookup)) or {class_name}
+        reach = graph.reachable_from(roots, within=lambda idx: methods[idx].class_name in ancestry)
+        hazards = []
+        by_kind: Counter[str] = Counter()
+        for idx in reach:
+            method = methods[idx]
+            for hazard in method.frame_hazards:
+                by_kind[hazard.kind] += 1
+                hazards.append(
+                    {
+                        "method": method.qualified_name,
+                        "file": method.file_path,
+                        "line": hazard.line,
+                        "kind": hazard.kind,
+                        "snippet": hazard.snippet,
+                        "weight": hazard.weight,
+                    }
+                )
+        if not hazards:
+            continue
+        report.append(
+            {
+                "class": class_name,
+                "file": file_path,
+                "roots": sorted({methods[idx].name for idx in roots}),
+                "methods_reached": len(reach),
+                "score": sum(item["weight"] for item in hazards),
+                "hazard_counts": dict(sorted(by_kind.items())),
+                "hazards": hazards,
+            }
+        )
+    report.sort(key=lambda item: (-item["score"], item["class"]))
+    return report
+
+
+def render_frame_cost_report(report: List[Dict[str, object]], limit: Optional[int] = None) -> str:
+    lines = [
+        "| Class | File | Roots | Score | Hazards |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for row in report[:limit]:
+        counts = ", ".join(f"{kind} x{count}" for kind, count in row["hazard_counts"].items())
+        lines.append(f"| {row['class']} | {row['file']} | {', '.join(row['roots'])} | {row['score']} | {counts} |")
+    return "\n".join(lines)
+
+
+def collect_prefab_assignments(root: Path, wanted: Dict[str, Set[str]]) -> Dict[Tuple[str, str], Set[str]]:
+    """Scan scenes and prefabs for serialized references assigned to the wanted fields.
+
+    ``wanted`` maps script GUIDs to field names; the result maps
+    (script GUID, field) to the GUIDs of the referenced assets.
+    """
+    assignments: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    for path in walk_project(root):
+        if path.suffix not in (".unity", ".prefab"):
+            continue
+        with open_source(path) as buf:
+            for document in iter_yaml_documents(buf):
+                if document.class_id != MONO_BEHAVIOUR_CLASS_ID:
+                    continue
+                guid = script_guid(buf, document)
+                if guid not in wanted:
+                    continue
+                for name, (_, target) in field_references(buf, document).items():
+                    if target and name in wanted[guid]:
+                        assignments[(guid, name)].add(target)
+    return assignments
+
+
+def summarize_spawn_sites(root: Path, graph: CallGraph) -> List[Dict[str, object]]:
+    """Report Instantiate call sites with the weight of the prefabs their fields reference."""
+    methods = graph.methods
+    site_methods = [idx for idx, method in enumerate(methods) if method.spawn_sites]
+    if not site_methods:
+        return []
+    frame_reach = set(graph.reachable_from(idx for idx, m in enumerate(methods) if m.name in FRAME_MESSAGES))
+    async_reach = set(graph.reachable_from(idx for idx, m in enumerate(methods) if m.is_coroutine or m.is_async))
+
+    script_guids: Dict[str, Optional[str]] = {}
+    wanted: Dict[str, Set[str]] = defaultdict(set)
+    for idx in site_methods:
+        method = methods[idx]
+        if method.file_path not in script_guids:
+            script_guids[method.file_path] = read_meta_guid(root / f"{method.file_path}.meta")
+        guid = script_guids[method.file_path]
+        if guid:
+            for site in method.spawn_sites:
+                wanted[guid].update(site.fields)
+
+    assignments = collect_prefab_assignments(root, wanted) if wanted else {}
+    prefab_paths = build_guid_index(root, {".prefab"}) if assignments else {}
+    weights: Dict[str, PrefabWeight] = {}
+
+    report: List[Dict[str, object]] = []
+    for idx in site_methods:
+        method = methods[idx]
+        guid = script_guids.get(method.file_path)
+        for site in method.spawn_sites:
+            prefabs = []
+            for field_name in site.fields:
+                for target in sorted(assignments.get((guid, field_name), ())):
+                    prefab = prefab_paths.get(target)
+                    if not prefab:
+                        continue
+                    if prefab not in weights:
+                        weights[prefab] = prefab_weight(root / prefab)
+                    prefabs.append({"field": field_name, "prefab": prefab, **asdict(weights[prefab])})
+            report.append(
+                {
+                    "method": method.qualified_name,
+                    "file": method.file_path,
+                    "line": site.line,
+                    "argument": site.argument,
+                    "prefabs": prefabs,
+                    "max_components": max((p["components"] for p in prefabs), default=0),
+                    "in_loop": site.in_loop,
+                    "reachable_from_frame": idx in frame_reach,
+                    "coroutine_or_async": idx in async_reach,
+                }
+            )
+    report.sort(
+        key=lambda row: (
+            -(row["reachable_from_frame"] + row["in_loop"] + row["coroutine_or_async"]),
+            -row["max_components"],
+            row["file"],
+            row["line"],
+        )
+    )
+    return report
+
+
+ASYNC_HAZARD_ORDER = {"blocking_wait": 0, "sync_io": 1, "per_chunk": 2}
+
+
+def summarize_async_hazards(graph: CallGraph) -> Dict[str, object]:
+    """Report main-thread stalls on call chains that start at async methods or coroutines.
+
+    Chains start at async/coroutine methods no other async/coroutine method
+    calls, and each hazard is listed with the shortest chain reaching it.
+    """
+    methods = graph.methods
+    entries = [idx for idx, method in enumerate(methods) if method.is_async or method.is_coroutine]
+    called = {callee for caller in entries for callee in graph.callees(caller) if callee != caller}
+    roots = [idx for idx in entries if idx not in called]
+    parents: Dict[int, int] = {}
+    reach = graph.reachable_from(roots, parents=parents)
+    seen = set(reach)
+    # Entries only reachable through a cycle of async methods start their own chain.
+    leftover = [idx for idx in entries if idx not in seen]
+    if leftover:
+        reach.extend(graph.reachable_from(leftover, within=lambda idx: idx not in seen, parents=parents))
+
+    hazards: List[Dict[str, object]] = []
+    for idx in reach:
+        method = methods[idx]
+        if not method.async_hazards:
+            continue
+        chain = [idx]
+        while chain[-1] in parents:
+            chain.append(parents[chain[-1]])
+        chain_names = [methods[step].qualified_name for step in reversed(chain)]
+        for hazard in method.async_hazards:
+            hazards.append(
+                {
+                    "method": method.qualified_name,
+                    "file": method.file_path,
+                    "line": hazard.line,
+                    "category": hazard.category,
+                    "kind": hazard.kind,
+                    "snippet": hazard.snippet,
+                    "chain": chain_names,
+                }
+            )
+    hazards.sort(key=lambda item: (ASYNC_HAZARD_ORDER[item["category"]], item["file"], item["line"]))
+    return {
+        "entries": len(entries),
+        "chain_roots": len(roots) + len(leftover),
+        "methods_reached": len(reach),
+        "hazard_counts": dict(sorted(Counter(item["category"] for item in hazards).items())),
+        "hazards": hazards,
+    }
+
+
+def render_async_hazard_report(report: Dict[str, object], limit: Optional[int] = None) -> str:
+    lines = [
+        "| Location | Category | Kind | Snippet | Chain |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for row in report["hazards"][:limit]:
+        chain = " -> ".join(row["chain"])
+        lines.append(
+            f"| {row['file']}:{row['line']} | {row['category']} | {row['kind']} | `{row['snippet']}` | {chain} |"
+        )
+    return "\n".join(lines)
+
+
+def aggregate_metrics(files: List[FileMetrics], root: Optional[Path] = None) -> Dict[str, object]:
+    import statistics
+
     all_methods = [method for f in files for method in f.functions]
     all_classes = [cls for f in files for cls in f.classes]
     assign_class_bases(all_classes)
@@ -507,6 +1444,12 @@ def aggregate_metrics(files: List[FileMetrics]) -> Dict[str, object]:
             if dep in class_lookup:
                 class_lookup[dep].fan_in += 1
 
+    call_graph = build_call_graph(all_methods, all_classes)
+    call_graph_summary = summarize_call_graph(call_graph)
+    frame_cost = summarize_frame_costs(call_graph, all_classes)
+    spawn_sites = summarize_spawn_sites(root, call_graph) if root is not None else []
+    async_hazards = summarize_async_hazards(call_graph)
+
     total_loc = sum(f.total_lines for f in files)
     total_code = sum(f.code_lines for f in files)
     total_comments = sum(f.comment_lines for f in files)
@@ -539,6 +1482,10 @@ def aggregate_metrics(files: List[FileMetrics]) -> Dict[str, object]:
             }
             for cls in all_classes
         ],
+        "call_graph": call_graph_summary,
+        "frame_cost": frame_cost,
+        "spawn_sites": spawn_sites,
+        "async_hazards": async_hazards,
         "stats": stats,
     }
 
@@ -547,10 +1494,13 @@ def detect_duplicate_lines(cs_files: Iterable[Path]) -> Dict[str, float]:
     counter: Counter[str] = Counter()
     total = 0
     for path in cs_files:
-        content = read_text(path)
-        stripped = strip_comments_and_strings(content)
-        for line in stripped.splitlines():
-            normalized = line.strip()
+        with open_source(path) as buf:
+            stripped = blank_comments_and_strings(buf)
+        # Slice one line at a time; splitlines() would copy the file twice more.
+        offsets = line_offsets(stripped)
+        for index, start in enumerate(offsets):
+            end = offsets[index + 1] if index + 1 < len(offsets) else len(stripped)
+            normalized = stripped[start:end].strip().decode("utf-8", "ignore")
             if len(normalized) < 5:
                 continue
             total += 1
@@ -560,6 +1510,11 @@ def detect_duplicate_lines(cs_files: Iterable[Path]) -> Dict[str, float]:
     return {"duplicate_lines": duplicates, "total_considered": total, "percentage": percentage}
 
 
+def is_sprite_meta(meta_path: Path) -> bool:
+    with open_source(meta_path) as buf:
+        return buf.find(b"spriteMode:") != -1 or buf.find(b"textureType: Sprite") != -1
+
+
 def collect_asset_inventory(root: Path) -> Dict[str, int]:
     assets_dir = root / "Assets"
     if not assets_dir.exists():
@@ -581,7 +1536,7 @@ def collect_asset_inventory(root: Path) -> Dict[str, int]:
     counts["sprites"] = 0
     counts["asmdef"] = 0
 
-    meta_cache: Dict[Path, Optional[str]] = {}
+    meta_cache: Dict[Path, bool] = {}
 
     for path in assets_dir.rglob("*"):
         if path.is_dir():
@@ -591,23 +1546,24 @@ def collect_asset_inventory(root: Path) -> Dict[str, int]:
             if suffix in exts:
                 counts[key] += 1
         if suffix == ".asset":
-            text = read_text(path)
-            if "m_Script:" in text or "MonoBehaviour:" in text or "ScriptableObject:" in text:
-                counts["scriptable_objects"] += 1
+            with open_source(path) as buf:
+                if any(buf.find(marker) != -1 for marker in (b"m_Script:", b"MonoBehaviour:", b"ScriptableObject:")):
+                    counts["scriptable_objects"] += 1
         if suffix == ".asmdef":
             counts["asmdef"] += 1
         if suffix in extensions["textures"]:
             meta_path = path.with_suffix(path.suffix + ".meta")
             if meta_path not in meta_cache:
-                meta_cache[meta_path] = read_text(meta_path) if meta_path.exists() else None
-            meta_text = meta_cache[meta_path]
-            if meta_text and ("spriteMode:" in meta_text or "textureType: Sprite" in meta_text):
+                meta_cache[meta_path] = meta_path.exists() and is_sprite_meta(meta_path)
+            if meta_cache[meta_path]:
                 counts["sprites"] += 1
 
     return counts
 
 
 def collect_git_metrics(root: Path) -> Dict[str, object]:
+    import subprocess
+
     try:
         proc = subprocess.run(
             ["git", "log", "--pretty=%H|%ad", "--date=short", "--numstat"],
@@ -678,18 +1634,27 @@ def collect_test_metrics(cs_files: Iterable[Path]) -> Dict[str, int]:
     for path in cs_files:
         rel = "/".join(path.parts)
         if "Test" in path.name or "Tests" in rel:
-            text = read_text(path)
-            occurrences = len(re.findall(r"\[Test\]", text))
+            with open_source(path) as buf:
+                occurrences = len(re.findall(rb"\[Test\]", buf))
             if occurrences:
                 test_files += 1
                 test_methods += occurrences
     return {"test_files_with_attributes": test_files, "test_method_count": test_methods}
 
 
-def calculate_metrics(root: Path) -> Dict[str, object]:
+def calculate_metrics(
+    root: Path,
+    file_metrics: Optional[List[FileMetrics]] = None,
+    ownership: bool = False,
+    file_timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+) -> Dict[str, object]:
     cs_files = list(iter_cs_files(root))
-    file_metrics = [analyze_cs_file(path, root) for path in cs_files]
-    summary = aggregate_metrics(file_metrics)
+    if file_metrics is None:
+        file_metrics = [analyze_cs_file(path, root, file_timeout) for path in cs_files]
+    ownership_summary = attach_ownership(root, file_metrics) if ownership else None
+    summary = aggregate_metrics(file_metrics, root)
+    if ownership_summary is not None:
+        summary["ownership"] = ownership_summary
     duplicate_info = detect_duplicate_lines(cs_files)
     asset_inventory = collect_asset_inventory(root)
     git_metrics = collect_git_metrics(root)
@@ -702,28 +1667,157 @@ def calculate_metrics(root: Path) -> Dict[str, object]:
             "git": git_metrics,
             "tests": test_metrics,
             "cs_file_count": len(cs_files),
+            "timed_out_files": [f.path for f in file_metrics if f.timed_out],
         }
     )
     return summary
 
 
+def approximate_metrics(root: Path, error: float, confidence: float, seed: int) -> Dict[str, object]:
+    """Estimate the headline stats from a stratified sample of files (see metrics_sampling)."""
+    from metrics_sampling import estimate_quantile, estimate_ratio, estimate_total, plan_sample
+
+    plan = plan_sample(root, iter_cs_files(root), error=error, confidence=confidence, seed=seed)
+    analyzed = {path: analyze_cs_file(root / path, root, DEFAULT_FILE_TIMEOUT) for path in plan.sampled}
+
+    def per_file(value: Callable[[FileMetrics], float]) -> Dict[str, float]:
+        return {path: value(metrics) for path, metrics in analyzed.items()}
+
+    total_lines = per_file(lambda f: f.total_lines)
+    comment_lines = per_file(lambda f: f.comment_lines)
+    methods = per_file(lambda f: len(f.functions))
+    complexity = per_file(lambda f: f.cyclomatic_total)
+    method_loc = per_file(lambda f: sum(m.loc for m in f.functions))
+    estimates = {
+        "total_loc": estimate_total(plan, total_lines),
+        "total_code_loc": estimate_total(plan, per_file(lambda f: f.code_lines)),
+        "total_comment_loc": estimate_total(plan, comment_lines),
+        "total_blank_loc": estimate_total(plan, per_file(lambda f: f.blank_lines)),
+        "comment_density": estimate_ratio(plan, comment_lines, total_lines).scaled(100),
+        "total_methods": estimate_total(plan, methods),
+        "total_complexity": estimate_total(plan, complexity),
+        "average_file_loc": estimate_ratio(plan, total_lines, per_file(lambda f: 1)),
+        "average_method_loc": estimate_ratio(plan, method_loc, methods),
+        "median_method_loc": estimate_quantile(plan, {p: [m.loc for m in f.functions] for p, f in analyzed.items()}),
+        "average_method_complexity": estimate_ratio(plan, complexity, methods),
+        "median_method_complexity": estimate_quantile(
+            plan, {p: [m.complexity for m in f.functions] for p, f in analyzed.items()}
+        ),
+    }
+    return {"approx": plan.describe(), "stats": {name: asdict(value) for name, value in estimates.items()}}
+
+
+def attach_ownership(
+    root: Path, files: List[FileMetrics], cache_dir: Optional[Path] = None, workers: Optional[int] = None
+) -> Dict[str, object]:
+    """Set blame-based ownership on every class and method and summarize it."""
+    from ownership import load_blames
+
+    blames = load_blames(root, [f.path for f in files], cache_dir=cache_dir, workers=workers)
+    author_lines: Counter[str] = Counter()
+    single_owner_classes = 0
+    for file_metrics in files:
+        blame = blames.get(file_metrics.path)
+        if blame is None:
+            continue
+        author_lines.update(blame.authors(1, file_metrics.total_lines))
+        for entity in [*file_metrics.classes, *file_metrics.functions]:
+            owner = blame.ownership(entity.start_line, entity.end_line)
+            entity.primary_author = owner.primary_author
+            entity.primary_author_share = owner.primary_author_share
+            entity.author_count = owner.author_count
+        single_owner_classes += sum(1 for cls in file_metrics.classes if cls.author_count == 1)
+    return {
+        "files_blamed": len(blames),
+        "authors": dict(author_lines.most_common()),
+        "single_owner_classes": single_owner_classes,
+    }
+
+
+def json_default(value: object) -> object:
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Repository metrics collector")
     parser.add_argument("--root", default=".", help="Repository root directory")
     parser.add_argument("--output", help="Optional JSON output file path")
+    parser.add_argument(
+        "--frame-report",
+        action="store_true",
+        help="Print the ranked per-frame cost report as markdown to stderr",
+    )
+    parser.add_argument(
+        "--async-report",
+        action="store_true",
+        help="Print blocking calls on async/coroutine call chains as markdown to stderr",
+    )
+    parser.add_argument(
+        "--frame-budget",
+        type=int,
+        help="Exit with status 1 when any class exceeds this per-frame cost score",
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="Estimate stats with confidence intervals from a stratified sample of files",
+    )
+    parser.add_argument("--error", type=float, default=0.05, help="Relative error bound for --approx (default: 0.05)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --approx (default: 0.95)")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed for --approx (default: 0)")
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        default=DEFAULT_FILE_TIMEOUT,
+        help=f"Seconds per file before falling back to line counts only; 0 disables (default: {DEFAULT_FILE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--ownership",
+        action="store_true",
+        help="Add git blame author share and author count to classes and methods",
+    )
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
     if not root.exists():
         raise SystemExit(f"Root path not found: {root}")
 
-    metrics = calculate_metrics(root)
-    output = json.dumps(metrics, indent=2)
+    if args.approx:
+        if args.frame_report or args.async_report or args.frame_budget is not None:
+            parser.error("--approx cannot be combined with the frame or async reports")
+        output = json.dumps(approximate_metrics(root, args.error, args.confidence, args.seed), indent=2)
+        if args.output:
+            Path(args.output).write_text(output, encoding="utf-8")
+        else:
+            print(output)
+        return
+
+    metrics = calculate_metrics(root, ownership=args.ownership, file_timeout=args.file_timeout or None)
+    output = json.dumps(metrics, indent=2, default=json_default)
     if args.output:
         Path(args.output).write_text(output, encoding="utf-8")
     else:
         print(output)
 
+    if args.frame_report:
+        print(render_frame_cost_report(metrics["frame_cost"]), file=sys.stderr)
+    if args.async_report:
+        print(render_async_hazard_report(metrics["async_hazards"]), file=sys.stderr)
+    if args.frame_budget is not None:
+        over_budget = [row for row in metrics["frame_cost"] if row["score"] > args.frame_budget]
+        if over_budget:
+            for row in over_budget:
+                print(
+                    f"per-frame cost {row['score']} exceeds budget {args.frame_budget}: "
+                    f"{row['class']} ({row['file']})",
+                    file=sys.stderr,
+                )
+            raise SystemExit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Compile-domain impact of Unity assembly definitions.
+
+Every ``.cs`` file is mapped to the assembly Unity compiles it into: the
+nearest ``.asmdef``/``.asmref`` folder, otherwise one of the predefined
+``Assembly-CSharp`` assemblies. Editing a file recompiles its assembly and
+every assembly that references it, so each assembly is reported with its size
+and that reverse-dependency "blast radius". For the most churned files the
+class dependencies from ``aggregate_metrics`` show how an assembly could be
+split so that editing the file recompiles less code.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from metrics_common import read_meta_guid, walk_project
+
+ASSEMBLY_CSHARP = "Assembly-CSharp"
+ASSEMBLY_CSHARP_EDITOR = "Assembly-CSharp-Editor"
+ASSEMBLY_CSHARP_FIRSTPASS = "Assembly-CSharp-firstpass"
+ASSEMBLY_CSHARP_EDITOR_FIRSTPASS = "Assembly-CSharp-Editor-firstpass"
+
+# Folders whose scripts compile into the firstpass assemblies when no asmdef applies.
+FIRSTPASS_FOLDERS = {"Plugins", "Standard Assets", "Pro Standard Assets"}
+
+# References between the predefined assemblies; all of them also reference
+# every asmdef with ``autoReferenced`` set.
+PREDEFINED_REFERENCES = {
+    ASSEMBLY_CSHARP_FIRSTPASS: set(),
+    ASSEMBLY_CSHARP: {ASSEMBLY_CSHARP_FIRSTPASS},
+    ASSEMBLY_CSHARP_EDITOR_FIRSTPASS: {ASSEMBLY_CSHARP_FIRSTPASS},
+    ASSEMBLY_CSHARP_EDITOR: {ASSEMBLY_CSHARP, ASSEMBLY_CSHARP_FIRSTPASS, ASSEMBLY_CSHARP_EDITOR_FIRSTPASS},
+}
+
+
+@dataclass
+class AssemblyDefinition:
+    name: str
+    folder: str
+    references: List[str] = field(default_factory=list)
+    include_platforms: List[str] = field(default_factory=list)
+    exclude_platforms: List[str] = field(default_factory=list)
+    auto_referenced: bool = True
+
+    @property
+    def editor_only(self) -> bool:
+        return self.include_platforms == ["Editor"]
+
+
+def read_asmdefs(root: Path) -> Tuple[Dict[str, AssemblyDefinition], Dict[str, str]]:
+    """Parse every ``.asmdef`` and ``.asmref`` below ``root``.
+
+    Returns the definitions by name and a map from each folder holding an
+    asmdef or asmref to the assembly its scripts compile into.
+    """
+    definitions: Dict[str, AssemblyDefinition] = {}
+    by_guid: Dict[str, str] = {}
+    asmrefs: List[Tuple[str, str]] = []
+    for path in walk_project(root):
+        if path.suffix not in (".asmdef", ".asmref"):
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="utf-8-sig"))
+        except (OSError, ValueError):
+            continue
+        folder = path.parent.relative_to(root).as_posix()
+        if path.suffix == ".asmref":
+            if data.get("reference"):
+                asmrefs.append((folder, data["reference"]))
+            continue
+        name = data.get("name") or path.stem
+        definitions[name] = AssemblyDefinition(
+            name=name,
+            folder=folder,
+            references=list(data.get("references", [])),
+            include_platforms=list(data.get("includePlatforms", [])),
+            exclude_platforms=list(data.get("excludePlatforms", [])),
+            auto_referenced=data.get("autoReferenced", True),
+        )
+        guid = read_meta_guid(path.with_name(path.name + ".meta"))
+        if guid:
+            by_guid[guid] = name
+
+    def resolve(reference: str) -> str:
+        # References are stored either by name or as ``GUID:<asmdef meta guid>``.
+        if reference.startswith("GUID:"):
+            return by_guid.get(reference[5:], reference)
+        return reference
+
+    for definition in definitions.values():
+        definition.references = [resolve(reference) for reference in definition.references]
+    folders = {definition.folder: definition.name for definition in definitions.values()}
+    for folder, reference in asmrefs:
+        folders[folder] = resolve(reference)
+    return definitions, folders
+
+
+def predefined_assembly(rel_path: str) -> str:
+    parts = PurePosixPath(rel_path).parts[:-1]
+    editor = "Editor" in parts
+    firstpass = len(parts) > 1 and parts[0] == "Assets" and parts[1] in FIRSTPASS_FOLDERS
+    if firstpass:
+        return ASSEMBLY_CSHARP_EDITOR_FIRSTPASS if editor else ASSEMBLY_CSHARP_FIRSTPASS
+    return ASSEMBLY_CSHARP_EDITOR if editor else ASSEMBLY_CSHARP
+
+
+def assembly_for(rel_path: str, folders: Dict[str, str]) -> str:
+    """Assembly of a project-relative script: nearest asmdef/asmref folder, else predefined."""
+    for parent in PurePosixPath(rel_path).parents:
+        name = folders.get(parent.as_posix())
+        if name:
+            return name
+    return predefined_assembly(rel_path)
+
+
+def declared_references(definitions: Dict[str, AssemblyDefinition], present: Iterable[str]) -> Dict[str, Set[str]]:
+    """Assembly reference graph restricted to assemblies compiled from this project."""
+    present = set(present)
+    auto = {name for name, definition in definitions.items() if definition.auto_referenced}
+    graph: Dict[str, Set[str]] = {}
+    for name in present:
+        if name in definitions:
+            graph[name] = set(definitions[name].references)
+        else:
+            graph[name] = PREDEFINED_REFERENCES.get(name, set()) | auto
+        graph[name] = {target for target in graph[name] if target in present and target != name}
+    return graph
+
+
+def reverse_closure(edges: Dict[str, Set[str]], start: str) -> Set[str]:
+    """``start`` plus everything that reaches it through ``edges`` (a dependents map)."""
+    seen = {start}
+    stack = [start]
+    while stack:
+        for dependent in edges.get(stack.pop(), ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                stack.append(dependent)
+    return seen
+
+
+def invert(graph: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    inverted: Dict[str, Set[str]] = defaultdict(set)
+    for source, targets in graph.items():
+        for target in targets:
+            inverted[target].add(source)
+    return inverted
+
+
+def file_churn(root: Path, since: Optional[str] = None) -> Counter[str]:
+    """Number of commits touching each file, relative to ``root``."""
+    import subprocess
+
+    command = ["git", "log", "--name-only", "--relative", "--pretty=format:"]
+    if since:
+        command.append(f"--since={since}")
+    try:
+        proc = subprocess.run(command + ["--", "."], cwd=root, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return Counter()
+    return Counter(line for line in proc.stdout.splitlines() if line.endswith(".cs"))
+
+
+def file_dependencies(classes: List[dict]) -> Dict[str, Set[str]]:
+    """File -> files declaring the classes it depends on, from aggregated class metrics."""
+    declared_in: Dict[str, Set[str]] = defaultdict(set)
+    for cls in classes:
+        declared_in[cls["name"]].add(cls["file_path"])
+    dependencies: Dict[str, Set[str]] = defaultdict(set)
+    for cls in classes:
+        for dependency in cls["fan_out_classes"]:
+            dependencies[cls["file_path"]].update(declared_in.get(dependency, ()))
+    for source, targets in dependencies.items():
+        targets.discard(source)
+    return dependencies
+
+
+def analyze(root: Path, since: Optional[str] = None, top: int = 10) -> Dict[str, object]:
+    from analyze_code_metrics import DEFAULT_FILE_TIMEOUT, aggregate_metrics, analyze_cs_file, iter_cs_files
+
+    definitions, folders = read_asmdefs(root)
+    files = [analyze_cs_file(path, root, DEFAULT_FILE_TIMEOUT) for path in iter_cs_files(root)]
+    summary = aggregate_metrics(files)
+    code_lines = {metrics.path: metrics.code_lines for metrics in files}
+    assembly_of = {metrics.path: assembly_for(metrics.path, folders) for metrics in files}
+
+    members: Dict[str, List[str]] = defaultdict(list)
+    for path, assembly in assembly_of.items():
+        members[assembly].append(path)
+    size = {name: sum(code_lines[path] for path in paths) for name, paths in members.items()}
+
+    references = declared_references(definitions, members)
+    dependents = invert(references)
+    blast = {name: reverse_closure(dependents, name) for name in members}
+    recompile_loc = {name: sum(size[member] for member in blast[name]) for name in members}
+
+    dependencies = file_dependencies(summary["classes"])
+    observed: Dict[str, Counter[str]] = defaultdict(Counter)
+    for source, targets in dependencies.items():
+        for target in targets:
+            if assembly_of[source] != assembly_of[target]:
+                observed[assembly_of[source]][assembly_of[target]] += 1
+
+    churn = file_churn(root, since)
+    assemblies = []
+    for name in sorted(members, key=lambda item: (-recompile_loc[item], item)):
+        definition = definitions.get(name)
+        assemblies.append(
+            {
+                "name": name,
+                "asmdef": f"{definition.folder}/{name}.asmdef" if definition else None,
+                "files": len(members[name]),
+                "code_loc": size[name],
+                "references": sorted(references[name]),
+                "observed_references": dict(sorted(observed[name].items())),
+                "include_platforms": definition.include_platforms if definition else [],
+                "exclude_platforms": definition.exclude_platforms if definition else [],
+                "editor_only": definition.editor_only if definition else "Editor" in name,
+                "dependents": sorted(blast[name] - {name}),
+                "recompile_loc": recompile_loc[name],
+                "churn_commits": sum(churn[path] for path in members[name]),
+            }
+        )
+
+    return {
+        "assemblies": assemblies,
+        "asmdef_count": len(definitions),
+        "split_suggestions": suggest_splits(members, assembly_of, dependencies, code_lines, recompile_loc, churn, top),
+    }
+
+
+def suggest_splits(
+    members: Dict[str, List[str]],
+    assembly_of: Dict[str, str],
+    dependencies: Dict[str, Set[str]],
+    code_lines: Dict[str, int],
+    recompile_loc: Dict[str, int],
+    churn: Counter[str],
+    top: int,
+) -> List[Dict[str, object]]:
+    """Rank churned files by the recompile LOC a split of their assembly would save.
+
+    The files of the assembly that depend on a churned file, directly or
+    transitively, form the part that must recompile with it. Everything else
+    in the assembly does not depend on that part and can move to a separate
+    assembly underneath it, so only the dependent part plus the assembly's
+    dependents recompile when the file changes. Savings are weighted by the
+    file's commit count.
+    """
+    dependents: Dict[str, Set[str]] = defaultdict(set)
+    for source, targets in dependencies.items():
+        for target in targets:
+            if assembly_of[source] == assembly_of[target]:
+                dependents[target].add(source)
+
+    suggestions = []
+    for path, commits in churn.items():
+        assembly = assembly_of.get(path)
+        if assembly is None or len(members[assembly]) < 2:
+            continue
+        upper = reverse_closure(dependents, path)
+        upper_loc = sum(code_lines[member] for member in upper)
+        saved = sum(code_lines[member] for member in members[assembly]) - upper_loc
+        if saved <= 0:
+            continue
+        suggestions.append(
+            {
+                "file": path,
+                "assembly": assembly,
+                "churn_commits": commits,
+                "recompile_loc": recompile_loc[assembly],
+                "recompile_loc_after_split": recompile_loc[assembly] - saved,
+                "saved_loc_per_edit": saved,
+                "weighted_savings": saved * commits,
+                "keep_with_file": sorted(upper - {path}),
+                "movable_files": len(members[assembly]) - len(upper),
+            }
+        )
+    suggestions.sort(key=lambda item: (-item["weighted_savings"], item["file"]))
+    return suggestions[:top]
+
+
+def render_markdown(report: Dict[str, object]) -> str:
+    lines = [
+        "| Assembly | Files | Code LOC | Dependents | Recompile LOC | Churn |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for row in report["assemblies"]:
+        dependents = ", ".join(row["dependents"]) or "-"
+        lines.append(
+            f"| {row['name']} | {row['files']} | {row['code_loc']} | {dependents} | "
+            f"{row['recompile_loc']} | {row['churn_commits']} |"
+        )
+    if report["split_suggestions"]:
+        lines += [
+            "",
+            "| Churned file | Assembly | Commits | Recompile LOC | After split | Files kept with it |",
+            "| --- | --- | --- | --- | --- | --- |",
+        ]
+        for row in report["split_suggestions"]:
+            lines.append(
+                f"| {row['file']} | {row['assembly']} | {row['churn_commits']} | {row['recompile_loc']} | "
+                f"{row['recompile_loc_after_split']} | {len(row['keep_with_file'])} |"
+            )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Assembly definition recompile impact for a Unity project.")
+    parser.add_argument("--root", default=".", help="Project root directory (default: current).")
+    parser.add_argument("--output", help="Optional JSON output file.")
+    parser.add_argument("--markdown", action="store_true", help="Render markdown tables.")
+    parser.add_argument("--since", help="Only count churn from commits after this date (git --since).")
+    parser.add_argument("--top", type=int, default=10, help="Number of split suggestions to list.")
+    args = parser.parse_args()
+
+    data = analyze(Path(args.root).resolve(), since=args.since, top=args.top)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if args.markdown:
+        print(render_markdown(data))
+    elif not args.output:
+        print(json.dumps(data, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import re
+import struct
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 ASSET_EXTENSIONS = {
@@ -22,41 +25,438 @@ ASSET_EXTENSIONS = {
 }
 
 
-def enumerate_assets(assets_dir: Path) -> Dict[str, int]:
+def empty_counts() -> Dict[str, int]:
     counts = {key: 0 for key in ASSET_EXTENSIONS}
     counts["scriptable_objects"] = 0
     counts["sprites"] = 0
     counts["asmdef"] = 0
+    return counts
 
+
+def enumerate_assets(assets_dir: Path) -> Dict[str, int]:
+    counts = empty_counts()
     meta_cache: Dict[Path, str] = {}
 
     for path in assets_dir.rglob("*"):
         if path.is_dir():
             continue
-        suffix = path.suffix.lower()
-        for key, extensions in ASSET_EXTENSIONS.items():
-            if suffix in extensions:
-                counts[key] += 1
-        if suffix == ".asset":
-            try:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-            except OSError:
-                continue
-            if "ScriptableObject:" in text or "MonoBehaviour:" in text or "m_Script:" in text:
-                counts["scriptable_objects"] += 1
-        if suffix == ".asmdef":
-            counts["asmdef"] += 1
-        if suffix in ASSET_EXTENSIONS["textures"]:
-            meta_path = Path(str(path) + ".meta")
-            if meta_path.exists():
-                if meta_path not in meta_cache:
-                    meta_cache[meta_path] = meta_path.read_text(encoding="utf-8", errors="ignore")
-                meta_text = meta_cache[meta_path]
-                if "spriteMode:" in meta_text or "textureType: Sprite" in meta_text:
-                    counts["sprites"] += 1
+        count_asset(path, counts, meta_cache)
     return counts
 
 
+def count_asset(path: Path, counts: Dict[str, int], meta_cache: Dict[Path, str]) -> None:
+    suffix = path.suffix.lower()
+    for key, extensions in ASSET_EXTENSIONS.items():
+        if suffix in extensions:
+            counts[key] += 1
+    if suffix == ".asset":
+        try:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return
+        if "ScriptableObject:" in text or "MonoBehaviour:" in text or "m_Script:" in text:
+            counts["scriptable_objects"] += 1
+    if suffix == ".asmdef":
+        counts["asmdef"] += 1
+    if suffix in ASSET_EXTENSIONS["textures"]:
+        meta_path = Path(str(path) + ".meta")
+        if meta_path.exists():
+            if meta_path not in meta_cache:
+                meta_cache[meta_path] = meta_path.read_text(encoding="utf-8", errors="ignore")
+            meta_text = meta_cache[meta_path]
+            if "spriteMode:" in meta_text or "textureType: Sprite" in meta_text:
+                counts["sprites"] += 1
+
+
+# TextureImporterFormat value -> (name, bytes per pixel) for explicit ``textureFormat`` overrides.
+TEXTURE_FORMATS = {
+    1: ("Alpha8", 1.0),
+    2: ("ARGB16", 2.0),
+    3: ("RGB24", 3.0),
+    4: ("RGBA32", 4.0),
+    5: ("ARGB32", 4.0),
+    7: ("RGB16", 2.0),
+    9: ("R16", 2.0),
+    10: ("DXT1", 0.5),
+    12: ("DXT5", 1.0),
+    13: ("RGBA16", 2.0),
+    15: ("RHalf", 2.0),
+    16: ("RGHalf", 4.0),
+    17: ("RGBAHalf", 8.0),
+    18: ("RFloat", 4.0),
+    19: ("RGFloat", 8.0),
+    20: ("RGBAFloat", 16.0),
+    22: ("RGB9E5", 4.0),
+    24: ("BC6H", 1.0),
+    25: ("BC7", 1.0),
+    26: ("BC4", 0.5),
+    27: ("BC5", 1.0),
+    28: ("DXT1Crunched", 0.5),
+    29: ("DXT5Crunched", 1.0),
+    30: ("PVRTC_RGB2", 0.25),
+    31: ("PVRTC_RGBA2", 0.25),
+    32: ("PVRTC_RGB4", 0.5),
+    33: ("PVRTC_RGBA4", 0.5),
+    34: ("ETC_RGB4", 0.5),
+    41: ("EAC_R", 0.5),
+    42: ("EAC_R_SIGNED", 0.5),
+    43: ("EAC_RG", 1.0),
+    44: ("EAC_RG_SIGNED", 1.0),
+    45: ("ETC2_RGB4", 0.5),
+    46: ("ETC2_RGB4_PUNCHTHROUGH_ALPHA", 0.5),
+    47: ("ETC2_RGBA8", 1.0),
+    # ASTC stores every block in 16 bytes, whatever its footprint.
+    48: ("ASTC_4x4", 16 / 16),
+    49: ("ASTC_5x5", 16 / 25),
+    50: ("ASTC_6x6", 16 / 36),
+    51: ("ASTC_8x8", 16 / 64),
+    52: ("ASTC_10x10", 16 / 100),
+    53: ("ASTC_12x12", 16 / 144),
+    # Pre-2019 separate RGBA ASTC values, still found in older .meta files.
+    54: ("ASTC_RGBA_4x4", 16 / 16),
+    55: ("ASTC_RGBA_5x5", 16 / 25),
+    56: ("ASTC_RGBA_6x6", 16 / 36),
+    57: ("ASTC_RGBA_8x8", 16 / 64),
+    58: ("ASTC_RGBA_10x10", 16 / 100),
+    59: ("ASTC_RGBA_12x12", 16 / 144),
+    62: ("RG16", 2.0),
+    63: ("R8", 1.0),
+    64: ("ETC_RGB4Crunched", 0.5),
+    65: ("ETC2_RGBA8Crunched", 1.0),
+    66: ("ASTC_HDR_4x4", 16 / 16),
+    67: ("ASTC_HDR_5x5", 16 / 25),
+    68: ("ASTC_HDR_6x6", 16 / 36),
+    69: ("ASTC_HDR_8x8", 16 / 64),
+    70: ("ASTC_HDR_10x10", 16 / 100),
+    71: ("ASTC_HDR_12x12", 16 / 144),
+}
+
+# TextureImporter ``npotScale`` values; sprites are never rescaled.
+NPOT_NONE, NPOT_TO_NEAREST, NPOT_TO_LARGER, NPOT_TO_SMALLER = range(4)
+SPRITE_TEXTURE_TYPE = "8"
+
+# Rough compressed-in-memory ratios relative to 16-bit PCM, per AudioImporter compressionFormat.
+AUDIO_COMPRESSION_RATIO = {0: 1.0, 1: 0.1, 2: 0.286, 3: 0.1}
+STREAMING_BUFFER_BYTES = 200 * 1024
+ASSUMED_SOURCE_BITRATE = 128_000
+
+META_VALUE = re.compile(r"^\s*-?\s*(\w+): (.*)$", re.MULTILINE)
+
+
+@dataclass
+class AssetFootprint:
+    path: str
+    kind: str
+    gpu_bytes: int
+    cpu_bytes: int
+    details: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.gpu_bytes + self.cpu_bytes
+
+
+def _read_head(path: Path, size: int) -> bytes:
+    with path.open("rb") as handle:
+        return handle.read(size)
+
+
+def _jpeg_size(path: Path) -> Optional[Tuple[int, int, bool]]:
+    with path.open("rb") as handle:
+        if handle.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            marker = handle.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                continue
+            length_bytes = handle.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack(">H", length_bytes)[0]
+            if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                header = handle.read(5)
+                if len(header) < 5:
+                    return None
+                height, width = struct.unpack(">HH", header[1:5])
+                return width, height, False
+            handle.seek(length - 2, 1)
+
+
+def read_image_size(path: Path) -> Optional[Tuple[int, int, bool]]:
+    """Return (width, height, has_alpha) from the file header without decoding pixels."""
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".png":
+            head = _read_head(path, 26)
+            if len(head) < 26 or head[:8] != b"\x89PNG\r\n\x1a\n":
+                return None
+            width, height = struct.unpack(">II", head[16:24])
+            return width, height, head[25] in (4, 6)
+        if suffix in (".jpg", ".jpeg"):
+            return _jpeg_size(path)
+        if suffix == ".tga":
+            head = _read_head(path, 18)
+            if len(head) < 18:
+                return None
+            width, height = struct.unpack("<HH", head[12:16])
+            return width, height, head[16] == 32
+        if suffix == ".psd":
+            head = _read_head(path, 26)
+            if len(head) < 26 or head[:4] != b"8BPS":
+                return None
+            channels, height, width = struct.unpack(">HII", head[12:22])
+            return width, height, channels >= 4
+        if suffix == ".bmp":
+            head = _read_head(path, 30)
+            if len(head) < 30 or head[:2] != b"BM":
+                return None
+            width, height = struct.unpack("<ii", head[18:26])
+            return abs(width), abs(height), struct.unpack("<H", head[28:30])[0] == 32
+    except OSError:
+        return None
+    return None
+
+
+def read_wav_format(path: Path) -> Optional[Dict[str, int]]:
+    """Walk RIFF chunks to the ``fmt `` and ``data`` headers without reading samples."""
+    info: Dict[str, int] = {}
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(12)
+            if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+                return None
+            while True:
+                chunk = handle.read(8)
+                if len(chunk) < 8:
+                    break
+                chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+                if chunk_id == b"fmt ":
+                    fmt = handle.read(16)
+                    _, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt)
+                    info.update(channels=channels, sample_rate=sample_rate, bits=bits)
+                    handle.seek(size - 16 + (size & 1), 1)
+                elif chunk_id == b"data":
+                    info["data_bytes"] = size
+                    break
+                else:
+                    handle.seek(size + (size & 1), 1)
+    except (OSError, struct.error):
+        return None
+    if "channels" not in info or "data_bytes" not in info or not info["bits"]:
+        return None
+    info["frames"] = info["data_bytes"] // (info["channels"] * info["bits"] // 8 or 1)
+    return info
+
+
+def parse_meta_values(text: str) -> Dict[str, str]:
+    """First value of each ``key: value`` line; later duplicates (per-platform blocks) are ignored."""
+    values: Dict[str, str] = {}
+    for key, value in META_VALUE.findall(text):
+        values.setdefault(key, value.strip())
+    return values
+
+
+def platform_settings(text: str, platform: str) -> Dict[str, str]:
+    """TextureImporter settings for ``platform``, falling back to DefaultTexturePlatform."""
+    blocks: Dict[str, Dict[str, str]] = {}
+    starts = [match for match in re.finditer(r"buildTarget: (\w+)", text)]
+    for index, match in enumerate(starts):
+        end = starts[index + 1].start() if index + 1 < len(starts) else text.find("spriteSheet:", match.end())
+        blocks[match.group(1)] = parse_meta_values(text[match.end() : end if end != -1 else None])
+    chosen = blocks.get(platform)
+    if chosen and chosen.get("overridden") == "1":
+        return chosen
+    return blocks.get("DefaultTexturePlatform", {})
+
+
+def _as_int(values: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return int(values.get(key, default))
+    except ValueError:
+        return default
+
+
+def power_of_two(size: int, npot_scale: int) -> int:
+    """Apply a TextureImporter ``npotScale`` mode to one texture dimension."""
+    if npot_scale == NPOT_NONE or size & (size - 1) == 0:
+        return size
+    larger = 1 << size.bit_length()
+    smaller = larger >> 1
+    if npot_scale == NPOT_TO_LARGER:
+        return larger
+    if npot_scale == NPOT_TO_SMALLER:
+        return smaller
+    return larger if larger - size <= size - smaller else smaller
+
+
+def estimate_texture(path: Path, rel: str, meta_text: str, platform: str) -> Optional[AssetFootprint]:
+    size = read_image_size(path)
+    if size is None:
+        return None
+    width, height, has_alpha = size
+    values = parse_meta_values(meta_text)
+    settings = platform_settings(meta_text, platform)
+    if values.get("textureType") != SPRITE_TEXTURE_TYPE:
+        npot_scale = _as_int(values, "npotScale", NPOT_TO_NEAREST)
+        width, height = power_of_two(width, npot_scale), power_of_two(height, npot_scale)
+    max_size = _as_int(settings, "maxTextureSize", _as_int(values, "maxTextureSize", 2048))
+    longest = max(width, height)
+    if longest > max_size:
+        scale = max_size / longest
+        width, height = max(1, round(width * scale)), max(1, round(height * scale))
+
+    texture_format = _as_int(settings, "textureFormat", -1)
+    compression = _as_int(settings, "textureCompression", 1)
+    if texture_format >= 0:
+        format_label, bpp = TEXTURE_FORMATS.get(texture_format, (f"format {texture_format}", 4.0))
+    elif compression == 0:
+        bpp, format_label = 4.0, "uncompressed"
+    elif width % 4 or height % 4:
+        # Block compression needs multiple-of-4 sizes; Unity falls back to RGBA32.
+        bpp, format_label = 4.0, "uncompressed (size not a multiple of 4)"
+    elif compression == 2:
+        bpp, format_label = 1.0, "BC7"
+    else:
+        bpp, format_label = (1.0, "DXT5") if has_alpha else (0.5, "DXT1")
+
+    mipmaps = values.get("enableMipMap") == "1"
+    gpu_bytes = int(width * height * bpp * (4 / 3 if mipmaps else 1))
+    readable = values.get("isReadable") == "1"
+    return AssetFootprint(
+        path=rel,
+        kind="texture",
+        gpu_bytes=gpu_bytes,
+        cpu_bytes=gpu_bytes if readable else 0,
+        details={
+            "width": width,
+            "height": height,
+            "format": format_label,
+            "max_texture_size": max_size,
+            "mipmaps": mipmaps,
+            "readable": readable,
+            "sprite": values.get("textureType") == "8",
+        },
+    )
+
+
+def estimate_audio(path: Path, rel: str, meta_text: str) -> AssetFootprint:
+    values = parse_meta_values(meta_text)
+    load_type = _as_int(values, "loadType", 0)
+    compression = _as_int(values, "compressionFormat", 1)
+    wav = read_wav_format(path) if path.suffix.lower() == ".wav" else None
+    if wav:
+        frames, channels, sample_rate = wav["frames"], wav["channels"], wav["sample_rate"]
+        source = "wav header"
+    else:
+        # Compressed sources: estimate duration from file size at a typical bitrate.
+        seconds = path.stat().st_size * 8 / ASSUMED_SOURCE_BITRATE
+        sample_rate, channels = 44100, 2
+        frames = int(seconds * sample_rate)
+        source = "file size"
+    if values.get("forceToMono") == "1":
+        channels = 1
+    if _as_int(values, "sampleRateSetting", 0) == 2:
+        override = _as_int(values, "sampleRateOverride", sample_rate)
+        frames = int(frames * override / sample_rate) if sample_rate else frames
+        sample_rate = override
+    pcm_bytes = frames * channels * 2
+
+    if load_type == 0:
+        memory, mode = pcm_bytes, "DecompressOnLoad"
+    elif load_type == 1:
+        memory, mode = int(pcm_bytes * AUDIO_COMPRESSION_RATIO.get(compression, 1.0)), "CompressedInMemory"
+    else:
+        memory, mode = min(pcm_bytes, STREAMING_BUFFER_BYTES), "Streaming"
+    return AssetFootprint(
+        path=rel,
+        kind="audio",
+        gpu_bytes=0,
+        cpu_bytes=memory,
+        details={
+            "load_type": mode,
+            "compression_format": compression,
+            "channels": channels,
+            "sample_rate": sample_rate,
+            "seconds": round(frames / sample_rate, 2) if sample_rate else 0,
+            "source": source,
+        },
+    )
+
+
+def estimate_asset_memory(assets_dir: Path, platform: str = "Standalone", top: int = 20) -> Dict[str, object]:
+    """Estimate runtime texture and audio memory from file headers and ``.meta`` import settings."""
+    footprints: List[AssetFootprint] = []
+    skipped: List[str] = []
+    root = assets_dir.parent
+    for path in assets_dir.rglob("*"):
+        suffix = path.suffix.lower()
+        is_texture = suffix in ASSET_EXTENSIONS["textures"]
+        if not (is_texture or suffix in ASSET_EXTENSIONS["audio"]) or path.is_dir():
+            continue
+        rel = path.relative_to(root).as_posix()
+        meta_path = Path(str(path) + ".meta")
+        meta_text = meta_path.read_text(encoding="utf-8", errors="ignore") if meta_path.exists() else ""
+        footprint = estimate_texture(path, rel, meta_text, platform) if is_texture else estimate_audio(path, rel, meta_text)
+        if footprint is None:
+            skipped.append(rel)
+        else:
+            footprints.append(footprint)
+
+    by_directory: Dict[str, int] = {}
+    for item in footprints:
+        directory = item.path.rsplit("/", 1)[0]
+        by_directory[directory] = by_directory.get(directory, 0) + item.total_bytes
+    footprints.sort(key=lambda item: (-item.total_bytes, item.path))
+
+    def totals(kind: str) -> Dict[str, int]:
+        items = [item for item in footprints if item.kind == kind]
+        return {
+            "count": len(items),
+            "gpu_bytes": sum(item.gpu_bytes for item in items),
+            "cpu_bytes": sum(item.cpu_bytes for item in items),
+        }
+
+    return {
+        "platform": platform,
+        "textures": totals("texture"),
+        "audio": totals("audio"),
+        "total_bytes": sum(item.total_bytes for item in footprints),
+        "by_directory": dict(sorted(by_directory.items(), key=lambda kv: -kv[1])),
+        "offenders": [{**asdict(item), "total_bytes": item.total_bytes} for item in footprints[:top]],
+        "unreadable": skipped,
+    }
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def render_memory_markdown(report: Dict[str, object]) -> str:
+    lines = [
+        f"- Textures: {report['textures']['count']} ({format_bytes(report['textures']['gpu_bytes'])} GPU, "
+        f"{format_bytes(report['textures']['cpu_bytes'])} CPU readable copies)",
+        f"- Audio clips: {report['audio']['count']} ({format_bytes(report['audio']['cpu_bytes'])})",
+        f"- Estimated total: {format_bytes(report['total_bytes'])} ({report['platform']})",
+        "",
+        "| Asset | Kind | Estimated Memory | Details |",
+        "| --- | --- | --- | --- |",
+    ]
+    for item in report["offenders"]:
+        details = item["details"]
+        if item["kind"] == "texture":
+            summary = f"{details['width']}x{details['height']} {details['format']}" + (", mips" if details["mipmaps"] else "")
+        else:
+            summary = f"{details['load_type']}, {details['seconds']}s, {details['channels']}ch"
+        lines.append(f"| {item['path']} | {item['kind']} | {format_bytes(item['total_bytes'])} | {summary} |")
+    return "\n".join(lines)
+
+
 def render_markdown(counts: Dict[str, int]) -> str:
     lines = [
         "| Asset Type | Count |",
@@ -72,20 +472,32 @@ def main() -> None:
     parser.add_argument("--assets", default="Assets", help="Assets directory path (default: Assets).")
     parser.add_argument("--output", help="Optional JSON output file.")
     parser.add_argument("--markdown", action="store_true", help="Render as markdown table.")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report estimated texture/audio runtime memory instead of counts.",
+    )
+    parser.add_argument("--platform", default="Standalone", help="Build target for import overrides (default: Standalone).")
+    parser.add_argument("--top", type=int, default=20, help="Number of worst offenders in the memory report.")
     args = parser.parse_args()
 
     assets_dir = Path(args.assets)
     if not assets_dir.is_dir():
         raise SystemExit(f"Assets directory not found: {assets_dir}")
 
-    counts = enumerate_assets(assets_dir)
+    if args.memory:
+        data = estimate_asset_memory(assets_dir, platform=args.platform, top=args.top)
+        render = render_memory_markdown
+    else:
+        data = enumerate_assets(assets_dir)
+        render = render_markdown
 
     if args.output:
-        Path(args.output).write_text(json.dumps(counts, indent=2), encoding="utf-8")
+        Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
     if args.markdown:
-        print(render_markdown(counts))
+        print(render(data))
     elif not args.output:
-        print(json.dumps(counts, indent=2))
+        print(json.dumps(data, indent=2))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Analyze several Unity projects in one process with a shared worker pool.
+
+Files are deduplicated across projects by content hash, so vendored packages
+(TextMesh Pro, shared plugins) are parsed once and reused for every project
+that contains them.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from analyze_code_metrics import (
+    DEFAULT_FILE_TIMEOUT,
+    FileMetrics,
+    analyze_cs_file,
+    calculate_metrics,
+    iter_cs_files,
+    json_default,
+)
+
+
+def read_roots(roots: List[str], roots_file: str | None) -> List[Path]:
+    entries = list(roots)
+    if roots_file:
+        for line in Path(roots_file).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entries.append(line)
+    resolved: List[Path] = []
+    for entry in entries:
+        root = Path(entry).resolve()
+        if not root.is_dir():
+            raise SystemExit(f"Root path not found: {root}")
+        if root not in resolved:
+            resolved.append(root)
+    return resolved
+
+
+def content_digest(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def project_names(roots: List[Path]) -> Dict[Path, str]:
+    """Unique output names per root; suffixes skip names already issued or used by another root."""
+    bases = {root.name or "root" for root in roots}
+    names: Dict[Path, str] = {}
+    issued: Set[str] = set()
+    for root in roots:
+        base = root.name or "root"
+        name, counter = base, 1
+        while name in issued or (counter > 1 and name in bases):
+            counter += 1
+            name = f"{base}-{counter}"
+        issued.add(name)
+        names[root] = name
+    return names
+
+
+def relocate(metrics: FileMetrics, rel_path: str) -> FileMetrics:
+    """Return a private copy of ``metrics`` labelled with another project path."""
+    clone = copy.deepcopy(metrics)
+    clone.path = rel_path
+    for method in clone.functions:
+        method.file_path = rel_path
+    for cls in clone.classes:
+        cls.file_path = rel_path
+    return clone
+
+
+def _analyze(job: Tuple[str, str]) -> FileMetrics:
+    path, root = job
+    return analyze_cs_file(Path(path), Path(root), DEFAULT_FILE_TIMEOUT)
+
+
+def run_batch(roots: List[Path], workers: int | None = None) -> Tuple[Dict[Path, Dict[str, object]], Dict[str, int]]:
+    project_files: Dict[Path, List[Tuple[Path, str]]] = {}
+    unique_jobs: Dict[str, Tuple[str, str]] = {}
+    total_files = 0
+    for root in roots:
+        entries = []
+        for path in iter_cs_files(root):
+            digest = content_digest(path)
+            entries.append((path, digest))
+            unique_jobs.setdefault(digest, (str(path), str(root)))
+            total_files += 1
+        project_files[root] = entries
+
+    digests = list(unique_jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        analyzed = dict(zip(digests, pool.map(_analyze, [unique_jobs[d] for d in digests], chunksize=8)))
+
+    results: Dict[Path, Dict[str, object]] = {}
+    for root, entries in project_files.items():
+        file_metrics = [relocate(analyzed[digest], path.relative_to(root).as_posix()) for path, digest in entries]
+        results[root] = calculate_metrics(root, file_metrics)
+
+    dedupe = {
+        "files_scheduled": total_files,
+        "unique_files_analyzed": len(digests),
+        "duplicate_files_skipped": total_files - len(digests),
+    }
+    return results, dedupe
+
+
+def build_summary(
+    results: Dict[Path, Dict[str, object]], names: Dict[Path, str], dedupe: Dict[str, int]
+) -> Dict[str, object]:
+    projects = []
+    for root, metrics in results.items():
+        stats = metrics["stats"]
+        frame_cost = metrics.get("frame_cost") or []
+        projects.append(
+            {
+                "name": names[root],
+                "root": str(root),
+                "files_analyzed": stats["files_analyzed"],
+                "total_loc": stats["total_loc"],
+                "total_code_loc": stats["total_code_loc"],
+                "total_methods": stats["total_methods"],
+                "average_method_complexity": stats["average_method_complexity"],
+                "duplicate_percentage": metrics["duplicates"]["percentage"],
+                "top_frame_cost": frame_cost[0] if frame_cost else None,
+            }
+        )
+    return {
+        "projects": projects,
+        "totals": {
+            "projects": len(projects),
+            "total_loc": sum(p["total_loc"] for p in projects),
+            "total_methods": sum(p["total_methods"] for p in projects),
+            **dedupe,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Collect repository metrics for several Unity projects at once.")
+    parser.add_argument("roots", nargs="*", help="Project root directories")
+    parser.add_argument("--roots-file", help="File listing project roots, one per line (# comments allowed)")
+    parser.add_argument("--output-dir", default="metrics/batch", help="Directory for per-project and summary JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    roots = read_roots(args.roots, args.roots_file)
+    if not roots:
+        raise SystemExit("No project roots given")
+
+    names = project_names(roots)
+    results, dedupe = run_batch(roots, workers=args.workers)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for root, metrics in results.items():
+        target = output_dir / f"{names[root]}.json"
+        target.write_text(json.dumps(metrics, indent=2, default=json_default), encoding="utf-8")
+
+    summary = build_summary(results, names, dedupe)
+    (output_dir / "summary.json").write_text(json.dumps(summary, indent=2, default=json_default), encoding="utf-8")
+    print(json.dumps(summary["totals"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
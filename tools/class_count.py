@@ -7,9 +7,9 @@ import json
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, List, Tuple
 
-ROOT_SENTINEL = {"Library", "Logs", "obj", "ProjectSettings", "UserSettings", ".git"}
+from metrics_common import iter_cs_files
 
 CLASS_PATTERN = re.compile(
     r"""
@@ -24,32 +24,28 @@ CLASS_PATTERN = re.compile(
 )
 
 
-def iter_cs_files(root: Path) -> Iterable[Path]:
-    for path in root.rglob("*.cs"):
-        try:
-            relative = path.relative_to(root)
-        except ValueError:
-            continue
-        if any(part in ROOT_SENTINEL for part in relative.parts):
-            continue
-        yield path
-
-
 def collect(root: Path) -> Dict[str, object]:
     result: Dict[str, List[str]] = defaultdict(list)
     totals = {"class": 0, "struct": 0, "interface": 0, "record": 0}
     for path in iter_cs_files(root):
         text = path.read_text(encoding="utf-8", errors="ignore")
-        cleaned = strip_comments(text)
-        matches = CLASS_PATTERN.finditer(cleaned)
-        for match in matches:
-            kind = match.group("kind")
-            totals[kind] += 1
-            result[path.as_posix()].append(match.group("name"))
+        record_declarations(path.as_posix(), text, totals, result)
     totals["types_total"] = sum(totals.values())
     return {"totals": totals, "files": result}
 
 
+def declarations(text: str) -> List[Tuple[str, str]]:
+    return [(match.group("kind"), match.group("name")) for match in CLASS_PATTERN.finditer(strip_comments(text))]
+
+
+def record_declarations(
+    file_key: str, text: str, totals: Dict[str, int], result: Dict[str, List[str]]
+) -> None:
+    for kind, name in declarations(text):
+        totals[kind] += 1
+        result[file_key].append(name)
+
+
 def strip_comments(text: str) -> str:
     def replace_block(match: re.Match[str]) -> str:
         return "\n" * match.group(0).count("\n")
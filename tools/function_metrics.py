@@ -3,15 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
-import statistics
+from collections import Counter
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
-import lizard
-
-ROOT_SENTINEL = {"Library", "Logs", "obj", "ProjectSettings", "UserSettings", ".git"}
+from metrics_common import iter_cs_files
 
 
 @dataclass
@@ -25,59 +24,168 @@ class FunctionInfo:
     parameters: int
 
 
-def iter_cs_files(root: Path) -> Iterable[Path]:
-    for path in root.rglob("*.cs"):
-        try:
-            relative = path.relative_to(root)
-        except ValueError:
-            continue
-        if any(part in ROOT_SENTINEL for part in relative.parts):
-            continue
-        yield path
+DEFAULT_TOP = 10
+QUANTILES = (("median", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+class StreamingStats:
+    """Online count/mean/max and exact quantiles for integer-valued samples.
+
+    Samples are folded into a value histogram, so memory is bounded by the
+    number of distinct values (a few hundred for LOC/CCN) rather than the
+    number of functions.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.maximum: int | None = None
+        self.histogram: Counter[int] = Counter()
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.histogram[value] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Linear interpolation between closest ranks; ``quantile(0.5)`` equals ``statistics.median``."""
+        if not self.count:
+            return 0
+        position = q * (self.count - 1)
+        lower_rank = int(position)
+        upper_rank = min(lower_rank + 1, self.count - 1)
+        lower = upper = None
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        fraction = position - lower_rank
+        if fraction == 0 or lower == upper:
+            return lower
+        return lower + (upper - lower) * fraction
+
+
+class FunctionSummary:
+    """Streaming aggregation of FunctionInfo records with a bounded top-N by CCN."""
+
+    def __init__(self, top: int | None = DEFAULT_TOP, keep_functions: bool = False) -> None:
+        self.loc = StreamingStats()
+        self.ccn = StreamingStats()
+        self.top = top
+        self.heap: List[Tuple[int, int, FunctionInfo]] = []
+        self.functions: List[FunctionInfo] | None = [] if keep_functions else None
+        self.max_loc_function: FunctionInfo | None = None
+        self.max_ccn_function: FunctionInfo | None = None
+        self.seen = 0
+
+    def add(self, fn: FunctionInfo) -> None:
+        if self.max_loc_function is None or fn.nloc > self.max_loc_function.nloc:
+            self.max_loc_function = fn
+        if self.max_ccn_function is None or fn.cyclomatic_complexity > self.max_ccn_function.cyclomatic_complexity:
+            self.max_ccn_function = fn
+        self.loc.add(fn.nloc)
+        self.ccn.add(fn.cyclomatic_complexity)
+        if self.functions is not None:
+            self.functions.append(fn)
+        if self.top:
+            # Negated sequence keeps the earliest function on CCN ties, like a stable sort.
+            entry = (fn.cyclomatic_complexity, -self.seen, fn)
+            if len(self.heap) < self.top:
+                heapq.heappush(self.heap, entry)
+            elif entry[:2] > self.heap[0][:2]:
+                heapq.heapreplace(self.heap, entry)
+        self.seen += 1
+
+    def extend(self, functions: Iterable[FunctionInfo]) -> None:
+        for fn in functions:
+            self.add(fn)
+
+    def top_functions(self) -> List[FunctionInfo]:
+        return [fn for _, _, fn in sorted(self.heap, key=lambda entry: (-entry[0], -entry[1]))]
 
+    def result(self) -> Dict[str, object]:
+        data: Dict[str, object] = {"summary": {}}
+        if self.seen:
+            summary: Dict[str, object] = {
+                "function_count": self.seen,
+                "average_loc": self.loc.mean,
+                "median_loc": self.loc.quantile(0.5),
+                "average_ccn": self.ccn.mean,
+                "median_ccn": self.ccn.quantile(0.5),
+                "max_loc": self.loc.maximum,
+                "max_ccn": self.ccn.maximum,
+            }
+            for label, q in QUANTILES[1:]:
+                summary[f"{label}_loc"] = self.loc.quantile(q)
+                summary[f"{label}_ccn"] = self.ccn.quantile(q)
+            summary["max_loc_function"] = asdict(self.max_loc_function)
+            summary["max_ccn_function"] = asdict(self.max_ccn_function)
+            data["summary"] = summary
+        if self.top:
+            data["top_functions"] = [asdict(fn) for fn in self.top_functions()]
+        if self.functions is not None:
+            data["functions"] = [asdict(fn) for fn in self.functions]
+        return data
 
-def analyze_functions(root: Path) -> Dict[str, object]:
-    functions: List[FunctionInfo] = []
+
+def analyze_functions(
+    root: Path, top: int | None = DEFAULT_TOP, keep_functions: bool = True
+) -> Dict[str, object]:
+    import lizard
+
+    summary = FunctionSummary(top=top, keep_functions=keep_functions)
     for path in iter_cs_files(root):
         analysis = lizard.analyze_file(str(path))
-        relative = path.relative_to(root).as_posix()
-        for func in analysis.function_list:
-            functions.append(
-                FunctionInfo(
-                    name=func.long_name,
-                    file=relative,
-                    start_line=func.start_line,
-                    end_line=func.end_line,
-                    nloc=func.nloc,
-                    cyclomatic_complexity=func.cyclomatic_complexity,
-                    parameters=func.parameter_count,
-                )
-            )
-    if not functions:
-        return {"summary": {}, "functions": []}
-
-    nloc_values = [fn.nloc for fn in functions]
-    ccn_values = [fn.cyclomatic_complexity for fn in functions]
+        summary.extend(function_records(path.relative_to(root).as_posix(), analysis))
+    return summary.result()
+
+
+def approximate_functions(root: Path, error: float, confidence: float, seed: int) -> Dict[str, object]:
+    """Estimate the function summary from a stratified sample of files (see metrics_sampling)."""
+    import lizard
+
+    from metrics_sampling import estimate_quantile, estimate_ratio, estimate_total, group_items, plan_sample
+
+    plan = plan_sample(root, iter_cs_files(root), error=error, confidence=confidence, seed=seed)
+    records = [fn for rel in plan.sampled for fn in function_records(rel, lizard.analyze_file(str(root / rel)))]
+    loc = group_items((fn.file, fn.nloc) for fn in records)
+    ccn = group_items((fn.file, fn.cyclomatic_complexity) for fn in records)
+    counts = {rel: len(loc.get(rel, ())) for rel in plan.sampled}
+    loc_totals = {rel: sum(loc.get(rel, ())) for rel in plan.sampled}
+    ccn_totals = {rel: sum(ccn.get(rel, ())) for rel in plan.sampled}
 
     summary = {
-        "function_count": len(functions),
-        "average_loc": statistics.mean(nloc_values),
-        "median_loc": statistics.median(nloc_values),
-        "average_ccn": statistics.mean(ccn_values),
-        "median_ccn": statistics.median(ccn_values),
-        "max_loc": max(nloc_values),
-        "max_ccn": max(ccn_values),
+        "function_count": estimate_total(plan, counts),
+        "average_loc": estimate_ratio(plan, loc_totals, counts),
+        "average_ccn": estimate_ratio(plan, ccn_totals, counts),
     }
+    for label, q in QUANTILES:
+        summary[f"{label}_loc"] = estimate_quantile(plan, loc, q)
+        summary[f"{label}_ccn"] = estimate_quantile(plan, ccn, q)
+    return {"approx": plan.describe(), "summary": {name: asdict(value) for name, value in summary.items()}}
 
-    max_loc_fn = max(functions, key=lambda fn: fn.nloc)
-    max_ccn_fn = max(functions, key=lambda fn: fn.cyclomatic_complexity)
-    summary["max_loc_function"] = asdict(max_loc_fn)
-    summary["max_ccn_function"] = asdict(max_ccn_fn)
 
-    return {
-        "summary": summary,
-        "functions": [asdict(fn) for fn in functions],
-    }
+def function_records(relative: str, analysis) -> Iterable[FunctionInfo]:
+    for func in analysis.function_list:
+        yield FunctionInfo(
+            name=func.long_name,
+            file=relative,
+            start_line=func.start_line,
+            end_line=func.end_line,
+            nloc=func.nloc,
+            cyclomatic_complexity=func.cyclomatic_complexity,
+            parameters=func.parameter_count,
+        )
 
 
 def render_markdown(data: Dict[str, object], limit: int | None = None) -> str:
@@ -85,9 +193,12 @@ def render_markdown(data: Dict[str, object], limit: int | None = None) -> str:
         "| Function | File | LOC | CCN | Parameters |",
         "| --- | --- | --- | --- | --- |",
     ]
-    functions = data["functions"]
-    if limit is not None:
-        functions = sorted(functions, key=lambda item: item["cyclomatic_complexity"], reverse=True)[:limit]
+    if "functions" in data:
+        functions = data["functions"]
+        if limit is not None:
+            functions = sorted(functions, key=lambda item: item["cyclomatic_complexity"], reverse=True)[:limit]
+    else:
+        functions = data.get("top_functions", [])[:limit]
     for fn in functions:
         lines.append(
             f"| {fn['name']} | {fn['file']}:{fn['start_line']} | {fn['nloc']} | {fn['cyclomatic_complexity']} | {fn['parameters']} |"
@@ -95,16 +206,55 @@ def render_markdown(data: Dict[str, object], limit: int | None = None) -> str:
     return "\n".join(lines)
 
 
+def render_approx_markdown(data: Dict[str, object]) -> str:
+    plan = data["approx"]
+    lines = [
+        f"Estimated from {plan['sampled_files']} of {plan['population_files']} files "
+        f"({plan['confidence']:.0%} confidence intervals).",
+        "",
+        "| Metric | Estimate | Interval |",
+        "| --- | --- | --- |",
+    ]
+    for name, estimate in data["summary"].items():
+        lines.append(f"| {name} | {estimate['value']:.1f} | {estimate['low']:.1f} - {estimate['high']:.1f} |")
+    return "\n".join(lines)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute per-function LOC and cyclomatic complexity.")
     parser.add_argument("--root", default=".", help="Root directory (default: current).")
     parser.add_argument("--output", help="Optional JSON output.")
     parser.add_argument("--markdown", action="store_true", help="Render markdown table.")
     parser.add_argument("--top", type=int, help="Limit markdown output to top N functions by CCN.")
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help=(
+            "Drop the per-function list and keep only the summary and top N functions (default: "
+            f"{DEFAULT_TOP}), so memory stays bounded on large projects."
+        ),
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="Estimate the summary with confidence intervals from a stratified sample of files.",
+    )
+    parser.add_argument("--error", type=float, default=0.05, help="Relative error bound for --approx (default: 0.05).")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --approx (default: 0.95).")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed for --approx (default: 0).")
     args = parser.parse_args()
 
     root = Path(args.root)
-    data = analyze_functions(root)
+    if args.approx:
+        data = approximate_functions(root, args.error, args.confidence, args.seed)
+        if args.output:
+            Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+        if args.markdown:
+            print(render_approx_markdown(data))
+        elif not args.output:
+            print(json.dumps(data, indent=2))
+        return
+    data = analyze_functions(root, top=args.top or DEFAULT_TOP, keep_functions=not args.summary_only)
 
     if args.output:
         Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
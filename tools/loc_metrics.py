@@ -1,60 +1,155 @@
 #!/usr/bin/env python3
-"""Calculate LOC metrics for C# files within a Unity project."""
+"""Calculate LOC metrics for C# files within a Unity project.
+
+Lines are classified in a single regex pass over the raw bytes, which knows
+about line and block comments, regular, verbatim and interpolated strings and
+char literals. ``--validate`` checks the code line counts against lizard's
+``nloc``.
+"""
 from __future__ import annotations
 
 import argparse
 import json
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
-
-import lizard
+from typing import Iterable, List
+
+from metrics_common import Buffer, iter_cs_files, line_of, line_offsets, open_source
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# Comments are matched as whole tokens; strings only so comment markers
+# inside them are skipped. Interpolation holes are not parsed, which only
+# matters if a hole contains both a quote and a comment marker.
+TOKEN_PATTERN = re.compile(
+    rb"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    |\$*@\$*"(?:[^"]|"")*"
+    |\$*"(?:[^"\\\n]|\\.)*"
+    |'(?:[^'\\\n]|\\.)*'
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+NON_SPACE = re.compile(rb"[^ \t\r\n\f\v]+")
+HASH = ord("#")
+CODE, DIRECTIVE = 1, 2
+
+
+@dataclass
+class LineCounts:
+    total: int = 0
+    blank: int = 0
+    comment: int = 0
+    code: int = 0
+    mixed: int = 0
+    directive: int = 0
+
+    @property
+    def code_lines(self) -> int:
+        """Lines with any code, mixed lines included (comparable to lizard's nloc)."""
+        return self.code + self.mixed
+
+
+def classify_lines(buf: Buffer) -> LineCounts:
+    """Count blank, comment-only, code-only, mixed code+comment and preprocessor lines of C# source bytes.
+
+    The buffer is scanned in place (a mapped file is never copied). Preprocessor
+    directives (``#if``, ``#region``...) are kept out of the code count, as
+    lizard does; a ``#`` that starts a line inside a multi-line string is code.
+    """
+    start = len(UTF8_BOM) if buf[:3] == UTF8_BOM else 0
+    offsets = line_offsets(buf)
+    total = len(offsets) if len(buf) > start else 0
+    has_comment = bytearray(total)
+    # 0: no code yet, DIRECTIVE: first code on the line is a directive, CODE: other code.
+    kind = bytearray(total)
+
+    def mark_code(first: int, last: int, plain: bool) -> None:
+        for run in NON_SPACE.finditer(buf, first, last):
+            line = line_of(offsets, run.start()) - 1
+            if not kind[line]:
+                kind[line] = DIRECTIVE if plain and buf[run.start()] == HASH else CODE
+
+    def mark_comment(first: int, last: int) -> None:
+        for run in NON_SPACE.finditer(buf, first, last):
+            has_comment[line_of(offsets, run.start()) - 1] = 1
+
+    cursor = start
+    for match in TOKEN_PATTERN.finditer(buf, start):
+        mark_code(cursor, match.start(), plain=True)
+        if match.group("comment") is not None:
+            mark_comment(match.start(), match.end())
+        else:
+            mark_code(match.start(), match.end(), plain=False)
+        cursor = match.end()
+    mark_code(cursor, len(buf), plain=True)
+
+    counts = LineCounts(total=total)
+    for index in range(total):
+        if kind[index] == DIRECTIVE:
+            counts.directive += 1
+        elif kind[index] and has_comment[index]:
+            counts.mixed += 1
+        elif kind[index]:
+            counts.code += 1
+        elif has_comment[index]:
+            counts.comment += 1
+        else:
+            counts.blank += 1
+    return counts
 
-ROOT_SENTINEL = {"Library", "Logs", "obj", "ProjectSettings", "UserSettings", ".git"}
 
-
-def iter_cs_files(root: Path) -> Iterable[Path]:
-    for path in root.rglob("*.cs"):
-        try:
-            relative = path.relative_to(root)
-        except ValueError:
-            continue
-        if any(part in ROOT_SENTINEL for part in relative.parts):
-            continue
-        yield path
+def analyze_file(path: Path, root: Path) -> dict:
+    with open_source(path) as buf:
+        return line_metrics(path.relative_to(root).as_posix(), classify_lines(buf))
 
 
-def analyze_file(path: Path, root: Path) -> dict:
-    relative = path.relative_to(root).as_posix()
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    lines = text.splitlines()
-    total_lines = len(lines)
-    blank_lines = sum(1 for line in lines if not line.strip())
-    nloc = lizard.analyze_file(str(path)).nloc
-    comment_lines = max(total_lines - blank_lines - nloc, 0)
-    non_blank = total_lines - blank_lines
+def line_metrics(relative: str, counts: LineCounts) -> dict:
     return {
         "file": relative,
-        "total_lines": total_lines,
-        "non_blank_lines": non_blank,
-        "comment_lines": comment_lines,
-        "code_lines": nloc,
+        "total_lines": counts.total,
+        "non_blank_lines": counts.total - counts.blank,
+        "comment_lines": counts.comment,
+        "code_lines": counts.code_lines,
+        "mixed_lines": counts.mixed,
+        "directive_lines": counts.directive,
     }
 
 
+def validate(root: Path) -> List[dict]:
+    """Files whose code line count differs from lizard's nloc."""
+    import lizard
+
+    root = root.resolve()
+    mismatches = []
+    for path in iter_cs_files(root):
+        row = analyze_file(path, root)
+        nloc = lizard.analyze_file(str(path)).nloc
+        if row["code_lines"] != nloc:
+            mismatches.append({"file": row["file"], "code_lines": row["code_lines"], "lizard_nloc": nloc})
+    return mismatches
+
+
 def collect_metrics(root: Path) -> dict:
     root = root.resolve()
+    return summarize_files(analyze_file(path, root) for path in iter_cs_files(root))
+
+
+def summarize_files(rows: Iterable[dict]) -> dict:
     files = []
     totals = {
         "total_lines": 0,
         "non_blank_lines": 0,
         "comment_lines": 0,
         "code_lines": 0,
+        "mixed_lines": 0,
+        "directive_lines": 0,
     }
-    for path in iter_cs_files(root):
-        metrics = analyze_file(path, root)
+    for metrics in rows:
         files.append(metrics)
         for key in totals:
-            totals[key] += metrics[key]
+            totals[key] += metrics.get(key, 0)
     files.sort(key=lambda item: item["file"])
     return {"totals": totals, "files": files}
 
@@ -76,9 +171,20 @@ def main() -> None:
     parser.add_argument("--root", default=".", help="Root directory (default: current folder).")
     parser.add_argument("--output", help="Optional path to save JSON metrics.")
     parser.add_argument("--markdown", action="store_true", help="Render a markdown table instead of JSON.")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Compare code line counts with lizard's nloc and exit 1 on any mismatch.",
+    )
     args = parser.parse_args()
 
     root = Path(args.root)
+    if args.validate:
+        mismatches = validate(root)
+        for row in mismatches:
+            print(f"{row['file']}: code_lines {row['code_lines']} != lizard nloc {row['lizard_nloc']}")
+        print(f"{len(mismatches)} file(s) differ from lizard")
+        raise SystemExit(1 if mismatches else 0)
     metrics = collect_metrics(root)
 
     if args.output:
@@ -0,0 +1,291 @@
+"""Project walking helpers shared by the metrics tools."""
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+Buffer = Union[bytes, mmap.mmap]
+T = TypeVar("T")
+
+ROOT_SENTINEL = {"Library", "Logs", "obj", "ProjectSettings", "UserSettings", ".git"}
+
+
+def walk_project(root: Path) -> Iterable[Path]:
+    """Yield every file below ``root`` in sorted order, pruning ROOT_SENTINEL directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in ROOT_SENTINEL)
+        base = Path(dirpath)
+        for name in sorted(filenames):
+            yield base / name
+
+
+def iter_cs_files(root: Path) -> Iterable[Path]:
+    for path in walk_project(root):
+        if path.suffix == ".cs":
+            yield path
+
+
+@contextmanager
+def open_source(path: Path) -> Iterator[Buffer]:
+    """Map ``path`` read-only so it can be scanned with bytes regexes without a copy.
+
+    Empty files cannot be mapped and are yielded as ``b""``.
+    """
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def timer_available() -> bool:
+    """Whether ``time_limit`` can interrupt code on this thread (SIGALRM, main thread only)."""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+_warned_unbounded = False
+
+
+def warn_unbounded(seconds: float) -> None:
+    global _warned_unbounded
+    if not _warned_unbounded:
+        _warned_unbounded = True
+        print(f"warning: cannot enforce the {seconds:g}s time limit here; running unbounded", file=sys.stderr)
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Raise ``TimeoutError`` inside the block once ``seconds`` of wall time have passed.
+
+    SIGALRM also interrupts a regex match in progress. Without it (Windows,
+    non-main threads) the block runs unbounded, with a warning on stderr;
+    ``call_with_deadline`` covers those cases for picklable calls. A falsy
+    ``seconds`` disables the limit.
+    """
+    if not seconds:
+        yield
+        return
+    if not timer_available():
+        warn_unbounded(seconds)
+        yield
+        return
+
+    def expire(signum: int, frame: object) -> None:
+        raise TimeoutError(f"exceeded {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class DeadlineWorker:
+    """One reusable worker process that is killed and replaced when a call overruns."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pool: Optional[Any] = None
+
+    def call(self, func: Callable[..., T], args: Tuple[Any, ...], seconds: float) -> T:
+        with self.lock:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(1)
+            pending = self.pool.apply_async(func, args)
+            try:
+                return pending.get(seconds)
+            except multiprocessing.TimeoutError:
+                self.pool.terminate()
+                self.pool = None
+                raise TimeoutError(f"exceeded {seconds:g}s") from None
+
+    def close(self) -> None:
+        with self.lock:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool = None
+
+
+_deadline_worker = DeadlineWorker()
+
+
+def call_with_deadline(func: Callable[..., T], args: Tuple[Any, ...], seconds: Optional[float]) -> T:
+    """``func(*args)``, raising ``TimeoutError`` past ``seconds`` of wall time.
+
+    Uses ``time_limit`` where SIGALRM works. Elsewhere (Windows, server
+    handler threads) the call runs in a worker process that is terminated at
+    the deadline, so ``func`` and ``args`` must be picklable. Daemonic
+    processes cannot start one and run the call unbounded, with a warning.
+    """
+    if not seconds:
+        return func(*args)
+    if timer_available():
+        with time_limit(seconds):
+            return func(*args)
+    if multiprocessing.current_process().daemon:
+        warn_unbounded(seconds)
+        return func(*args)
+    return _deadline_worker.call(func, args, seconds)
+
+
+def decode(buf: Buffer, start: int = 0, end: int | None = None) -> str:
+    """Decode ``buf[start:end]`` as UTF-8 (dropping a BOM) without an intermediate bytes copy."""
+    view = memoryview(buf)[start:end]
+    try:
+        text = str(view, "utf-8", "ignore")
+    finally:
+        view.release()
+    return text[1:] if start == 0 and text.startswith("\ufeff") else text
+
+
+def line_offsets(buf: Buffer) -> array:
+    """Byte offset at which each line starts; ``offsets[n - 1]`` is line ``n``."""
+    offsets = array("q", [0])
+    offsets.extend(match.end() for match in re.finditer(rb"\n", buf))
+    if len(buf) and offsets[-1] == len(buf):
+        offsets.pop()
+    return offsets
+
+
+def line_of(offsets: array, position: int) -> int:
+    return bisect_right(offsets, position)
+
+
+def decode_lines(buf: Buffer, offsets: array, first: int, last: int) -> str:
+    """Decode lines ``first``..``last`` (1-based, inclusive)."""
+    start = offsets[first - 1] if first - 1 < len(offsets) else len(buf)
+    end = offsets[last] if last < len(offsets) else len(buf)
+    return decode(buf, start, end)
+
+
+@dataclass
+class YamlDocument:
+    class_id: int
+    file_id: int
+    start: int
+    end: int
+    stripped: bool = False
+
+
+YAML_DOCUMENT_HEADER = re.compile(rb"^--- !u!(\d+) &(-?\d+)( stripped)?", re.MULTILINE)
+
+
+def iter_yaml_documents(buf: Buffer) -> Iterator[YamlDocument]:
+    """Yield the byte span of each ``--- !u!<class> &<fileID>`` document in a Unity YAML file."""
+    previous = None
+    for match in YAML_DOCUMENT_HEADER.finditer(buf):
+        if previous is not None:
+            yield _yaml_document(previous, match.start())
+        previous = match
+    if previous is not None:
+        yield _yaml_document(previous, len(buf))
+
+
+def _yaml_document(header: re.Match[bytes], end: int) -> YamlDocument:
+    return YamlDocument(
+        class_id=int(header.group(1)),
+        file_id=int(header.group(2)),
+        start=header.start(),
+        end=end,
+        stripped=header.group(3) is not None,
+    )
+
+
+# Unity YAML class IDs used by the scene/prefab stages.
+GAME_OBJECT_CLASS_ID = 1
+MONO_BEHAVIOUR_CLASS_ID = 114
+PREFAB_INSTANCE_CLASS_ID = 1001
+
+META_GUID_PATTERN = re.compile(rb"^guid: ([0-9a-f]{32})", re.MULTILINE)
+SCRIPT_REFERENCE_PATTERN = re.compile(rb"^  m_Script: \{fileID: -?\d+, guid: ([0-9a-f]{32})", re.MULTILINE)
+FIELD_REFERENCE_PATTERN = re.compile(
+    rb"^  (\w+): \{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?", re.MULTILINE
+)
+REMOVED_COMPONENTS_PATTERN = re.compile(rb"^ *m_RemovedComponents:\r?\n((?: *- \{[^\n]*\n)+)", re.MULTILINE)
+LIST_REFERENCE_PATTERN = re.compile(rb"\{fileID: (-?\d+), guid: ([0-9a-f]{32})")
+
+
+def read_meta_guid(meta_path: Path) -> Optional[str]:
+    try:
+        with open_source(meta_path) as buf:
+            match = META_GUID_PATTERN.search(buf)
+            return match.group(1).decode("ascii") if match else None
+    except OSError:
+        return None
+
+
+def build_guid_index(root: Path, suffixes: Set[str]) -> Dict[str, str]:
+    """Map asset GUIDs to project-relative paths for assets with the given suffixes."""
+    index: Dict[str, str] = {}
+    for path in walk_project(root):
+        if path.suffix != ".meta":
+            continue
+        asset = path.with_suffix("")
+        if asset.suffix.lower() not in suffixes:
+            continue
+        guid = read_meta_guid(path)
+        if guid:
+            index[guid] = asset.relative_to(root).as_posix()
+    return index
+
+
+def script_guid(buf: Buffer, document: YamlDocument) -> Optional[str]:
+    match = SCRIPT_REFERENCE_PATTERN.search(buf, document.start, document.end)
+    return match.group(1).decode("ascii") if match else None
+
+
+def field_references(buf: Buffer, document: YamlDocument) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Top-level ``field: {fileID: ..., guid: ...}`` references of a YAML document."""
+    references: Dict[str, Tuple[int, Optional[str]]] = {}
+    for match in FIELD_REFERENCE_PATTERN.finditer(buf, document.start, document.end):
+        guid = match.group(3).decode("ascii") if match.group(3) else None
+        references[match.group(1).decode("ascii")] = (int(match.group(2)), guid)
+    return references
+
+
+def removed_components(buf: Buffer, document: YamlDocument) -> List[Tuple[int, str]]:
+    """``(fileID, prefab guid)`` of each source prefab component a PrefabInstance removes."""
+    match = REMOVED_COMPONENTS_PATTERN.search(buf, document.start, document.end)
+    if match is None:
+        return []
+    return [
+        (int(entry.group(1)), entry.group(2).decode("ascii"))
+        for entry in LIST_REFERENCE_PATTERN.finditer(match.group(1))
+    ]
+
+
+@dataclass
+class PrefabWeight:
+    game_objects: int = 0
+    components: int = 0
+    nested_prefabs: int = 0
+
+
+def prefab_weight(path: Path) -> PrefabWeight:
+    """Count GameObjects, components and nested prefab instances declared in a prefab file."""
+    weight = PrefabWeight()
+    with open_source(path) as buf:
+        for document in iter_yaml_documents(buf):
+            if document.stripped:
+                continue
+            if document.class_id == GAME_OBJECT_CLASS_ID:
+                weight.game_objects += 1
+            elif document.class_id == PREFAB_INSTANCE_CLASS_ID:
+                weight.nested_prefabs += 1
+            else:
+                weight.components += 1
+    return weight
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Compare two ``analyze_code_metrics.py`` outputs and enforce a metrics budget.
+
+Methods are keyed by file and qualified name, classes by namespace-qualified
+name, and per-frame hazards by (file, method, kind, snippet) so line shifts do
+not count as changes. Both sides are indexed into dicts once, so a diff is
+linear in the number of entities. The budget file may be JSON or YAML (YAML
+needs PyYAML); missing keys fall back to ``DEFAULT_BUDGET``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ``None`` disables a check.
+DEFAULT_BUDGET: Dict[str, Dict[str, Optional[float]]] = {
+    "methods": {"max_ccn": 15},
+    "classes": {"max_cbo_increase": 0, "max_new_class_cbo": None},
+    "frame_hazards": {"max_added": 0},
+    "totals": {
+        "max_loc_growth": None,
+        "max_loc_growth_percent": None,
+        "max_duplicate_percent": None,
+        "max_duplicate_growth": None,
+    },
+}
+
+METHOD_FIELDS = ("complexity", "loc", "parameter_count")
+CLASS_FIELDS = ("cbo", "wmc", "rfc", "lcom", "dit")
+
+Key = Tuple[str, ...]
+
+
+def load_budget(path: Optional[Path]) -> Dict[str, Dict[str, Optional[float]]]:
+    budget = {section: dict(values) for section, values in DEFAULT_BUDGET.items()}
+    if path is None:
+        return budget
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise SystemExit(f"{path}: {exc.strerror}")
+    if path.suffix in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("PyYAML is required for YAML budget files (pip install pyyaml), or use JSON.")
+        try:
+            data = yaml.safe_load(text) or {}
+        except yaml.YAMLError as exc:
+            raise SystemExit(f"{path}: not valid YAML ({exc})")
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as exc:
+            raise SystemExit(f"{path}: not valid JSON ({exc})")
+    if not isinstance(data, dict):
+        raise SystemExit(f"{path}: expected a mapping of budget sections")
+    for section, values in data.items():
+        if section not in budget:
+            raise SystemExit(f"{path}: unknown budget section: {section}")
+        if not isinstance(values, dict):
+            raise SystemExit(f"{path}: {section} must be a mapping of budget keys")
+        unknown = set(values) - set(budget[section])
+        if unknown:
+            raise SystemExit(f"{path}: unknown budget keys in {section}: {', '.join(sorted(unknown))}")
+        for key, value in values.items():
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise SystemExit(f"{path}: {section}.{key} must be a number or null")
+        budget[section].update(values)
+    return budget
+
+
+REQUIRED_ROW_FIELDS = {
+    "methods": ("file_path", "qualified_name", "start_line", "complexity"),
+    "classes": ("name", "file_path", "start_line", "cbo"),
+}
+
+
+def validate_report(metrics: object, label: str) -> dict:
+    """Check the parts of an analyze_code_metrics.py output the gate reads."""
+    if not isinstance(metrics, dict):
+        raise SystemExit(f"{label}: expected a JSON object from analyze_code_metrics.py")
+    stats = metrics.get("stats")
+    if not isinstance(stats, dict) or not isinstance(stats.get("total_loc"), (int, float)):
+        raise SystemExit(f"{label}: missing stats.total_loc; is this an analyze_code_metrics.py output?")
+    for section, fields in REQUIRED_ROW_FIELDS.items():
+        rows = metrics.get(section, [])
+        if not isinstance(rows, list):
+            raise SystemExit(f"{label}: {section} must be a list")
+        for index, row in enumerate(rows):
+            missing = [name for name in fields if not isinstance(row, dict) or name not in row]
+            if missing:
+                raise SystemExit(f"{label}: {section}[{index}] is missing {', '.join(missing)}")
+    return metrics
+
+
+def index_entities(rows: Iterable[dict], key_fields: Tuple[str, ...]) -> Dict[Key, dict]:
+    """Key rows by ``key_fields``; repeated keys (overloads) get an occurrence suffix."""
+    index: Dict[Key, dict] = {}
+    seen: Counter[Key] = Counter()
+    for row in rows:
+        base = tuple(row.get(name) or "" for name in key_fields)
+        seen[base] += 1
+        index[base if seen[base] == 1 else base + (f"#{seen[base]}",)] = row
+    return index
+
+
+def class_rows(metrics: dict) -> Iterable[dict]:
+    for cls in metrics.get("classes", []):
+        qualified = f"{cls['namespace']}.{cls['name']}" if cls.get("namespace") else cls["name"]
+        yield {**cls, "qualified": qualified}
+
+
+def frame_hazard_counts(metrics: dict) -> Counter[Key]:
+    counts: Counter[Key] = Counter()
+    for row in metrics.get("frame_cost", []):
+        for hazard in row["hazards"]:
+            counts[(hazard["file"], hazard["method"], hazard["kind"], hazard["snippet"])] += 1
+    return counts
+
+
+def diff_entities(
+    baseline: Dict[Key, dict], current: Dict[Key, dict], fields: Tuple[str, ...]
+) -> Dict[str, List[Tuple[Key, Optional[dict], Optional[dict]]]]:
+    added = [(key, None, row) for key, row in current.items() if key not in baseline]
+    removed = [(key, row, None) for key, row in baseline.items() if key not in current]
+    changed = []
+    for key, row in current.items():
+        before = baseline.get(key)
+        if before is not None and any(before.get(name) != row.get(name) for name in fields):
+            changed.append((key, before, row))
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def summarize_diff(diff: Dict[str, list], fields: Tuple[str, ...]) -> Dict[str, object]:
+    def changes(before: dict, after: dict) -> Dict[str, List[object]]:
+        return {name: [before.get(name), after.get(name)] for name in fields if before.get(name) != after.get(name)}
+
+    return {
+        "added": ["::".join(key) for key, _, _ in diff["added"]],
+        "removed": ["::".join(key) for key, _, _ in diff["removed"]],
+        "changed": [{"key": "::".join(key), "changes": changes(before, after)} for key, before, after in diff["changed"]],
+    }
+
+
+def check_budget(
+    budget: Dict[str, Dict[str, Optional[float]]],
+    method_diff: Dict[str, list],
+    class_diff: Dict[str, list],
+    added_hazards: Counter[Key],
+    baseline: dict,
+    current: dict,
+) -> List[str]:
+    violations: List[str] = []
+
+    max_ccn = budget["methods"]["max_ccn"]
+    if max_ccn is not None:
+        for _, before, after in method_diff["added"] + method_diff["changed"]:
+            ccn = after["complexity"]
+            previous = before["complexity"] if before else None
+            # Methods already over the threshold only fail when they get worse.
+            if ccn > max_ccn and (previous is None or ccn > max(previous, max_ccn)):
+                was = f" (was {previous})" if previous is not None else " (new)"
+                violations.append(
+                    f"{after['file_path']}:{after['start_line']} {after['qualified_name']} CCN {ccn} > {max_ccn}{was}"
+                )
+
+    max_cbo_increase = budget["classes"]["max_cbo_increase"]
+    if max_cbo_increase is not None:
+        for _, before, after in class_diff["changed"]:
+            if after["cbo"] - before["cbo"] > max_cbo_increase:
+                violations.append(
+                    f"{after['file_path']}:{after['start_line']} {after['qualified']} CBO {before['cbo']} -> {after['cbo']}"
+                )
+    max_new_class_cbo = budget["classes"]["max_new_class_cbo"]
+    if max_new_class_cbo is not None:
+        for _, _, after in class_diff["added"]:
+            if after["cbo"] > max_new_class_cbo:
+                violations.append(
+                    f"{after['file_path']}:{after['start_line']} {after['qualified']} CBO {after['cbo']} > {max_new_class_cbo} (new)"
+                )
+
+    max_added = budget["frame_hazards"]["max_added"]
+    if max_added is not None and sum(added_hazards.values()) > max_added:
+        for (file_path, method, kind, snippet), count in sorted(added_hazards.items()):
+            violations.append(f"{file_path} {method} new per-frame {kind} `{snippet}` x{count}")
+
+    totals = budget["totals"]
+    loc_before = baseline["stats"]["total_loc"]
+    loc_after = current["stats"]["total_loc"]
+    growth = loc_after - loc_before
+    if totals["max_loc_growth"] is not None and growth > totals["max_loc_growth"]:
+        violations.append(f"total LOC grew by {growth} (budget {totals['max_loc_growth']})")
+    if totals["max_loc_growth_percent"] is not None and loc_before:
+        percent = growth / loc_before * 100
+        if percent > totals["max_loc_growth_percent"]:
+            violations.append(f"total LOC grew by {percent:.1f}% (budget {totals['max_loc_growth_percent']}%)")
+
+    duplicates_before = baseline.get("duplicates", {}).get("percentage", 0.0)
+    duplicates_after = current.get("duplicates", {}).get("percentage", 0.0)
+    if totals["max_duplicate_percent"] is not None and duplicates_after > totals["max_duplicate_percent"]:
+        violations.append(f"duplicate lines at {duplicates_after:.1f}% (budget {totals['max_duplicate_percent']}%)")
+    if (
+        totals["max_duplicate_growth"] is not None
+        and duplicates_after - duplicates_before > totals["max_duplicate_growth"]
+    ):
+        violations.append(
+            f"duplicate lines grew from {duplicates_before:.1f}% to {duplicates_after:.1f}% "
+            f"(budget +{totals['max_duplicate_growth']})"
+        )
+    return violations
+
+
+def compare(baseline: dict, current: dict, budget: Dict[str, Dict[str, Optional[float]]]) -> Dict[str, object]:
+    method_diff = diff_entities(
+        index_entities(baseline.get("methods", []), ("file_path", "qualified_name")),
+        index_entities(current.get("methods", []), ("file_path", "qualified_name")),
+        METHOD_FIELDS,
+    )
+    class_diff = diff_entities(
+        index_entities(class_rows(baseline), ("qualified",)),
+        index_entities(class_rows(current), ("qualified",)),
+        CLASS_FIELDS,
+    )
+    added_hazards = frame_hazard_counts(current) - frame_hazard_counts(baseline)
+    violations = check_budget(budget, method_diff, class_diff, added_hazards, baseline, current)
+    return {
+        "methods": summarize_diff(method_diff, METHOD_FIELDS),
+        "classes": summarize_diff(class_diff, CLASS_FIELDS),
+        "added_frame_hazards": sum(added_hazards.values()),
+        "total_loc": [baseline["stats"]["total_loc"], current["stats"]["total_loc"]],
+        "duplicate_percentage": [
+            baseline.get("duplicates", {}).get("percentage", 0.0),
+            current.get("duplicates", {}).get("percentage", 0.0),
+        ],
+        "violations": violations,
+    }
+
+
+def render_report(result: Dict[str, object]) -> str:
+    lines = []
+    for section in ("methods", "classes"):
+        diff = result[section]
+        lines.append(
+            f"{section}: +{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])}"
+        )
+    before, after = result["total_loc"]
+    lines.append(f"total LOC: {before} -> {after} ({after - before:+d})")
+    lines.append(f"new per-frame hazards: {result['added_frame_hazards']}")
+    if result["violations"]:
+        lines.append(f"{len(result['violations'])} budget violation(s):")
+        lines.extend(f"  {violation}" for violation in result["violations"])
+    else:
+        lines.append("budget OK")
+    return "\n".join(lines)
+
+
+def load_report(path: Path) -> dict:
+    try:
+        metrics = json.loads(path.read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise SystemExit(f"{path}: {exc.strerror}")
+    except ValueError as exc:
+        raise SystemExit(f"{path}: not valid JSON ({exc})")
+    return validate_report(metrics, str(path))
+
+
+def run(baseline_path: Path, current_path: Path, budget_path: Optional[Path], output: Optional[str]) -> int:
+    baseline, current = (load_report(path) for path in (baseline_path, current_path))
+    result = compare(baseline, current, load_budget(budget_path))
+    if output:
+        Path(output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(render_report(result))
+    return 1 if result["violations"] else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fail when metrics regress past a budget.")
+    parser.add_argument("baseline", help="Baseline analyze_code_metrics.py JSON output.")
+    parser.add_argument("current", help="Current analyze_code_metrics.py JSON output.")
+    parser.add_argument("--budget", help="JSON or YAML budget file (default: built-in budget).")
+    parser.add_argument("--output", help="Optional JSON file for the full diff.")
+    args = parser.parse_args()
+    raise SystemExit(
+        run(Path(args.baseline), Path(args.current), Path(args.budget) if args.budget else None, args.output)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Stratified file sampling and estimators for the ``--approx`` modes.
+
+Files are stratified by their top two directories and a size class (powers of
+four in bytes). File size is known for every file without parsing it, so it
+serves as the auxiliary variable that sizes the sample: the Neyman allocation
+is chosen so the estimated total size would meet the requested relative error
+at the requested confidence. LOC and CCN track size closely, so their
+estimates land near the same bound, and the reported confidence intervals are
+computed from the sampled values themselves.
+"""
+from __future__ import annotations
+
+import math
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_ERROR = 0.05
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 0
+MIN_PER_STRATUM = 2
+
+
+@dataclass
+class Stratum:
+    key: str
+    population: List[str] = field(default_factory=list)
+    sizes: List[int] = field(default_factory=list)
+    sample: List[str] = field(default_factory=list)
+
+    @property
+    def weight(self) -> float:
+        """Files represented by each sampled file."""
+        return len(self.population) / len(self.sample)
+
+
+@dataclass
+class Estimate:
+    value: float
+    low: float
+    high: float
+
+    def scaled(self, factor: float) -> "Estimate":
+        return Estimate(self.value * factor, self.low * factor, self.high * factor)
+
+
+@dataclass
+class SamplePlan:
+    strata: List[Stratum]
+    error: float
+    confidence: float
+    seed: int
+
+    @property
+    def z(self) -> float:
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+    @property
+    def sampled(self) -> List[str]:
+        return [path for stratum in self.strata for path in stratum.sample]
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "population_files": sum(len(stratum.population) for stratum in self.strata),
+            "sampled_files": sum(len(stratum.sample) for stratum in self.strata),
+            "strata": len(self.strata),
+            "error_bound": self.error,
+            "confidence": self.confidence,
+            "seed": self.seed,
+        }
+
+
+def stratum_key(rel_path: str, size: int) -> str:
+    directory = "/".join(PurePosixPath(rel_path).parts[:-1][:2]) or "."
+    return f"{directory}|{size.bit_length() // 2}"
+
+
+def plan_sample(
+    root: Path,
+    paths: Iterable[Path],
+    error: float = DEFAULT_ERROR,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = DEFAULT_SEED,
+) -> SamplePlan:
+    """Choose a deterministic stratified sample of ``paths`` (keyed by root-relative posix path)."""
+    by_key: Dict[str, Stratum] = {}
+    for path in paths:
+        rel = path.relative_to(root).as_posix()
+        size = path.stat().st_size
+        key = stratum_key(rel, size)
+        stratum = by_key.setdefault(key, Stratum(key))
+        stratum.population.append(rel)
+        stratum.sizes.append(size)
+    strata = [by_key[key] for key in sorted(by_key)]
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    total_size = sum(sum(stratum.sizes) for stratum in strata)
+    spread = [len(stratum.sizes) * pstdev(stratum.sizes) for stratum in strata]
+    # Neyman allocation: Var(T) = (sum N_h S_h)^2 / n - sum N_h S_h^2, solved for n.
+    target_variance = (error * total_size / z) ** 2
+    within = sum(len(stratum.sizes) * pstdev(stratum.sizes) ** 2 for stratum in strata)
+    denominator = target_variance + within
+    needed = sum(spread) ** 2 / denominator if denominator else 0.0
+
+    rng = random.Random(seed)
+    for stratum, share in zip(strata, spread):
+        population = len(stratum.population)
+        allocated = math.ceil(needed * share / sum(spread)) if sum(spread) else 0
+        count = min(population, max(MIN_PER_STRATUM, allocated))
+        stratum.sample = sorted(rng.sample(sorted(stratum.population), count))
+    return SamplePlan(strata=strata, error=error, confidence=confidence, seed=seed)
+
+
+def pstdev(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+
+
+def sample_variance(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+def _total_and_variance(plan: SamplePlan, values: Dict[str, float]) -> Tuple[float, float]:
+    total = 0.0
+    variance = 0.0
+    for stratum in plan.strata:
+        ys = [values[path] for path in stratum.sample]
+        population = len(stratum.population)
+        total += population * sum(ys) / len(ys)
+        # Finite population correction; fully enumerated strata contribute no variance.
+        variance += population**2 * (1 - len(ys) / population) * sample_variance(ys) / len(ys)
+    return total, variance
+
+
+def estimate_total(plan: SamplePlan, values: Dict[str, float]) -> Estimate:
+    """Stratified estimate of the population total of a per-file value."""
+    total, variance = _total_and_variance(plan, values)
+    margin = plan.z * math.sqrt(variance)
+    return Estimate(total, max(total - margin, 0.0), total + margin)
+
+
+def estimate_ratio(plan: SamplePlan, numerator: Dict[str, float], denominator: Dict[str, float]) -> Estimate:
+    """Combined ratio estimate of ``sum(numerator) / sum(denominator)`` with a linearized interval."""
+    top, _ = _total_and_variance(plan, numerator)
+    bottom, _ = _total_and_variance(plan, denominator)
+    if not bottom:
+        return Estimate(0.0, 0.0, 0.0)
+    ratio = top / bottom
+    residuals = {path: numerator[path] - ratio * denominator[path] for path in plan.sampled}
+    _, variance = _total_and_variance(plan, residuals)
+    margin = plan.z * math.sqrt(variance) / bottom
+    return Estimate(ratio, ratio - margin, ratio + margin)
+
+
+def weighted_quantile(pairs: Sequence[Tuple[float, float]], q: float) -> float:
+    """Quantile of (value, weight) pairs, taking the first value whose cumulative weight reaches ``q``."""
+    if not pairs:
+        return 0.0
+    ordered = sorted(pairs)
+    limit = q * sum(weight for _, weight in ordered)
+    cumulative = 0.0
+    for value, weight in ordered:
+        cumulative += weight
+        if cumulative >= limit:
+            return value
+    return ordered[-1][0]
+
+
+def estimate_quantile(plan: SamplePlan, values: Dict[str, List[float]], q: float = 0.5) -> Estimate:
+    """Quantile of per-item values (e.g. methods) grouped by sampled file.
+
+    Items are weighted by their file's stratum weight. The interval uses
+    Woodruff's method on the item count and ignores clustering within files,
+    so it is somewhat narrower than the true interval.
+    """
+    pairs = [
+        (value, stratum.weight) for stratum in plan.strata for path in stratum.sample for value in values.get(path, ())
+    ]
+    if not pairs:
+        return Estimate(0.0, 0.0, 0.0)
+    spread = plan.z * math.sqrt(q * (1 - q) / len(pairs))
+    return Estimate(
+        weighted_quantile(pairs, q),
+        weighted_quantile(pairs, max(q - spread, 0.0)),
+        weighted_quantile(pairs, min(q + spread, 1.0)),
+    )
+
+
+def group_items(records: Iterable[Tuple[str, float]]) -> Dict[str, List[float]]:
+    grouped: Dict[str, List[float]] = defaultdict(list)
+    for path, value in records:
+        grouped[path].append(value)
+    return grouped
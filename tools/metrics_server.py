@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Serve ``analyze_code_metrics.py`` results over HTTP/JSON on localhost.
+
+The metrics are loaded from a JSON output (or computed from a project root)
+once and indexed by file, class, method and sorted path for directory
+rollups. Rollups are LRU-cached per loaded snapshot. The source is re-checked
+at most every ``--poll`` seconds: a changed JSON file, or in ``--root`` mode
+any added, removed, renamed or modified source, scene, prefab or ``.meta``
+file, rebuilds the index.
+
+Endpoints::
+
+    GET /stats
+    GET /files/<path>
+    GET /classes/<name>
+    GET /methods/<Class::Method>[?file=<path>]
+    GET /top?entity=methods|classes|files&metric=<field>&n=10
+    GET /rollup?prefix=<dir>
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+ROLLUP_CACHE_SIZE = 256
+# Files calculate_metrics reads: sources, and the scenes, prefabs and metas behind spawn sites.
+SIGNATURE_SUFFIXES = {".cs", ".unity", ".prefab", ".meta"}
+FILE_SUM_FIELDS = ("total_lines", "code_lines", "comment_lines", "blank_lines", "cyclomatic_total")
+
+
+class MetricsIndex:
+    """Read-only lookup structures over one metrics snapshot."""
+
+    def __init__(self, metrics: dict) -> None:
+        self.stats = metrics.get("stats", {})
+        self.files: Dict[str, dict] = {}
+        for row in metrics.get("files", []):
+            self.files[row["path"]] = {k: v for k, v in row.items() if k not in ("functions", "classes")}
+        self.paths = sorted(self.files)
+        self.methods: List[dict] = metrics.get("methods", [])
+        self.classes: List[dict] = metrics.get("classes", [])
+        self.methods_by_name: Dict[str, List[dict]] = defaultdict(list)
+        self.methods_by_file: Dict[str, List[dict]] = defaultdict(list)
+        for method in self.methods:
+            self.methods_by_name[method["qualified_name"]].append(method)
+            self.methods_by_file[method["file_path"]].append(method)
+        self.classes_by_name: Dict[str, List[dict]] = defaultdict(list)
+        self.classes_by_file: Dict[str, List[dict]] = defaultdict(list)
+        for cls in self.classes:
+            self.classes_by_name[cls["name"]].append(cls)
+            self.classes_by_file[cls["file_path"]].append(cls)
+        self.rollup = lru_cache(maxsize=ROLLUP_CACHE_SIZE)(self._rollup)
+
+    def file(self, path: str) -> Optional[dict]:
+        row = self.files.get(path)
+        if row is None:
+            return None
+        return {
+            **row,
+            "methods": self.methods_by_file.get(path, []),
+            "classes": self.classes_by_file.get(path, []),
+        }
+
+    def top(self, entity: str, metric: str, n: int) -> List[dict]:
+        rows = {"methods": self.methods, "classes": self.classes, "files": self.files.values()}.get(entity)
+        if rows is None:
+            raise ValueError(f"unknown entity: {entity}")
+        ranked = [row for row in rows if isinstance(row.get(metric), (int, float)) and not isinstance(row[metric], bool)]
+        if rows and not ranked:
+            raise ValueError(f"{entity} have no numeric metric {metric!r}")
+        return heapq.nlargest(n, ranked, key=lambda row: row[metric])
+
+    def _rollup(self, prefix: str) -> dict:
+        start = prefix + "/" if prefix else ""
+        # Paths are sorted, so every file under the prefix is one contiguous slice.
+        first = bisect_left(self.paths, start)
+        last = bisect_left(self.paths, start + "\uffff") if start else len(self.paths)
+        paths = self.paths[first:last]
+        totals = {name: sum(self.files[path][name] for path in paths) for name in FILE_SUM_FIELDS}
+        complexities = [m["complexity"] for path in paths for m in self.methods_by_file.get(path, [])]
+        return {
+            "prefix": prefix,
+            "files": len(paths),
+            **totals,
+            "methods": len(complexities),
+            "classes": sum(len(self.classes_by_file.get(path, [])) for path in paths),
+            "max_method_complexity": max(complexities, default=0),
+            "average_method_complexity": sum(complexities) / len(complexities) if complexities else 0,
+        }
+
+
+class MetricsSource:
+    """Loads the index and rebuilds it when the underlying metrics change."""
+
+    def __init__(self, metrics_path: Optional[Path], root: Optional[Path], poll: float) -> None:
+        self.metrics_path = metrics_path
+        self.root = root
+        self.poll = poll
+        self.lock = threading.Lock()
+        self.checked = 0.0
+        self.signature = self.current_signature()
+        self.index = MetricsIndex(self.load())
+        self.loaded_at = time.time()
+
+    def current_signature(self) -> str:
+        """Digest of the sorted (path, mtime_ns, size) of every input file."""
+        digest = hashlib.sha256()
+        if self.metrics_path is not None:
+            paths = [self.metrics_path]
+        else:
+            from metrics_common import walk_project
+
+            # Every Unity asset has a .meta, so asset adds and removes show up too.
+            paths = [path for path in walk_project(self.root) if path.suffix in SIGNATURE_SUFFIXES]
+        for path in sorted(paths):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
+    def load(self) -> dict:
+        if self.metrics_path is not None:
+            return json.loads(self.metrics_path.read_text(encoding="utf-8"))
+        from analyze_code_metrics import calculate_metrics, json_default
+
+        # Round-trip through JSON so the index sees the same plain dicts as a saved output.
+        return json.loads(json.dumps(calculate_metrics(self.root), default=json_default))
+
+    def get(self) -> MetricsIndex:
+        now = time.monotonic()
+        if now - self.checked < self.poll:
+            return self.index
+        with self.lock:
+            if now - self.checked >= self.poll:
+                self.checked = now
+                signature = self.current_signature()
+                if signature != self.signature:
+                    self.index = MetricsIndex(self.load())
+                    self.signature = signature
+                    self.loaded_at = time.time()
+        return self.index
+
+
+def make_handler(source: MetricsSource) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            parts = url.path.strip("/").split("/", 1)
+            route = ROUTES.get(parts[0])
+            if route is None:
+                self.send_json(404, {"error": f"unknown endpoint: /{parts[0]}"})
+                return
+            try:
+                status, body = route(source.get(), unquote(parts[1]) if len(parts) > 1 else "", query)
+            except ValueError as exc:
+                status, body = 400, {"error": str(exc)}
+            self.send_json(status, body)
+
+        def send_json(self, status: int, body: object) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    def stats(index: MetricsIndex, _: str, __: Dict[str, str]) -> Tuple[int, object]:
+        cache = index.rollup.cache_info()
+        return 200, {
+            "stats": index.stats,
+            "files": len(index.files),
+            "loaded_at": source.loaded_at,
+            "rollup_cache": {"hits": cache.hits, "misses": cache.misses, "size": cache.currsize},
+        }
+
+    def files(index: MetricsIndex, path: str, _: Dict[str, str]) -> Tuple[int, object]:
+        row = index.file(path)
+        return (200, row) if row else (404, {"error": f"unknown file: {path}"})
+
+    def classes(index: MetricsIndex, name: str, _: Dict[str, str]) -> Tuple[int, object]:
+        rows = index.classes_by_name.get(name)
+        return (200, rows) if rows else (404, {"error": f"unknown class: {name}"})
+
+    def methods(index: MetricsIndex, name: str, query: Dict[str, str]) -> Tuple[int, object]:
+        rows = index.methods_by_name.get(name, [])
+        if "file" in query:
+            rows = [row for row in rows if row["file_path"] == query["file"]]
+        return (200, rows) if rows else (404, {"error": f"unknown method: {name}"})
+
+    def top(index: MetricsIndex, _: str, query: Dict[str, str]) -> Tuple[int, object]:
+        n = int(query.get("n", 10))
+        return 200, index.top(query.get("entity", "methods"), query.get("metric", "complexity"), n)
+
+    def rollup(index: MetricsIndex, _: str, query: Dict[str, str]) -> Tuple[int, object]:
+        # Normalize before the cached call so "a/b" and "a/b/" share an entry.
+        return 200, index.rollup(query.get("prefix", "").strip("/"))
+
+    ROUTES: Dict[str, Callable[[MetricsIndex, str, Dict[str, str]], Tuple[int, object]]] = {
+        "stats": stats,
+        "files": files,
+        "classes": classes,
+        "methods": methods,
+        "top": top,
+        "rollup": rollup,
+    }
+    return Handler
+
+
+def serve(metrics_path: Optional[Path], root: Optional[Path], port: int, poll: float) -> None:
+    source = MetricsSource(metrics_path, root, poll)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(source))
+    print(f"Serving metrics for {metrics_path or root} on http://127.0.0.1:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve repository metrics as HTTP/JSON on localhost.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--metrics", help="analyze_code_metrics.py JSON output to serve.")
+    source.add_argument("--root", default=".", help="Project root to analyze when --metrics is not given.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765).")
+    parser.add_argument("--poll", type=float, default=2.0, help="Seconds between change checks (default: 2).")
+    args = parser.parse_args()
+
+    metrics_path = Path(args.metrics).resolve() if args.metrics else None
+    serve(metrics_path, None if metrics_path else Path(args.root).resolve(), args.port, args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Estimate per-scene MonoBehaviour deserialization cost.
+
+Every ``.unity`` scene is streamed document by document for MonoBehaviour
+``m_Script`` GUIDs. Prefab instances are expanded from their source
+``.prefab`` (each counted once, nested instances included), since a scene
+load deserializes their components too. GUIDs resolve through the
+``.cs.meta`` files to the class Unity binds to the script: the one named
+after the file, else the first type with a base list, else the first type.
+
+A prefab instance's ``m_RemovedComponents`` are subtracted from its source
+prefab's counts.
+
+A script's cost in a scene is its instance count times the fields Unity
+serializes in its class: public or ``[SerializeField]``/``[SerializeReference]``,
+and not static, const, readonly or ``[NonSerialized]``. Field types are not
+checked, so a public field of a type Unity skips still counts. Components
+whose GUID is not a project script (UI, TextMeshPro and other package
+scripts) are counted as unresolved.
+
+The GUID -> class map is cached in ``.metrics-cache/script_classes.json`` and
+an entry is only re-parsed when its ``.cs`` or ``.meta`` file changes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from metrics_common import (
+    MONO_BEHAVIOUR_CLASS_ID,
+    PREFAB_INSTANCE_CLASS_ID,
+    field_references,
+    iter_yaml_documents,
+    open_source,
+    read_meta_guid,
+    removed_components,
+    script_guid,
+    walk_project,
+)
+
+DEFAULT_CACHE_PATH = ".metrics-cache/script_classes.json"
+CACHE_VERSION = 2
+DEFAULT_TOP = 5
+
+SERIALIZE_ATTRIBUTE_PATTERN = re.compile(r"\b(?:SerializeField|SerializeReference)(?:Attribute)?\b")
+NON_SERIALIZED_ATTRIBUTE_PATTERN = re.compile(r"\bNonSerialized(?:Attribute)?\b")
+NOT_SERIALIZED_MODIFIERS = {"static", "const", "readonly", "event"}
+# Unity derives the fileID of an object inside a nested prefab instance from
+# the instance's fileID and the object's fileID in the nested prefab.
+FILE_ID_MASK = 0x7FFFFFFFFFFFFFFF
+
+
+@dataclass
+class ScriptClass:
+    guid: str
+    file: str
+    name: str
+    fields: int
+
+
+def stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def serialized_field_names(statement: str) -> List[str]:
+    """Field names a class-level statement declares, if Unity serializes them."""
+    from analyze_code_metrics import field_names, split_attributes
+
+    attributes, declaration = split_attributes(statement)
+    modifiers = set(declaration.split())
+    if modifiers & NOT_SERIALIZED_MODIFIERS or NON_SERIALIZED_ATTRIBUTE_PATTERN.search(attributes):
+        return []
+    if "public" not in modifiers and not SERIALIZE_ATTRIBUTE_PATTERN.search(attributes):
+        return []
+    return field_names(statement)
+
+
+def describe_script(root: Path, path: Path, guid: str) -> ScriptClass:
+    from analyze_code_metrics import class_body, extract_class_blocks, iter_field_statements
+    from metrics_common import decode_lines, line_offsets
+
+    relative = path.relative_to(root).as_posix()
+    with open_source(path) as buf:
+        offsets = line_offsets(buf)
+        blocks = extract_class_blocks(buf, relative, offsets)
+        bound = (
+            next((cls for cls in blocks if cls.name == path.stem), None)
+            or next((cls for cls in blocks if cls.kind == "class" and cls.bases_raw), None)
+            or next(iter(blocks), None)
+        )
+        if bound is None:
+            return ScriptClass(guid, relative, path.stem, 0)
+        body = class_body(decode_lines(buf, offsets, bound.start_line, bound.end_line))
+        fields = {name for statement in iter_field_statements([body]) for name in serialized_field_names(statement)}
+    return ScriptClass(guid, relative, bound.name, len(fields))
+
+
+def load_script_classes(root: Path, scripts: List[Path], cache_path: Optional[Path] = None) -> Dict[str, ScriptClass]:
+    """Map script GUIDs to their bound classes, reusing cache entries whose files are unchanged."""
+    cache_path = cache_path or root / DEFAULT_CACHE_PATH
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        entries = cached["scripts"] if cached.get("version") == CACHE_VERSION else {}
+    except (OSError, ValueError, KeyError):
+        entries = {}
+
+    fresh: Dict[str, dict] = {}
+    for path in scripts:
+        meta = path.with_name(path.name + ".meta")
+        if not meta.exists():
+            continue
+        relative = path.relative_to(root).as_posix()
+        key = stamp(path) + stamp(meta)
+        entry = entries.get(relative)
+        if entry is None or entry["stamp"] != key:
+            guid = read_meta_guid(meta)
+            if guid is None:
+                continue
+            entry = {"stamp": key, **asdict(describe_script(root, path, guid))}
+        fresh[relative] = entry
+
+    if fresh != entries:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"version": CACHE_VERSION, "scripts": fresh}), encoding="utf-8")
+    return {
+        entry["guid"]: ScriptClass(entry["guid"], entry["file"], entry["name"], entry["fields"])
+        for entry in fresh.values()
+    }
+
+
+class InstanceCounter:
+    """Counts MonoBehaviours per script GUID in scenes and prefabs, caching each prefab."""
+
+    def __init__(self, prefab_metas: List[Path]) -> None:
+        self.prefab_metas = prefab_metas
+        self._prefab_paths: Optional[Dict[str, Path]] = None
+        self.prefabs: Dict[str, Tuple[Counter[str], Dict[int, str]]] = {}
+
+    def prefab_path(self, guid: str) -> Optional[Path]:
+        if self._prefab_paths is None:
+            self._prefab_paths = {}
+            for meta in self.prefab_metas:
+                prefab_guid = read_meta_guid(meta)
+                if prefab_guid:
+                    self._prefab_paths[prefab_guid] = meta.with_suffix("")
+        return self._prefab_paths.get(guid)
+
+    def count(self, path: Path) -> Counter[str]:
+        return self.scan(path, ())[0]
+
+    def scan(self, path: Path, active: Tuple[str, ...]) -> Tuple[Counter[str], Dict[int, str]]:
+        """Instances per script GUID, and the script GUID of each MonoBehaviour by fileID."""
+        counts: Counter[str] = Counter()
+        scripts: Dict[int, str] = {}
+        with open_source(path) as buf:
+            for document in iter_yaml_documents(buf):
+                if document.stripped:
+                    continue
+                if document.class_id == MONO_BEHAVIOUR_CLASS_ID:
+                    guid = script_guid(buf, document) or ""
+                    counts[guid] += 1
+                    scripts[document.file_id] = guid
+                elif document.class_id == PREFAB_INSTANCE_CLASS_ID:
+                    source = field_references(buf, document).get("m_SourcePrefab", (0, None))[1]
+                    if not source or source in active:
+                        continue
+                    nested_counts, nested_scripts = self.prefab(source, active + (source,))
+                    removed = {file_id for file_id, guid in removed_components(buf, document) if guid == source}
+                    counts.update(nested_counts)
+                    for file_id, guid in nested_scripts.items():
+                        if file_id in removed:
+                            counts[guid] -= 1
+                        else:
+                            scripts[(document.file_id ^ file_id) & FILE_ID_MASK] = guid
+        return +counts, scripts
+
+    def prefab(self, guid: str, active: Tuple[str, ...]) -> Tuple[Counter[str], Dict[int, str]]:
+        if guid not in self.prefabs:
+            path = self.prefab_path(guid)
+            self.prefabs[guid] = self.scan(path, active) if path else (Counter(), {})
+        return self.prefabs[guid]
+
+
+def analyze(root: Path, top: int = DEFAULT_TOP, cache_path: Optional[Path] = None) -> Dict[str, object]:
+    scripts: List[Path] = []
+    scenes: List[Path] = []
+    prefab_metas: List[Path] = []
+    for path in walk_project(root):
+        if path.suffix == ".cs":
+            scripts.append(path)
+        elif path.suffix == ".unity":
+            scenes.append(path)
+        elif path.name.endswith(".prefab.meta"):
+            prefab_metas.append(path)
+
+    classes = load_script_classes(root, scripts, cache_path)
+    counter = InstanceCounter(prefab_metas)
+    report = []
+    used: Set[str] = set()
+    for path in scenes:
+        counts = counter.count(path)
+        rows = []
+        unresolved = 0
+        for guid, instances in counts.items():
+            script = classes.get(guid)
+            if script is None:
+                unresolved += instances
+                continue
+            used.add(guid)
+            rows.append(
+                {
+                    "class": script.name,
+                    "file": script.file,
+                    "instances": instances,
+                    "fields": script.fields,
+                    "cost": instances * script.fields,
+                }
+            )
+        rows.sort(key=lambda row: (-row["cost"], -row["instances"], row["class"]))
+        report.append(
+            {
+                "scene": path.relative_to(root).as_posix(),
+                "monobehaviours": sum(counts.values()),
+                "project_scripts": sum(row["instances"] for row in rows),
+                "unresolved": unresolved,
+                "cost": sum(row["cost"] for row in rows),
+                "heaviest": rows[:top],
+            }
+        )
+    report.sort(key=lambda row: (-row["cost"], row["scene"]))
+    return {
+        "scenes": report,
+        "scripts_resolved": len(classes),
+        "scripts_used": len(used),
+        "prefabs_parsed": len(counter.prefabs),
+    }
+
+
+def render_markdown(report: Dict[str, object]) -> str:
+    lines = [
+        "| Scene | MonoBehaviours | Project scripts | Est. fields read | Heaviest scripts (instances x fields) |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for scene in report["scenes"]:
+        if not scene["monobehaviours"]:
+            continue
+        heaviest = ", ".join(f"{row['class']} ({row['instances']} x {row['fields']})" for row in scene["heaviest"])
+        lines.append(
+            f"| {scene['scene']} | {scene['monobehaviours']} | {scene['project_scripts']} | "
+            f"{scene['cost']} | {heaviest} |"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate per-scene MonoBehaviour deserialization cost.")
+    parser.add_argument("--root", default=".", help="Project root directory (default: current).")
+    parser.add_argument("--output", help="Optional JSON output file.")
+    parser.add_argument("--markdown", action="store_true", help="Print a markdown summary.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Heaviest scripts to list per scene (default: 5).")
+    parser.add_argument("--cache", help=f"GUID -> class cache file (default: <root>/{DEFAULT_CACHE_PATH}).")
+    args = parser.parse_args()
+
+    report = analyze(Path(args.root).resolve(), top=args.top, cache_path=Path(args.cache) if args.cache else None)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.markdown:
+        print(render_markdown(report))
+    elif not args.output:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
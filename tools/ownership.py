@@ -0,0 +1,154 @@
+"""Line ownership from ``git blame`` for class and method spans.
+
+Files are blamed at ``HEAD`` with ``git blame --incremental --line-porcelain``
+on a thread pool. Results are cached on disk by path and blob SHA, so a file
+is only re-blamed when its content changes; blame follows a file's own
+history, so identical files at different paths get separate entries. Files with uncommitted changes are blamed
+in the working tree and never cached, since their uncommitted lines will get a
+real author once committed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = ".metrics-cache/blame"
+
+# (first final line, line count, author) for each contiguous blamed range.
+BlameRange = Tuple[int, int, str]
+
+
+@dataclass
+class Ownership:
+    primary_author: Optional[str] = None
+    primary_author_share: float = 0.0
+    author_count: int = 0
+
+
+class FileBlame:
+    """Blamed ranges of one file with interval lookup by line span."""
+
+    def __init__(self, ranges: List[BlameRange]) -> None:
+        self.ranges = sorted(ranges)
+        self.starts = [start for start, _, _ in self.ranges]
+
+    def authors(self, first: int, last: int) -> Counter[str]:
+        """Blamed line counts per author within lines ``first``..``last`` (inclusive)."""
+        counts: Counter[str] = Counter()
+        index = max(bisect_right(self.starts, first) - 1, 0)
+        while index < len(self.ranges):
+            start, count, author = self.ranges[index]
+            if start > last:
+                break
+            overlap = min(last, start + count - 1) - max(first, start) + 1
+            if overlap > 0:
+                counts[author] += overlap
+            index += 1
+        return counts
+
+    def ownership(self, first: int, last: int) -> Ownership:
+        counts = self.authors(first, last)
+        if not counts:
+            return Ownership()
+        author, lines = max(counts.items(), key=lambda item: (item[1], item[0]))
+        return Ownership(author, lines / sum(counts.values()), len(counts))
+
+
+def git_lines(root: Path, *args: str) -> List[str]:
+    proc = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True)
+    return proc.stdout.splitlines()
+
+
+def blob_shas(root: Path, paths: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """(HEAD blob SHA, working tree blob SHA) for each root-relative path."""
+    head: Dict[str, str] = {}
+    # Run from ``root`` so ls-tree lists paths relative to it, like ``paths``;
+    # -z keeps paths unquoted, which they otherwise are for non-ASCII names.
+    listing = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+    )
+    for entry in listing.stdout.split("\0"):
+        if entry:
+            meta, path = entry.split("\t", 1)
+            head[path] = meta.split()[2]
+    proc = subprocess.run(
+        ["git", "hash-object", "--stdin-paths"],
+        cwd=root,
+        input="\n".join(paths) + "\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    working = dict(zip(paths, proc.stdout.split()))
+    return head, working
+
+
+def parse_incremental(output: str) -> List[BlameRange]:
+    """Parse ``git blame --incremental`` output into ranges; author headers appear once per commit."""
+    authors: Dict[str, str] = {}
+    pending: List[Tuple[str, int, int]] = []
+    commit = None
+    for line in output.splitlines():
+        fields = line.split(" ")
+        if len(fields) == 4 and len(fields[0]) == 40 and fields[1].isdigit():
+            commit = fields[0]
+            pending.append((commit, int(fields[2]), int(fields[3])))
+        elif line.startswith("author ") and commit:
+            authors[commit] = line[len("author ") :]
+    return [(start, count, authors.get(sha, "unknown")) for sha, start, count in pending]
+
+
+def blame_file(root: Path, path: str, at_head: bool) -> List[BlameRange]:
+    command = ["git", "blame", "--incremental", "--line-porcelain"]
+    if at_head:
+        command.append("HEAD")
+    proc = subprocess.run(command + ["--", path], cwd=root, capture_output=True, text=True)
+    return parse_incremental(proc.stdout) if proc.returncode == 0 else []
+
+
+def cache_entry(cache_dir: Path, path: str, sha: str) -> Path:
+    key = hashlib.sha256(f"{path}\0{sha}".encode("utf-8", "surrogateescape")).hexdigest()
+    return cache_dir / key[:2] / f"{key}.json"
+
+
+def load_blames(
+    root: Path, paths: Iterable[str], cache_dir: Optional[Path] = None, workers: Optional[int] = None
+) -> Dict[str, FileBlame]:
+    """Blame ``paths`` (relative to ``root``), reusing cached results for unchanged blobs."""
+    paths = list(paths)
+    if not paths:
+        return {}
+    try:
+        head, working = blob_shas(root, paths)
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    cache_dir = cache_dir or root / DEFAULT_CACHE_DIR
+
+    ranges: Dict[str, List[BlameRange]] = {}
+    jobs: List[Tuple[str, bool]] = []
+    for path in paths:
+        sha = head.get(path)
+        clean = sha is not None and sha == working.get(path)
+        cached = cache_entry(cache_dir, path, sha) if clean else None
+        if cached is not None and cached.exists():
+            ranges[path] = [tuple(entry) for entry in json.loads(cached.read_text(encoding="utf-8"))]
+        else:
+            jobs.append((path, clean))
+
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        results = pool.map(lambda job: blame_file(root, job[0], at_head=job[1]), jobs)
+        for (path, clean), blamed in zip(jobs, results):
+            ranges[path] = blamed
+            if clean and blamed:
+                target = cache_entry(cache_dir, path, head[path])
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(json.dumps(blamed), encoding="utf-8")
+    return {path: FileBlame(blamed) for path, blamed in ranges.items()}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Rewrite the marked metrics sections of README.md from saved JSON reports.
+
+Each generated block sits between ``<!-- metrics:<name> hash=<digest> -->``
+and ``<!-- /metrics:<name> -->``. The digest covers the section's source
+reports (as written by the standalone tools or ``unity-metrics full
+--output-dir``) and its options, so a section whose inputs are unchanged is
+skipped without loading them, and README.md is only written when some section
+changed. Nothing is re-analyzed, which keeps a refresh cheap enough for a
+pre-commit hook.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_README = "README.md"
+DEFAULT_METRICS_DIR = "metrics"
+DEFAULT_TOP = 5
+
+SECTION_PATTERN = re.compile(
+    r"<!-- metrics:(?P<name>[\w-]+)(?: hash=(?P<hash>[0-9a-f]+))? -->\n(?P<body>.*?)<!-- /metrics:(?P=name) -->",
+    re.DOTALL,
+)
+
+# Asset counts called out above the full table, in README order.
+ASSET_HIGHLIGHTS = [
+    ("sprites", "Sprites"),
+    ("textures", "Textures"),
+    ("prefabs", "Prefabs"),
+    ("scenes", "Scenes"),
+    ("materials", "Materials"),
+    ("audio", "Audio clips"),
+    ("scriptable_objects", "ScriptableObjects (.asset detected)"),
+]
+
+
+def details(summary: str, table: str) -> List[str]:
+    return ["", "<details>", f"<summary>{summary}</summary>", "", table, "", "</details>"]
+
+
+def render_loc(reports: Dict[str, dict], top: int) -> str:
+    import loc_metrics
+
+    data = reports["loc_metrics.json"]
+    totals = data["totals"]
+    lines = [
+        f"- Total lines: {totals['total_lines']:,}",
+        f"- Non-blank lines: {totals['non_blank_lines']:,}",
+        f"- Code lines (non-blank, non-comment): {totals['code_lines']:,}",
+        f"- Comment lines: {totals['comment_lines']:,}",
+        f"- C# files analyzed: {len(data['files']):,}",
+        "- Generated with `python tools/loc_metrics.py --output metrics/loc_metrics.json --markdown`",
+    ]
+    return "\n".join(lines + details("Per-file LOC breakdown", loc_metrics.render_markdown(data)))
+
+
+def render_functions(reports: Dict[str, dict], top: int) -> str:
+    import function_metrics
+
+    data = reports["function_metrics.json"]
+    summary = data["summary"]
+    loc_totals = reports["loc_metrics.json"]["totals"]
+
+    def extreme(label: str, value_key: str, function_key: str) -> str:
+        fn = summary[function_key]
+        return f"- Maximum {label}: {summary[value_key]} in `{fn['name']}` (`{fn['file']}:{fn['start_line']}`)"
+
+    density = loc_totals["comment_lines"] / loc_totals["total_lines"] if loc_totals["total_lines"] else 0.0
+    lines = [
+        f"- Total functions/methods: {summary['function_count']:,}",
+        f"- Average LOC per function: {summary['average_loc']:.2f} (median {summary['median_loc']})",
+        f"- Average cyclomatic complexity (CCN): {summary['average_ccn']:.2f} (median {summary['median_ccn']})",
+        extreme("CCN", "max_ccn", "max_ccn_function"),
+        extreme("LOC", "max_loc", "max_loc_function"),
+        f"- Comment density across all C# files: {density:.2%}",
+        "- Generated with `python tools/function_metrics.py --output metrics/function_metrics.json "
+        f"--markdown --top {top}`",
+    ]
+    table = function_metrics.render_markdown(data, limit=top)
+    return "\n".join(lines + details(f"Top {top} functions by cyclomatic complexity", table))
+
+
+def render_assets(reports: Dict[str, dict], top: int) -> str:
+    import asset_inventory
+
+    counts = reports["asset_counts.json"]
+    lines = [f"- {label}: {counts.get(key, 0):,}" for key, label in ASSET_HIGHLIGHTS]
+    lines.append("- Generated with `python tools/asset_inventory.py --output metrics/asset_counts.json --markdown`")
+    return "\n".join(lines + details("Asset type counts", asset_inventory.render_markdown(counts)))
+
+
+def render_classes(reports: Dict[str, dict], top: int) -> str:
+    import class_count
+
+    data = reports["class_counts.json"]
+    totals = data["totals"]
+    lines = [
+        f"- Classes: {totals['class']:,}",
+        f"- Structs: {totals['struct']:,}",
+        f"- Interfaces: {totals['interface']:,}",
+        f"- Records: {totals['record']:,}",
+        f"- Total type declarations: {totals['types_total']:,}",
+        "- Generated with `python tools/class_count.py --output metrics/class_counts.json --markdown`",
+    ]
+    return "\n".join(lines + details("Per-file type declarations", class_count.render_markdown(data)))
+
+
+@dataclass
+class Section:
+    sources: Tuple[str, ...]
+    render: Callable[[Dict[str, dict], int], str]
+    uses_top: bool = False
+
+
+SECTIONS: Dict[str, Section] = {
+    "loc": Section(("loc_metrics.json",), render_loc),
+    "functions": Section(("function_metrics.json", "loc_metrics.json"), render_functions, uses_top=True),
+    "assets": Section(("asset_counts.json",), render_assets),
+    "classes": Section(("class_counts.json",), render_classes),
+}
+
+
+def source_hash(name: str, section: Section, metrics_dir: Path, top: int) -> str:
+    digest = hashlib.sha256(f"{name}:{top if section.uses_top else ''}".encode())
+    for source in section.sources:
+        digest.update((metrics_dir / source).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def refresh(
+    readme: Path, metrics_dir: Path, top: int = DEFAULT_TOP, force: bool = False, write: bool = True
+) -> Dict[str, str]:
+    """Re-render stale marked sections; returns each marked section's status."""
+    text = readme.read_text(encoding="utf-8")
+    reports: Dict[str, dict] = {}
+    status: Dict[str, str] = {}
+
+    def replace(match: re.Match[str]) -> str:
+        name = match.group("name")
+        section = SECTIONS.get(name)
+        if section is None:
+            status[name] = "unknown"
+            return match.group(0)
+        try:
+            digest = source_hash(name, section, metrics_dir, top)
+        except FileNotFoundError as exc:
+            status[name] = f"missing {Path(exc.filename).name}"
+            return match.group(0)
+        if digest == match.group("hash") and not force:
+            status[name] = "unchanged"
+            return match.group(0)
+        for source in section.sources:
+            if source not in reports:
+                reports[source] = json.loads((metrics_dir / source).read_text(encoding="utf-8"))
+        body = section.render(reports, top)
+        status[name] = "updated" if body != match.group("body").rstrip("\n") else "rehashed"
+        return f"<!-- metrics:{name} hash={digest} -->\n{body}\n<!-- /metrics:{name} -->"
+
+    updated = SECTION_PATTERN.sub(replace, text)
+    if write and updated != text:
+        readme.write_text(updated, encoding="utf-8")
+    return status
+
+
+def run(args: argparse.Namespace) -> None:
+    readme = Path(args.readme)
+    if not readme.is_file():
+        raise SystemExit(f"README not found: {readme}")
+    status = refresh(readme, Path(args.metrics_dir), args.top, args.force, write=not args.check)
+    if not status:
+        raise SystemExit(f"No <!-- metrics:... --> sections found in {readme}")
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    if args.check and any(state != "unchanged" for state in status.values()):
+        raise SystemExit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rewrite marked README metrics sections from saved JSON reports.")
+    parser.add_argument("--readme", default=DEFAULT_README, help="Markdown file to update (default: README.md).")
+    parser.add_argument("--metrics-dir", default=DEFAULT_METRICS_DIR, help="Directory of JSON reports (default: metrics).")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Top N functions to list (default: 5).")
+    parser.add_argument("--force", action="store_true", help="Re-render sections even when their inputs are unchanged.")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any section is stale instead of writing.")
+    args = parser.parse_args(argv)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
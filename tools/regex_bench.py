@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Time the C# scanners on a corpus of pathological inputs.
+
+Each corpus case generates malformed or oversized source (unterminated
+strings and comments, attribute and modifier floods, brace-less type
+headers, minified code, seeded random token soup) at a base size and at
+``GROWTH`` times that size. Every scanner runs on both under a per-input
+time limit. A run fails when it times out or when its time grows clearly
+faster than the input (quadratic growth shows up as a ratio near
+``GROWTH ** 2``). Exit status is 1 on any failure so the corpus can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from metrics_common import time_limit
+
+GROWTH = 4
+# Linear scanners stay near GROWTH; allow for timer noise and cache effects.
+MAX_GROWTH_RATIO = GROWTH * 2.5
+# Below this the large run is too quick for its ratio to mean anything.
+MIN_TIMED_SECONDS = 0.05
+DEFAULT_SIZE = 64 * 1024
+DEFAULT_LIMIT = 2.0
+
+
+def repeat_to(unit: str, size: int) -> str:
+    return unit * max(1, size // len(unit))
+
+
+def random_soup(size: int, seed: int = 0) -> str:
+    tokens = [
+        "class", "struct", "public", "static", "A", ":", "B", ",", "{", "}", "(", ")", "[", "]", ";",
+        '"', "@\"", "$\"", "'", "\\", "//", "/*", "*/", "\n", " ", "=", "new", "<", ">", "x", "1",
+    ]
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        token = rng.choice(tokens)
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)
+
+
+def minified(size: int) -> str:
+    member = (
+        'public int Value{get{return _v;}}private int _v=1;'
+        'public string Name="a\\"b";void Update(){if(_v>0){_v--;}else{_v=2;}}'
+    )
+    return "class Generated{" + repeat_to(member, size) + "}"
+
+
+CORPUS: Dict[str, Callable[[int], str]] = {
+    "unterminated_string": lambda n: repeat_to('x = "abc\n', n),
+    "unterminated_verbatim": lambda n: repeat_to('x = @"abc""\n', n),
+    "unterminated_interpolated": lambda n: repeat_to('x = $"{a}\n', n),
+    "unterminated_char": lambda n: repeat_to("c = 'ab\n", n),
+    "unterminated_block_comment": lambda n: repeat_to("/* note\n", n),
+    "attribute_flood": lambda n: repeat_to("[Serializable] ", n) + "void F();",
+    "unclosed_attributes": lambda n: repeat_to("[Header(", n),
+    "modifier_flood": lambda n: repeat_to("public static ", n) + "void F();",
+    "braceless_type_headers": lambda n: repeat_to("class A : B, C\n", n),
+    "long_base_list": lambda n: "class A : " + repeat_to("IB, ", n) + "\n",
+    "unclosed_nested_types": lambda n: repeat_to("class A {\n", n),
+    "minified": minified,
+    "deep_braces": lambda n: "class A {" + "{" * (n // 2) + "}" * (n // 2) + "}",
+    "token_soup": random_soup,
+}
+
+
+def scanners() -> Dict[str, Callable[[str], object]]:
+    from analyze_code_metrics import (
+        blank_comments_and_strings,
+        class_body,
+        clean_string_literals,
+        extract_class_blocks,
+        extract_fields_from_class,
+        remove_comments,
+    )
+    from loc_metrics import classify_lines
+
+    targets: Dict[str, Callable[[str], object]] = {
+        "clean_string_literals": clean_string_literals,
+        "remove_comments": remove_comments,
+        "blank_comments_and_strings": lambda text: blank_comments_and_strings(text.encode()),
+        "extract_class_blocks": lambda text: extract_class_blocks(text.encode(), "bench.cs"),
+        "extract_fields_from_class": lambda text: extract_fields_from_class(class_body(text)),
+        "classify_lines": lambda text: classify_lines(text.encode()),
+    }
+    try:
+        import lizard  # noqa: F401
+    except ImportError:
+        return targets
+
+    from analyze_code_metrics import analyze_cs_buffer
+
+    root = Path("bench")
+    targets["analyze_cs_buffer"] = lambda text: analyze_cs_buffer(text.encode(), root / "bench.cs", root)
+    return targets
+
+
+@dataclass
+class BenchResult:
+    case: str
+    scanner: str
+    size: int
+    seconds: Optional[float]
+    large_seconds: Optional[float]
+    ratio: Optional[float]
+    status: str
+
+
+def timed(scanner: Callable[[str], object], text: str, limit: float) -> Optional[float]:
+    start = time.perf_counter()
+    try:
+        with time_limit(limit):
+            scanner(text)
+    except TimeoutError:
+        return None
+    return time.perf_counter() - start
+
+
+def run_case(case: str, scanner_name: str, scanner: Callable[[str], object], size: int, limit: float) -> BenchResult:
+    generate = CORPUS[case]
+    small = timed(scanner, generate(size), limit)
+    large = timed(scanner, generate(size * GROWTH), limit) if small is not None else None
+    if small is None or large is None:
+        return BenchResult(case, scanner_name, size, small, large, None, "timeout")
+    ratio = large / small if small else None
+    superlinear = large >= MIN_TIMED_SECONDS and ratio is not None and ratio > MAX_GROWTH_RATIO
+    return BenchResult(case, scanner_name, size, small, large, ratio, "superlinear" if superlinear else "ok")
+
+
+def run(
+    size: int = DEFAULT_SIZE,
+    limit: float = DEFAULT_LIMIT,
+    cases: Optional[List[str]] = None,
+    only: Optional[List[str]] = None,
+) -> List[BenchResult]:
+    targets = scanners()
+    results = []
+    for case in cases or list(CORPUS):
+        for name, scanner in targets.items():
+            if only and name not in only:
+                continue
+            results.append(run_case(case, name, scanner, size, limit))
+    return results
+
+
+def render_markdown(results: List[BenchResult]) -> str:
+    def ms(seconds: Optional[float]) -> str:
+        return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+    lines = [
+        f"| Case | Scanner | Base ms | x{GROWTH} ms | Ratio | Status |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for row in results:
+        ratio = "-" if row.ratio is None else f"{row.ratio:.1f}"
+        lines.append(
+            f"| {row.case} | {row.scanner} | {ms(row.seconds)} | {ms(row.large_seconds)} | {ratio} | {row.status} |"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the C# scanners on pathological inputs.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Base input size in bytes (default: 64 KiB).")
+    parser.add_argument("--limit", type=float, default=DEFAULT_LIMIT, help="Seconds allowed per input (default: 2).")
+    parser.add_argument("--case", action="append", choices=sorted(CORPUS), help="Only run these corpus cases.")
+    parser.add_argument("--scanner", action="append", help="Only run these scanners.")
+    parser.add_argument("--output", help="Optional JSON output file.")
+    parser.add_argument("--markdown", action="store_true", help="Print a markdown table.")
+    args = parser.parse_args()
+
+    results = run(args.size, args.limit, args.case, args.scanner)
+    if args.output:
+        Path(args.output).write_text(json.dumps([asdict(row) for row in results], indent=2), encoding="utf-8")
+    if args.markdown:
+        print(render_markdown(results))
+    elif not args.output:
+        print(json.dumps([asdict(row) for row in results], indent=2))
+    check(results)
+
+
+def check(results: List[BenchResult]) -> None:
+    failed = [row for row in results if row.status != "ok"]
+    if failed:
+        raise SystemExit(f"{len(failed)} scanner run(s) failed: " + ", ".join(f"{r.case}/{r.scanner}" for r in failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""Estimate 2D draw batches and batch breaks per scene.
+
+Every ``.unity`` scene is streamed document by document for SpriteRenderer,
+TilemapRenderer and UI Image/RawImage/Text/TextMeshProUGUI components with
+their material, texture, sorting layer and order. Prefab instances are
+expanded from their source ``.prefab`` (each parsed once, nested instances
+included) with sorting, sprite, material and enabled overrides applied.
+Sprites packed by a ``.spriteatlas`` share the atlas texture.
+
+Unity's sort order is simulated per scene:
+
+* World renderers are ordered by sorting layer (``TagManager`` order) and
+  order in layer. Ties are sorted by camera distance at runtime, which the
+  scene files do not pin down, so ties are assumed to group by batch key
+  (best case). A tilemap draws once per texture and never batches with
+  sprites.
+* UI graphics batch per canvas in hierarchy order, nested canvases
+  separately. Overlap is ignored, so Unity's reordering of non-overlapping
+  graphics can only lower the UI count.
+
+A batch break is an adjacent pair in that order whose material or texture
+differs. Breaks are tallied per switch so the textures worth atlasing and the
+materials worth sharing rank first.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from metrics_common import (
+    GAME_OBJECT_CLASS_ID,
+    MONO_BEHAVIOUR_CLASS_ID,
+    PREFAB_INSTANCE_CLASS_ID,
+    Buffer,
+    YamlDocument,
+    build_guid_index,
+    field_references,
+    iter_yaml_documents,
+    open_source,
+    script_guid,
+    walk_project,
+)
+
+TRANSFORM_CLASS_ID = 4
+RECT_TRANSFORM_CLASS_ID = 224
+SPRITE_RENDERER_CLASS_ID = 212
+CANVAS_CLASS_ID = 223
+TILEMAP_RENDERER_CLASS_ID = 483693784
+TILEMAP_CLASS_ID = 1839735485
+SCENE_ROOTS_CLASS_ID = 1660057539
+
+UI_SCRIPTS = {
+    "fe87c0e1cc204ed48ad3b37840f39efc": "image",
+    "1344c3c82d62a2a41a3576d8abb8e3ea": "raw_image",
+    "5f7201a12d95ffc409449d95f23cf332": "text",
+    "f4688fdb7df04437aeb418b961361dc5": "tmp_ui",
+}
+
+TEXTURE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tga", ".psd", ".tif", ".tiff", ".bmp", ".gif", ".exr"}
+ATLAS_SUFFIXES = {".spriteatlas", ".spriteatlasv2"}
+# "" picks up folders, which sprite atlases may list as packables.
+NAMED_SUFFIXES = TEXTURE_SUFFIXES | ATLAS_SUFFIXES | {".mat", ".asset", ".ttf", ".otf", ".prefab", ""}
+
+MATERIAL_FILE_ID = 2100000
+BUILTIN_GUID_PREFIX = "0000000000000000"
+# Unity's fileID for an object inside a prefab instance, from the instance and source fileIDs.
+PREFAB_FILE_ID_MASK = 0x7FFFFFFFFFFFFFFF
+
+SCALAR_PATTERN = re.compile(rb"^  (m_\w+): (-?\d+)\r?$", re.MULTILINE)
+NAME_PATTERN = re.compile(rb"^  m_Name: ([^\r\n]*)", re.MULTILINE)
+LIST_PATTERN = re.compile(rb"^  (m_Materials|m_Children|m_Roots):\r?\n((?:  - \{[^\n]*\n)*)", re.MULTILINE)
+REFERENCE_PATTERN = re.compile(rb"\{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?")
+FONT_PATTERN = re.compile(rb"^    m_Font: \{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?", re.MULTILINE)
+TILE_SPRITES_PATTERN = re.compile(rb"^  m_TileSpriteArray:\r?\n((?:  (?:- |  )[^\n]*\n)*)", re.MULTILINE)
+TILE_SPRITE_PATTERN = re.compile(
+    rb"m_RefCount: (\d+)\r?\n\s+m_Data: \{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?"
+)
+MODIFICATION_PATTERN = re.compile(
+    rb"- target: \{fileID: (-?\d+), guid: ([0-9a-f]{32})[^}]*\}\r?\n"
+    rb"\s+propertyPath: ([^\r\n]+)\r?\n"
+    rb"\s+value: ([^\r\n]*)\r?\n"
+    rb"\s+objectReference: \{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?"
+)
+TRANSFORM_PARENT_PATTERN = re.compile(rb"^    m_TransformParent: \{fileID: (-?\d+)", re.MULTILINE)
+PACKABLES_PATTERN = re.compile(rb"^\s*packables:\r?\n((?:\s*- \{[^\n]*\n)*)", re.MULTILINE)
+SORTING_LAYERS_PATTERN = re.compile(rb"^  m_SortingLayers:\r?\n((?:  [- ] [^\n]*\n)*)", re.MULTILINE)
+UNIQUE_ID_PATTERN = re.compile(rb"uniqueID: (-?\d+)")
+
+OVERRIDDEN_PROPERTIES = {
+    "m_Enabled",
+    "m_IsActive",
+    "m_SortingLayerID",
+    "m_SortingOrder",
+    "m_Sprite",
+    "m_Texture",
+    "m_Material",
+    "m_sharedMaterial",
+    "m_Materials.Array.data[0]",
+}
+
+BREAK_CAUSES = ("material", "texture", "renderer")
+
+Reference = Tuple[int, Optional[str]]
+# (material, texture, batch group): adjacent draws batch only when all three match.
+BatchKey = Tuple[str, str, str]
+
+
+@dataclass
+class Renderer:
+    kind: str
+    name: str
+    material: str
+    texture: str = ""
+    layer: int = 0
+    order: int = 0
+    component: int = 0
+    game_object: int = 0
+    enabled: bool = True
+    active: bool = True
+    # Canvas key within the declaring file; ``None`` inherits the canvas it is instantiated under.
+    canvas: Optional[str] = None
+    tile_textures: Tuple[str, ...] = ()
+
+    @property
+    def is_ui(self) -> bool:
+        return self.kind in UI_SCRIPTS.values()
+
+
+@dataclass
+class Node:
+    game_object: int
+    children: List[int] = field(default_factory=list)
+    father: int = 0
+
+
+@dataclass
+class Instance:
+    source: Optional[str]
+    parent: int
+    overrides: Dict[Tuple[int, str], Tuple[str, Reference]] = field(default_factory=dict)
+
+
+def material_key(reference: Optional[Reference], default: str) -> str:
+    if reference is None or not reference[0]:
+        return default
+    file_id, guid = reference
+    if not guid:
+        return default
+    if guid.startswith(BUILTIN_GUID_PREFIX):
+        return f"builtin:{file_id}"
+    return guid if file_id == MATERIAL_FILE_ID else f"{guid}:{file_id}"
+
+
+def texture_key(reference: Optional[Reference], default: str = "") -> str:
+    if reference is None or not reference[0] or not reference[1]:
+        return default
+    file_id, guid = reference
+    return f"builtin:{file_id}" if guid.startswith(BUILTIN_GUID_PREFIX) else guid
+
+
+def scalars(buf: Buffer, document: YamlDocument) -> Dict[str, int]:
+    return {
+        match.group(1).decode("ascii"): int(match.group(2))
+        for match in SCALAR_PATTERN.finditer(buf, document.start, document.end)
+    }
+
+
+def reference_list(buf: Buffer, document: YamlDocument, name: str) -> List[Reference]:
+    for match in LIST_PATTERN.finditer(buf, document.start, document.end):
+        if match.group(1).decode("ascii") == name:
+            return [
+                (int(item.group(1)), item.group(2).decode("ascii") if item.group(2) else None)
+                for item in REFERENCE_PATTERN.finditer(match.group(2))
+            ]
+    return []
+
+
+def tile_textures(buf: Buffer, document: YamlDocument) -> Tuple[str, ...]:
+    match = TILE_SPRITES_PATTERN.search(buf, document.start, document.end)
+    if not match:
+        return ()
+    textures = {
+        entry.group(3).decode("ascii")
+        for entry in TILE_SPRITE_PATTERN.finditer(match.group(1))
+        if int(entry.group(1)) and entry.group(3)
+    }
+    return tuple(sorted(textures))
+
+
+def parse_renderer(buf: Buffer, document: YamlDocument, kind: str) -> Renderer:
+    values = scalars(buf, document)
+    references = field_references(buf, document)
+    if kind in ("sprite", "tilemap"):
+        materials = reference_list(buf, document, "m_Materials")
+        renderer = Renderer(
+            kind,
+            "",
+            material_key(materials[0] if materials else None, "default"),
+            texture_key(references.get("m_Sprite")),
+            layer=values.get("m_SortingLayerID", 0),
+            order=values.get("m_SortingOrder", 0),
+        )
+    elif kind == "tmp_ui":
+        # The font atlas texture lives in the font asset and is fixed by the material.
+        material = material_key(references.get("m_sharedMaterial"), "tmp-default")
+        renderer = Renderer(kind, "", material, material)
+    elif kind == "text":
+        font = FONT_PATTERN.search(buf, document.start, document.end)
+        reference = (int(font.group(1)), font.group(2).decode("ascii") if font.group(2) else None) if font else None
+        renderer = Renderer(kind, "", material_key(references.get("m_Material"), "ui-default"), texture_key(reference))
+    else:
+        texture_field = "m_Texture" if kind == "raw_image" else "m_Sprite"
+        renderer = Renderer(
+            kind,
+            "",
+            material_key(references.get("m_Material"), "ui-default"),
+            texture_key(references.get(texture_field), "white"),
+        )
+    renderer.component = document.file_id
+    renderer.game_object = references.get("m_GameObject", (0, None))[0]
+    renderer.enabled = values.get("m_Enabled", 1) != 0
+    return renderer
+
+
+def parse_modifications(buf: Buffer, document: YamlDocument) -> Dict[Tuple[int, str], Tuple[str, Reference]]:
+    overrides: Dict[Tuple[int, str], Tuple[str, Reference]] = {}
+    for match in MODIFICATION_PATTERN.finditer(buf, document.start, document.end):
+        prop = match.group(3).decode("utf-8", "replace")
+        if prop not in OVERRIDDEN_PROPERTIES:
+            continue
+        guid = match.group(6).decode("ascii") if match.group(6) else None
+        overrides[(int(match.group(1)), prop)] = (
+            match.group(4).decode("utf-8", "replace").strip(),
+            (int(match.group(5)), guid),
+        )
+    return overrides
+
+
+def apply_overrides(
+    renderer: Renderer, overrides: Dict[Tuple[int, str], Tuple[str, Reference]], instance_id: int
+) -> Renderer:
+    def value(target: int, prop: str) -> Optional[Tuple[str, Reference]]:
+        return overrides.get((target, prop))
+
+    changes: Dict[str, object] = {}
+    for prop, attr in (("m_SortingLayerID", "layer"), ("m_SortingOrder", "order")):
+        override = value(renderer.component, prop)
+        if override and override[0].lstrip("-").isdigit():
+            changes[attr] = int(override[0])
+    enabled = value(renderer.component, "m_Enabled")
+    if enabled:
+        changes["enabled"] = enabled[0] != "0"
+    active = value(renderer.game_object, "m_IsActive")
+    if active:
+        changes["active"] = active[0] != "0"
+    for prop in ("m_Sprite", "m_Texture"):
+        override = value(renderer.component, prop)
+        if override:
+            changes["texture"] = texture_key(override[1], "white" if renderer.is_ui else "")
+    for prop in ("m_Materials.Array.data[0]", "m_Material", "m_sharedMaterial"):
+        override = value(renderer.component, prop)
+        if override:
+            default = "default" if not renderer.is_ui else "ui-default"
+            changes["material"] = material_key(override[1], default)
+            if renderer.kind == "tmp_ui":
+                changes["texture"] = changes["material"]
+    changes["component"] = (instance_id ^ renderer.component) & PREFAB_FILE_ID_MASK
+    changes["game_object"] = (instance_id ^ renderer.game_object) & PREFAB_FILE_ID_MASK
+    if renderer.canvas is not None:
+        changes["canvas"] = f"{instance_id}/{renderer.canvas}"
+    return replace(renderer, **changes)
+
+
+class SceneParser:
+    """Parses scenes and prefabs into renderers in hierarchy order, caching each prefab."""
+
+    def __init__(self, root: Path, names: Dict[str, str], atlas_of: Dict[str, str]) -> None:
+        self.root = root
+        self.names = names
+        self.atlas_of = atlas_of
+        self.prefabs: Dict[str, List[Renderer]] = {}
+        self.in_progress: Set[str] = set()
+
+    def prefab(self, guid: Optional[str]) -> List[Renderer]:
+        if guid is None or guid in self.in_progress:
+            return []
+        if guid not in self.prefabs:
+            path = self.names.get(guid)
+            self.in_progress.add(guid)
+            try:
+                self.prefabs[guid] = self.parse(self.root / path) if path and path.endswith(".prefab") else []
+            finally:
+                self.in_progress.discard(guid)
+        return self.prefabs[guid]
+
+    def parse(self, path: Path) -> List[Renderer]:
+        nodes: Dict[int, Node] = {}
+        stripped: Dict[int, int] = {}
+        names: Dict[int, str] = {}
+        active: Dict[int, bool] = {}
+        components: Dict[int, List[Renderer]] = defaultdict(list)
+        tiles: Dict[int, Tuple[str, ...]] = {}
+        canvases: Set[int] = set()
+        instances: Dict[int, Instance] = {}
+        roots: List[int] = []
+        with open_source(path) as buf:
+            for document in iter_yaml_documents(buf):
+                class_id = document.class_id
+                if class_id in (TRANSFORM_CLASS_ID, RECT_TRANSFORM_CLASS_ID):
+                    references = field_references(buf, document)
+                    if document.stripped:
+                        stripped[document.file_id] = references.get("m_PrefabInstance", (0, None))[0]
+                    else:
+                        children = [file_id for file_id, _ in reference_list(buf, document, "m_Children")]
+                        nodes[document.file_id] = Node(
+                            references.get("m_GameObject", (0, None))[0],
+                            children,
+                            references.get("m_Father", (0, None))[0],
+                        )
+                elif document.stripped:
+                    continue
+                elif class_id == GAME_OBJECT_CLASS_ID:
+                    name = NAME_PATTERN.search(buf, document.start, document.end)
+                    names[document.file_id] = name.group(1).decode("utf-8", "replace") if name else ""
+                    active[document.file_id] = scalars(buf, document).get("m_IsActive", 1) != 0
+                elif class_id == SPRITE_RENDERER_CLASS_ID:
+                    renderer = parse_renderer(buf, document, "sprite")
+                    components[renderer.game_object].append(renderer)
+                elif class_id == TILEMAP_RENDERER_CLASS_ID:
+                    renderer = parse_renderer(buf, document, "tilemap")
+                    components[renderer.game_object].append(renderer)
+                elif class_id == TILEMAP_CLASS_ID:
+                    game_object = field_references(buf, document).get("m_GameObject", (0, None))[0]
+                    tiles[game_object] = tile_textures(buf, document)
+                elif class_id == CANVAS_CLASS_ID:
+                    if scalars(buf, document).get("m_Enabled", 1):
+                        canvases.add(field_references(buf, document).get("m_GameObject", (0, None))[0])
+                elif class_id == MONO_BEHAVIOUR_CLASS_ID:
+                    kind = UI_SCRIPTS.get(script_guid(buf, document) or "")
+                    if kind:
+                        renderer = parse_renderer(buf, document, kind)
+                        components[renderer.game_object].append(renderer)
+                elif class_id == PREFAB_INSTANCE_CLASS_ID:
+                    references = field_references(buf, document)
+                    parent = TRANSFORM_PARENT_PATTERN.search(buf, document.start, document.end)
+                    instances[document.file_id] = Instance(
+                        references.get("m_SourcePrefab", (0, None))[1],
+                        int(parent.group(1)) if parent else 0,
+                        parse_modifications(buf, document),
+                    )
+                elif class_id == SCENE_ROOTS_CLASS_ID:
+                    roots = [file_id for file_id, _ in reference_list(buf, document, "m_Roots")]
+
+        if not roots:
+            roots = [file_id for file_id, node in nodes.items() if not node.father]
+            roots += [file_id for file_id, owner in stripped.items() if owner in instances and not instances[owner].parent]
+
+        ordered: List[Renderer] = []
+        expanded: Set[int] = set()
+
+        def expand(instance_id: int, canvas: Optional[str], parent_active: bool) -> None:
+            instance = instances[instance_id]
+            expanded.add(instance_id)
+            for renderer in self.prefab(instance.source):
+                renderer = apply_overrides(renderer, instance.overrides, instance_id)
+                if renderer.canvas is None:
+                    renderer.canvas = canvas
+                renderer.active = renderer.active and parent_active
+                ordered.append(renderer)
+
+        def visit(file_id: int, canvas: Optional[str], parent_active: bool) -> None:
+            owner = stripped.get(file_id)
+            if owner is not None:
+                if owner in instances and owner not in expanded:
+                    expand(owner, canvas, parent_active)
+                return
+            node = nodes.get(file_id)
+            if node is None:
+                return
+            is_active = parent_active and active.get(node.game_object, True)
+            if node.game_object in canvases:
+                canvas = f"{names.get(node.game_object, '')}#{node.game_object}"
+            for renderer in components.get(node.game_object, ()):
+                renderer.name = names.get(node.game_object, "")
+                renderer.active = is_active
+                renderer.tile_textures = tiles.get(node.game_object, ())
+                if renderer.is_ui:
+                    renderer.canvas = canvas
+                ordered.append(renderer)
+            for child in node.children:
+                visit(child, canvas, is_active)
+
+        for file_id in roots:
+            visit(file_id, None, True)
+        # Instances parented under another instance's objects are not reachable from m_Children.
+        for instance_id in instances:
+            if instance_id not in expanded:
+                expand(instance_id, None, True)
+
+        for renderer in ordered:
+            if renderer.texture in self.atlas_of:
+                renderer.texture = self.atlas_of[renderer.texture]
+            if renderer.tile_textures:
+                renderer.tile_textures = tuple(sorted({self.atlas_of.get(t, t) for t in renderer.tile_textures}))
+        return ordered
+
+
+def sorting_layer_ranks(root: Path) -> Dict[int, int]:
+    path = root / "ProjectSettings" / "TagManager.asset"
+    if not path.exists():
+        return {}
+    with open_source(path) as buf:
+        match = SORTING_LAYERS_PATTERN.search(buf)
+        if not match:
+            return {}
+        ids = [int(unique.group(1)) for unique in UNIQUE_ID_PATTERN.finditer(match.group(1))]
+    return {unique_id: rank for rank, unique_id in enumerate(ids)}
+
+
+def sprite_atlases(root: Path, names: Dict[str, str]) -> Dict[str, str]:
+    """Map texture GUIDs to the key of the sprite atlas that packs them."""
+    by_path = {path: guid for guid, path in names.items()}
+    textures = [path for path in by_path if Path(path).suffix.lower() in TEXTURE_SUFFIXES]
+    atlas_of: Dict[str, str] = {}
+    for guid, atlas in sorted(names.items(), key=lambda item: item[1]):
+        if Path(atlas).suffix.lower() not in ATLAS_SUFFIXES:
+            continue
+        with open_source(root / atlas) as buf:
+            packables = [
+                item.group(2).decode("ascii")
+                for match in PACKABLES_PATTERN.finditer(buf)
+                for item in REFERENCE_PATTERN.finditer(match.group(1))
+                if item.group(2)
+            ]
+        for packable in packables:
+            path = names.get(packable)
+            if path is None:
+                continue
+            if Path(path).suffix.lower() in TEXTURE_SUFFIXES:
+                atlas_of.setdefault(packable, f"atlas:{guid}")
+            elif not Path(path).suffix:
+                for texture in textures:
+                    if texture.startswith(path + "/"):
+                        atlas_of.setdefault(by_path[texture], f"atlas:{guid}")
+    return atlas_of
+
+
+def world_keys(renderers: List[Renderer], ranks: Dict[int, int]) -> List[BatchKey]:
+    groups: Dict[Tuple[int, int], List[BatchKey]] = defaultdict(list)
+    for renderer in renderers:
+        slot = (ranks.get(renderer.layer, 0), renderer.order)
+        if renderer.kind == "tilemap":
+            group = f"tilemap:{renderer.component}"
+            groups[slot].extend((renderer.material, texture, group) for texture in renderer.tile_textures or ("",))
+        else:
+            groups[slot].append((renderer.material, renderer.texture, ""))
+    sequence: List[BatchKey] = []
+    for slot in sorted(groups):
+        # Best case for ties: equal keys adjacent, continuing the previous slot's last batch.
+        previous = sequence[-1] if sequence else None
+        sequence.extend(sorted(groups[slot], key=lambda key: (key != previous, key)))
+    return sequence
+
+
+def count_breaks(sequence: List[BatchKey], switches: Counter[Tuple[str, str, str]]) -> int:
+    breaks = 0
+    for before, after in zip(sequence, sequence[1:]):
+        if before == after:
+            continue
+        breaks += 1
+        if before[0] != after[0]:
+            cause, pair = "material", sorted((before[0], after[0]))
+        elif before[1] != after[1]:
+            cause, pair = "texture", sorted((before[1], after[1]))
+        else:
+            cause, pair = "renderer", sorted((before[2] or "sprites", after[2] or "sprites"))
+        switches[(cause, pair[0], pair[1])] += 1
+    return breaks
+
+
+def simulate(renderers: List[Renderer], ranks: Dict[int, int]) -> Dict[str, object]:
+    visible = [renderer for renderer in renderers if renderer.enabled and renderer.active]
+    switches: Counter[Tuple[str, str, str]] = Counter()
+
+    world = world_keys([r for r in visible if not r.is_ui], ranks)
+    world_breaks = count_breaks(world, switches)
+
+    canvases: Dict[str, List[BatchKey]] = defaultdict(list)
+    for renderer in visible:
+        # UI graphics outside any canvas are not drawn.
+        if renderer.is_ui and renderer.canvas is not None:
+            canvases[renderer.canvas].append((renderer.material, renderer.texture, ""))
+    canvas_rows = []
+    for canvas, sequence in canvases.items():
+        breaks = count_breaks(sequence, switches)
+        canvas_rows.append(
+            {"canvas": canvas.rsplit("#", 1)[0].rsplit("/", 1)[-1], "graphics": len(sequence), "batches": breaks + 1, "breaks": breaks}
+        )
+    canvas_rows.sort(key=lambda row: -row["breaks"])
+
+    ui_breaks = sum(row["breaks"] for row in canvas_rows)
+    world_batches = world_breaks + 1 if world else 0
+    return {
+        "renderers": dict(Counter(renderer.kind for renderer in visible)),
+        "hidden_renderers": len(renderers) - len(visible),
+        "world": {"draws": len(world), "batches": world_batches, "breaks": world_breaks},
+        "canvases": canvas_rows,
+        "batches": world_batches + sum(row["batches"] for row in canvas_rows),
+        "breaks": world_breaks + ui_breaks,
+        "switches": switches,
+    }
+
+
+def describe(key: str, names: Dict[str, str]) -> str:
+    if key.startswith("atlas:"):
+        return names.get(key[len("atlas:") :], key)
+    guid, _, sub = key.partition(":")
+    path = names.get(guid)
+    if path is None:
+        return key
+    return f"{path}:{sub}" if sub else path
+
+
+def analyze(root: Path, top: int = 10) -> Dict[str, object]:
+    names = build_guid_index(root, NAMED_SUFFIXES)
+    parser = SceneParser(root, names, sprite_atlases(root, names))
+    ranks = sorting_layer_ranks(root)
+
+    scenes = []
+    totals: Counter[Tuple[str, str, str]] = Counter()
+    scene_hits: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    for path in sorted(walk_project(root)):
+        if path.suffix != ".unity":
+            continue
+        relative = path.relative_to(root).as_posix()
+        result = simulate(parser.parse(path), ranks)
+        switches: Counter[Tuple[str, str, str]] = result.pop("switches")
+        totals.update(switches)
+        for (cause, first, second), count in switches.items():
+            for key in (first, second):
+                scene_hits[(cause, key)].add(relative)
+        causes = {cause: 0 for cause in BREAK_CAUSES}
+        for (cause, _, _), count in switches.items():
+            causes[cause] += count
+        result["breaks_by_cause"] = causes
+        result["top_switches"] = [
+            {"cause": cause, "from": describe(first, names), "to": describe(second, names), "breaks": count}
+            for (cause, first, second), count in switches.most_common(top)
+        ]
+        scenes.append({"scene": relative, **result})
+
+    involvement: Dict[str, Counter[str]] = {"texture": Counter(), "material": Counter()}
+    for (cause, first, second), count in totals.items():
+        if cause in involvement:
+            involvement[cause][first] += count
+            involvement[cause][second] += count
+
+    def ranked(cause: str) -> List[Dict[str, object]]:
+        return [
+            {"asset": describe(key, names), "breaks": count, "scenes": len(scene_hits[(cause, key)])}
+            for key, count in involvement[cause].most_common(top)
+            if not key.startswith("builtin:") and key not in ("white", "default", "ui-default", "")
+        ]
+
+    scenes.sort(key=lambda row: -row["breaks"])
+    return {
+        "scenes": scenes,
+        "prefabs_parsed": len(parser.prefabs),
+        "atlas_candidates": ranked("texture"),
+        "material_candidates": ranked("material"),
+    }
+
+
+def render_markdown(report: Dict[str, object]) -> str:
+    lines = [
+        "| Scene | Renderers | World batches | UI batches | Breaks | Material | Texture |",
+        "| --- | --- | --- | --- | --- | --- | --- |",
+    ]
+    for scene in report["scenes"]:
+        if not scene["renderers"]:
+            continue
+        ui_batches = sum(row["batches"] for row in scene["canvases"])
+        causes = scene["breaks_by_cause"]
+        lines.append(
+            f"| {scene['scene']} | {sum(scene['renderers'].values())} | {scene['world']['batches']} | "
+            f"{ui_batches} | {scene['breaks']} | {causes['material']} | {causes['texture']} |"
+        )
+    for title, key in (("Textures to atlas", "atlas_candidates"), ("Materials to share", "material_candidates")):
+        if report[key]:
+            lines += ["", f"**{title}**", "", "| Asset | Breaks | Scenes |", "| --- | --- | --- |"]
+            lines += [f"| {row['asset']} | {row['breaks']} | {row['scenes']} |" for row in report[key]]
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate 2D batch breaks per Unity scene.")
+    parser.add_argument("--root", default=".", help="Project root directory (default: current).")
+    parser.add_argument("--output", help="Optional JSON output file.")
+    parser.add_argument("--markdown", action="store_true", help="Print a markdown summary.")
+    parser.add_argument("--top", type=int, default=10, help="Switches and candidates to list (default: 10).")
+    args = parser.parse_args()
+
+    report = analyze(Path(args.root).resolve(), top=args.top)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.markdown:
+        print(render_markdown(report))
+    elif not args.output:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
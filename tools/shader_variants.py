@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Estimate shader variant counts from multi_compile/shader_feature pragmas.
+
+Every CGPROGRAM/HLSLPROGRAM block of a ``.shader`` is treated as one pass.
+Its keyword sets come from the block itself, the shader's CGINCLUDE/HLSLINCLUDE
+blocks and every file reachable through ``#include``. The include graph is
+parsed once per file and cached.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from metrics_common import walk_project
+
+SHADER_EXTENSIONS = {".shader", ".hlsl", ".cginc", ".compute"}
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/|//[^\n]*", re.DOTALL)
+PRAGMA_PATTERN = re.compile(
+    r"^[ \t]*#pragma[ \t]+(?P<directive>multi_compile|shader_feature|dynamic_branch)(?P<suffix>\w*)(?P<keywords>[^\n]*)",
+    re.MULTILINE,
+)
+INCLUDE_PATTERN = re.compile(r'^[ \t]*#include(?:_with_pragmas)?[ \t]+"(?P<path>[^"]+)"', re.MULTILINE)
+PROGRAM_PATTERN = re.compile(r"\b(?P<kind>CG|HLSL)(?P<role>PROGRAM|INCLUDE)\b(?P<body>.*?)\bEND(?:CG|HLSL)\b", re.DOTALL)
+SHADER_NAME_PATTERN = re.compile(r'^\s*Shader\s+"(?P<name>[^"]+)"', re.MULTILINE)
+PASS_NAME_PATTERN = re.compile(r'\bName\s+"(?P<name>[^"]+)"')
+PASS_PATTERN = re.compile(r"\bPass\s*\{")
+
+# Built-in multi_compile shortcuts and the number of variants each expands to.
+BUILTIN_SHORTCUTS = {
+    "_fog": 4,
+    "_instancing": 2,
+    "_particles": 2,
+    "_shadowcaster": 2,
+    "_fwdbase": 12,
+    "_fwdadd": 5,
+    "_fwdadd_fullshadows": 10,
+    "_fwdbasealpha": 12,
+    "_lightpass": 5,
+    "_prepassfinal": 6,
+}
+
+# Stage-specific suffixes that keep the directive's normal keyword semantics.
+STAGE_SUFFIXES = ("_local", "_vertex", "_fragment", "_hull", "_domain", "_geometry", "_raytracing")
+
+
+@dataclass(frozen=True)
+class KeywordSet:
+    directive: str
+    keywords: Tuple[str, ...]
+    source: str
+
+    @property
+    def size(self) -> int:
+        return len(self.keywords)
+
+
+@dataclass
+class ParsedFile:
+    keyword_sets: List[KeywordSet] = field(default_factory=list)
+    includes: List[str] = field(default_factory=list)
+
+
+def strip_comments(text: str) -> str:
+    return COMMENT_PATTERN.sub(lambda m: "\n" * m.group(0).count("\n"), text)
+
+
+def parse_keyword_sets(text: str, source: str) -> List[KeywordSet]:
+    sets: List[KeywordSet] = []
+    for match in PRAGMA_PATTERN.finditer(text):
+        directive, suffix = match.group("directive"), match.group("suffix")
+        if directive == "dynamic_branch":
+            # dynamic branches are evaluated at runtime and add no variants
+            continue
+        keywords = tuple(match.group("keywords").split())
+        if suffix in BUILTIN_SHORTCUTS:
+            keywords = tuple(f"{directive}{suffix}#{index}" for index in range(BUILTIN_SHORTCUTS[suffix]))
+        elif suffix and not suffix.startswith(STAGE_SUFFIXES):
+            continue
+        if directive == "shader_feature" and len(keywords) == 1:
+            # ``shader_feature FOO`` implies an off variant
+            keywords = ("_",) + keywords
+        if len(keywords) > 1:
+            sets.append(KeywordSet(directive=directive, keywords=keywords, source=source))
+    return sets
+
+
+class IncludeGraph:
+    """Parses each shader source once and resolves ``#include`` paths against the project."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.parsed: Dict[Path, ParsedFile] = {}
+        self.edges: Dict[Path, List[Path]] = {}
+        self.closures: Dict[Path, Tuple[Path, ...]] = {}
+        self.external: Set[str] = set()
+
+    def relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def resolve(self, include: str, including: Path) -> Optional[Path]:
+        for candidate in (including.parent / include, self.root / include, self.root / "Assets" / include):
+            if candidate.is_file():
+                return candidate.resolve()
+        self.external.add(include)
+        return None
+
+    def parse(self, path: Path, text: Optional[str] = None) -> ParsedFile:
+        if path in self.parsed:
+            return self.parsed[path]
+        if text is None:
+            text = strip_comments(path.read_text(encoding="utf-8", errors="ignore"))
+        parsed = ParsedFile(
+            keyword_sets=parse_keyword_sets(text, self.relative(path)),
+            includes=INCLUDE_PATTERN.findall(text),
+        )
+        self.parsed[path] = parsed
+        return parsed
+
+    def direct_includes(self, path: Path, includes: List[str]) -> List[Path]:
+        if path not in self.edges:
+            resolved = [self.resolve(include, path) for include in includes]
+            self.edges[path] = [target for target in resolved if target is not None]
+        return self.edges[path]
+
+    def closure(self, path: Path) -> Tuple[Path, ...]:
+        """All files transitively included from ``path`` (excluding itself), memoized."""
+        if path in self.closures:
+            return self.closures[path]
+        self.closures[path] = ()  # guards include cycles
+        seen: Dict[Path, None] = {}
+        for target in self.direct_includes(path, self.parse(path).includes):
+            seen.setdefault(target, None)
+            for nested in self.closure(target):
+                seen.setdefault(nested, None)
+        seen.pop(path, None)
+        self.closures[path] = tuple(seen)
+        return self.closures[path]
+
+    def program_closure(self, shader: Path, includes: List[str]) -> Tuple[Path, ...]:
+        seen: Dict[Path, None] = {}
+        for include in includes:
+            target = self.resolve(include, shader)
+            if target is None:
+                continue
+            seen.setdefault(target, None)
+            for nested in self.closure(target):
+                seen.setdefault(nested, None)
+        return tuple(seen)
+
+
+def pass_names(text: str) -> List[Tuple[int, str]]:
+    """(offset, name) for each ``Pass {`` block, in source order."""
+    names = []
+    for index, match in enumerate(PASS_PATTERN.finditer(text)):
+        name_match = PASS_NAME_PATTERN.search(text, match.end(), match.end() + 400)
+        names.append((match.start(), name_match.group("name") if name_match else f"Pass {index}"))
+    return names
+
+
+def analyze_shader(path: Path, graph: IncludeGraph) -> Dict[str, object]:
+    text = strip_comments(path.read_text(encoding="utf-8", errors="ignore"))
+    name_match = SHADER_NAME_PATTERN.search(text)
+    passes = pass_names(text)
+    programs = list(PROGRAM_PATTERN.finditer(text))
+    shared_text = "\n".join(m.group("body") for m in programs if m.group("role") == "INCLUDE")
+    shared_sets = parse_keyword_sets(shared_text, graph.relative(path))
+    shared_includes = INCLUDE_PATTERN.findall(shared_text)
+
+    pass_reports = []
+    for program in (m for m in programs if m.group("role") == "PROGRAM"):
+        body = program.group("body")
+        enclosing = [name for offset, name in passes if offset < program.start()]
+        if "#pragma surface" in body:
+            label = "surface"
+        else:
+            label = enclosing[-1] if enclosing else f"Program {len(pass_reports)}"
+        includes = shared_includes + INCLUDE_PATTERN.findall(body)
+        included = graph.program_closure(path, includes)
+        keyword_sets: Dict[Tuple[str, Tuple[str, ...]], KeywordSet] = {}
+        for keyword_set in shared_sets + parse_keyword_sets(body, graph.relative(path)):
+            keyword_sets.setdefault((keyword_set.directive, keyword_set.keywords), keyword_set)
+        for include_path in included:
+            for keyword_set in graph.parse(include_path).keyword_sets:
+                keyword_sets.setdefault((keyword_set.directive, keyword_set.keywords), keyword_set)
+
+        sets = list(keyword_sets.values())
+        variants = reduce(lambda acc, item: acc * item.size, sets, 1)
+        always = reduce(lambda acc, item: acc * item.size, (s for s in sets if s.directive == "multi_compile"), 1)
+        pass_reports.append(
+            {
+                "pass": label,
+                "variants": variants,
+                "multi_compile_variants": always,
+                "keyword_sets": [
+                    {
+                        "directive": item.directive,
+                        "keywords": list(item.keywords),
+                        "source": item.source,
+                        # variants that would disappear if this set were removed
+                        "contribution": variants - variants // item.size,
+                    }
+                    for item in sets
+                ],
+                "includes": [graph.relative(p) for p in included],
+            }
+        )
+
+    return {
+        "file": graph.relative(path),
+        "shader": name_match.group("name") if name_match else path.stem,
+        "variants": sum(p["variants"] for p in pass_reports),
+        "multi_compile_variants": sum(p["multi_compile_variants"] for p in pass_reports),
+        "passes": pass_reports,
+    }
+
+
+def collect(root: Path, top: int = 10) -> Dict[str, object]:
+    root = root.resolve()
+    graph = IncludeGraph(root)
+    shaders = []
+    include_sources = 0
+    for path in walk_project(root):
+        suffix = path.suffix.lower()
+        if suffix not in SHADER_EXTENSIONS:
+            continue
+        if suffix == ".shader":
+            shaders.append(analyze_shader(path.resolve(), graph))
+        else:
+            include_sources += 1
+    shaders.sort(key=lambda item: (-item["variants"], item["file"]))
+
+    contributors: Dict[Tuple[str, str], int] = {}
+    include_fan_in: Dict[str, int] = {}
+    for shader in shaders:
+        for report in shader["passes"]:
+            for keyword_set in report["keyword_sets"]:
+                key = (" ".join(keyword_set["keywords"]), keyword_set["source"])
+                contributors[key] = contributors.get(key, 0) + keyword_set["contribution"]
+            for include in report["includes"]:
+                include_fan_in[include] = include_fan_in.get(include, 0) + 1
+    ranked = sorted(contributors.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    return {
+        "totals": {
+            "shaders": len(shaders),
+            "include_sources": include_sources,
+            "passes": sum(len(s["passes"]) for s in shaders),
+            "variants": sum(s["variants"] for s in shaders),
+            "multi_compile_variants": sum(s["multi_compile_variants"] for s in shaders),
+        },
+        "top_keyword_sets": [
+            {"keywords": keywords, "source": source, "variants_added": added}
+            for (keywords, source), added in ranked[:top]
+        ],
+        "include_fan_in": dict(sorted(include_fan_in.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "external_includes": sorted(graph.external),
+        "shaders": shaders,
+    }
+
+
+def render_markdown(data: Dict[str, object], limit: Optional[int] = None) -> str:
+    totals = data["totals"]
+    lines = [
+        f"- Shaders: {totals['shaders']} ({totals['passes']} passes)",
+        f"- Variants (upper bound): {totals['variants']:,}",
+        f"- multi_compile variants (never stripped): {totals['multi_compile_variants']:,}",
+        "",
+        "| Shader | File | Passes | Variants | multi_compile |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for shader in data["shaders"][:limit]:
+        lines.append(
+            f"| {shader['shader']} | {shader['file']} | {len(shader['passes'])} | "
+            f"{shader['variants']:,} | {shader['multi_compile_variants']:,} |"
+        )
+    lines.extend(["", "| Keyword set | Declared in | Variants added |", "| --- | --- | --- |"])
+    for row in data["top_keyword_sets"]:
+        lines.append(f"| {row['keywords']} | {row['source']} | {row['variants_added']:,} |")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate shader variant counts per shader and pass.")
+    parser.add_argument("--root", default=".", help="Project root directory (default: current).")
+    parser.add_argument("--output", help="Optional JSON output file.")
+    parser.add_argument("--markdown", action="store_true", help="Render markdown tables.")
+    parser.add_argument("--top", type=int, default=10, help="Number of top keyword sets/shaders to list.")
+    args = parser.parse_args()
+
+    data = collect(Path(args.root), top=args.top)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if args.markdown:
+        print(render_markdown(data, limit=args.top))
+    elif not args.output:
+        print(json.dumps(data, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Single ``unity-metrics`` entry point for the Unity C# metrics tools.
+
+The ``loc``, ``functions``, ``classes`` and ``assets`` subcommands mirror the
+standalone scripts, while ``full`` produces all four reports from one walk of
+the project, reading and parsing each C# file once. Tool modules and heavy
+dependencies such as lizard are imported only by the subcommand that needs
+them, and ``startup`` measures cold start time of this and the legacy scripts.
+"""
+from __future__ import annotations
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent
+LEGACY_SCRIPTS = ["loc_metrics.py", "function_metrics.py", "class_count.py", "asset_inventory.py"]
+
+
+class Timings:
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.mark = time.perf_counter()
+        if enabled:
+            self.report("startup", _STARTED)
+
+    def phase(self, name: str) -> None:
+        if self.enabled:
+            self.report(name, self.mark)
+        self.mark = time.perf_counter()
+
+    @staticmethod
+    def report(name: str, since: float) -> None:
+        print(f"[timing] {name}: {(time.perf_counter() - since) * 1000:.1f} ms", file=sys.stderr)
+
+
+def emit(data: object, output: Optional[str], markdown: bool, render: Callable[[], str]) -> None:
+    if output:
+        Path(output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    if markdown:
+        print(render())
+    elif not output:
+        print(json.dumps(data, indent=2))
+
+
+def run_loc(args: argparse.Namespace, timings: Timings) -> None:
+    import loc_metrics
+
+    data = loc_metrics.collect_metrics(Path(args.root))
+    timings.phase("loc")
+    emit(data, args.output, args.markdown, lambda: loc_metrics.render_markdown(data))
+
+
+def run_functions(args: argparse.Namespace, timings: Timings) -> None:
+    import function_metrics
+
+    if args.approx:
+        data = function_metrics.approximate_functions(Path(args.root), args.error, args.confidence, args.seed)
+        timings.phase("functions")
+        emit(data, args.output, args.markdown, lambda: function_metrics.render_approx_markdown(data))
+        return
+    data = function_metrics.analyze_functions(
+        Path(args.root), top=args.top or function_metrics.DEFAULT_TOP, keep_functions=not args.summary_only
+    )
+    timings.phase("functions")
+    emit(data, args.output, args.markdown, lambda: function_metrics.render_markdown(data, limit=args.top))
+
+
+def run_classes(args: argparse.Namespace, timings: Timings) -> None:
+    import class_count
+
+    data = class_count.collect(Path(args.root))
+    timings.phase("classes")
+    emit(data, args.output, args.markdown, lambda: class_count.render_markdown(data))
+
+
+def run_assets(args: argparse.Namespace, timings: Timings) -> None:
+    import asset_inventory
+
+    assets_dir = Path(args.root) / "Assets"
+    if not assets_dir.is_dir():
+        raise SystemExit(f"Assets directory not found: {assets_dir}")
+    if args.memory:
+        data = asset_inventory.estimate_asset_memory(assets_dir, platform=args.platform, top=args.top)
+        render = asset_inventory.render_memory_markdown
+    else:
+        data = asset_inventory.enumerate_assets(assets_dir)
+        render = asset_inventory.render_markdown
+    timings.phase("assets")
+    emit(data, args.output, args.markdown, lambda: render(data))
+
+
+def run_shaders(args: argparse.Namespace, timings: Timings) -> None:
+    import shader_variants
+
+    data = shader_variants.collect(Path(args.root), top=args.top)
+    timings.phase("shaders")
+    emit(data, args.output, args.markdown, lambda: shader_variants.render_markdown(data, limit=args.top))
+
+
+def run_batching(args: argparse.Namespace, timings: Timings) -> None:
+    import scene_batching
+
+    data = scene_batching.analyze(Path(args.root).resolve(), top=args.top)
+    timings.phase("batching")
+    emit(data, args.output, args.markdown, lambda: scene_batching.render_markdown(data))
+
+
+def run_footprint(args: argparse.Namespace, timings: Timings) -> None:
+    import monobehaviour_footprint
+
+    data = monobehaviour_footprint.analyze(Path(args.root).resolve(), top=args.top)
+    timings.phase("footprint")
+    emit(data, args.output, args.markdown, lambda: monobehaviour_footprint.render_markdown(data))
+
+
+def run_regex_bench(args: argparse.Namespace, timings: Timings) -> None:
+    from dataclasses import asdict
+
+    import regex_bench
+
+    results = regex_bench.run(args.size, args.limit)
+    timings.phase("regex-bench")
+    emit([asdict(row) for row in results], args.output, args.markdown, lambda: regex_bench.render_markdown(results))
+    regex_bench.check(results)
+
+
+def run_readme(args: argparse.Namespace, timings: Timings) -> None:
+    import readme_sections
+
+    timings.phase("imports")
+    readme_sections.run(args)
+    timings.phase("readme")
+
+
+def run_asmdef(args: argparse.Namespace, timings: Timings) -> None:
+    import asmdef_impact
+
+    data = asmdef_impact.analyze(Path(args.root).resolve(), since=args.since, top=args.top)
+    timings.phase("asmdef")
+    emit(data, args.output, args.markdown, lambda: asmdef_impact.render_markdown(data))
+
+
+def run_compare(args: argparse.Namespace, timings: Timings) -> None:
+    import metrics_gate
+
+    status = metrics_gate.run(
+        Path(args.baseline), Path(args.current), Path(args.budget) if args.budget else None, args.output
+    )
+    timings.phase("compare")
+    raise SystemExit(status)
+
+
+def run_serve(args: argparse.Namespace, timings: Timings) -> None:
+    import metrics_server
+
+    metrics_path = Path(args.metrics).resolve() if args.metrics else None
+    timings.phase("imports")
+    metrics_server.serve(metrics_path, None if metrics_path else Path(args.root).resolve(), args.port, args.poll)
+
+
+def collect_full(root: Path, timings: Timings, top: int, keep_functions: bool = True) -> Dict[str, object]:
+    """Build the loc, functions, classes and assets reports from a single walk."""
+    from collections import defaultdict
+
+    import lizard
+
+    import asset_inventory
+    import class_count
+    import function_metrics
+    import loc_metrics
+    from metrics_common import walk_project
+
+    timings.phase("imports")
+    loc_rows: List[dict] = []
+    functions = function_metrics.FunctionSummary(top=top, keep_functions=keep_functions)
+    class_totals = {"class": 0, "struct": 0, "interface": 0, "record": 0}
+    class_files: Dict[str, List[str]] = defaultdict(list)
+    asset_counts = asset_inventory.empty_counts()
+    meta_cache: Dict[Path, str] = {}
+
+    for path in walk_project(root):
+        relative = path.relative_to(root)
+        if relative.parts[0] == "Assets":
+            asset_inventory.count_asset(path, asset_counts, meta_cache)
+        if path.suffix != ".cs":
+            continue
+        data = path.read_bytes()
+        # lizard strips a UTF-8 BOM when reading files itself; match it so nloc agrees.
+        text = data.decode("utf-8-sig", errors="ignore")
+        analysis = lizard.analyze_file.analyze_source_code(str(path), text)
+        rel = relative.as_posix()
+        loc_rows.append(loc_metrics.line_metrics(rel, loc_metrics.classify_lines(data)))
+        functions.extend(function_metrics.function_records(rel, analysis))
+        class_count.record_declarations(path.as_posix(), text, class_totals, class_files)
+    timings.phase("walk")
+
+    class_totals["types_total"] = sum(class_totals.values())
+    return {
+        "loc": loc_metrics.summarize_files(loc_rows),
+        "functions": functions.result(),
+        "classes": {"totals": class_totals, "files": class_files},
+        "assets": asset_counts,
+    }
+
+
+def run_full(args: argparse.Namespace, timings: Timings) -> None:
+    import asset_inventory
+    import class_count
+    import function_metrics
+    import loc_metrics
+
+    root = Path(args.root)
+    if not root.is_dir():
+        raise SystemExit(f"Root path not found: {root}")
+    reports = collect_full(root, timings, top=args.top, keep_functions=not args.summary_only)
+    timings.phase("summaries")
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_names = {
+            "loc": "loc_metrics.json",
+            "functions": "function_metrics.json",
+            "classes": "class_counts.json",
+            "assets": "asset_counts.json",
+        }
+        for key, name in file_names.items():
+            (output_dir / name).write_text(json.dumps(reports[key], indent=2), encoding="utf-8")
+    if args.markdown:
+        sections = [
+            ("Lines of Code", loc_metrics.render_markdown(reports["loc"])),
+            ("Function Metrics", function_metrics.render_markdown(reports["functions"], limit=args.top)),
+            ("Type Declarations", class_count.render_markdown(reports["classes"])),
+            ("Unity Assets", asset_inventory.render_markdown(reports["assets"])),
+        ]
+        print("\n\n".join(f"### {title}\n\n{table}" for title, table in sections))
+    elif not args.output_dir:
+        print(json.dumps(reports, indent=2))
+
+
+def run_startup(args: argparse.Namespace, timings: Timings) -> None:
+    import statistics
+    import subprocess
+
+    commands = {
+        "python (baseline)": [sys.executable, "-c", "pass"],
+        "unity_metrics.py": [sys.executable, str(TOOLS_DIR / "unity_metrics.py"), "--help"],
+    }
+    for script in LEGACY_SCRIPTS:
+        commands[script] = [sys.executable, str(TOOLS_DIR / script), "--help"]
+
+    results = {}
+    for label, command in commands.items():
+        samples = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            samples.append((time.perf_counter() - started) * 1000)
+        results[label] = {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+    timings.phase("startup benchmark")
+
+    if args.markdown:
+        print("| Command | Median (ms) | Min (ms) |")
+        print("| --- | --- | --- |")
+        for label, row in results.items():
+            print(f"| {label} | {row['median_ms']:.1f} | {row['min_ms']:.1f} |")
+    else:
+        print(json.dumps(results, indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="unity-metrics", description="Unity C# project metrics.")
+    parser.add_argument("--timings", action="store_true", help="Report startup and phase timings to stderr.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--root", default=".", help="Project root directory (default: current).")
+        sub.add_argument("--markdown", action="store_true", help="Render markdown instead of JSON.")
+
+    loc = subparsers.add_parser("loc", help="LOC metrics per C# file.")
+    add_common(loc)
+    loc.add_argument("--output", help="Optional JSON output file.")
+    loc.set_defaults(handler=run_loc)
+
+    functions = subparsers.add_parser("functions", help="Per-function LOC and cyclomatic complexity.")
+    add_common(functions)
+    functions.add_argument("--output", help="Optional JSON output file.")
+    functions.add_argument("--top", type=int, help="Limit markdown output to top N functions by CCN.")
+    functions.add_argument(
+        "--summary-only", action="store_true", help="Keep only the summary and top N functions (bounded memory)."
+    )
+    functions.add_argument("--approx", action="store_true", help="Estimate the summary from a file sample.")
+    functions.add_argument("--error", type=float, default=0.05, help="Relative error bound for --approx.")
+    functions.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --approx.")
+    functions.add_argument("--seed", type=int, default=0, help="Sampling seed for --approx.")
+    functions.set_defaults(handler=run_functions)
+
+    classes = subparsers.add_parser("classes", help="Type declaration counts.")
+    add_common(classes)
+    classes.add_argument("--output", help="Optional JSON output file.")
+    classes.set_defaults(handler=run_classes)
+
+    assets = subparsers.add_parser("assets", help="Unity asset type counts.")
+    add_common(assets)
+    assets.add_argument("--output", help="Optional JSON output file.")
+    assets.add_argument("--memory", action="store_true", help="Estimate texture/audio runtime memory instead.")
+    assets.add_argument("--platform", default="Standalone", help="Build target for import overrides.")
+    assets.add_argument("--top", type=int, default=20, help="Worst offenders listed by --memory.")
+    assets.set_defaults(handler=run_assets)
+
+    shaders = subparsers.add_parser("shaders", help="Shader variant counts per shader and pass.")
+    add_common(shaders)
+    shaders.add_argument("--output", help="Optional JSON output file.")
+    shaders.add_argument("--top", type=int, default=10, help="Top shaders and keyword sets to list.")
+    shaders.set_defaults(handler=run_shaders)
+
+    batching = subparsers.add_parser("batching", help="Estimated 2D batch breaks per scene and atlas candidates.")
+    add_common(batching)
+    batching.add_argument("--output", help="Optional JSON output file.")
+    batching.add_argument("--top", type=int, default=10, help="Switches and candidates to list (default: 10).")
+    batching.set_defaults(handler=run_batching)
+
+    footprint = subparsers.add_parser("footprint", help="Per-scene MonoBehaviour instances and deserialization cost.")
+    add_common(footprint)
+    footprint.add_argument("--output", help="Optional JSON output file.")
+    footprint.add_argument("--top", type=int, default=5, help="Heaviest scripts to list per scene (default: 5).")
+    footprint.set_defaults(handler=run_footprint)
+
+    asmdef = subparsers.add_parser("asmdef", help="Assembly sizes, recompile blast radius and split suggestions.")
+    add_common(asmdef)
+    asmdef.add_argument("--output", help="Optional JSON output file.")
+    asmdef.add_argument("--since", help="Only count churn from commits after this date (git --since).")
+    asmdef.add_argument("--top", type=int, default=10, help="Number of split suggestions to list.")
+    asmdef.set_defaults(handler=run_asmdef)
+
+    compare = subparsers.add_parser("compare", help="Diff two analyze_code_metrics.py outputs against a budget.")
+    compare.add_argument("baseline", help="Baseline analyze_code_metrics.py JSON output.")
+    compare.add_argument("current", help="Current analyze_code_metrics.py JSON output.")
+    compare.add_argument("--budget", help="JSON or YAML budget file (default: built-in budget).")
+    compare.add_argument("--output", help="Optional JSON file for the full diff.")
+    compare.set_defaults(handler=run_compare)
+
+    serve = subparsers.add_parser("serve", help="Serve metrics lookups as HTTP/JSON on localhost.")
+    serve_source = serve.add_mutually_exclusive_group()
+    serve_source.add_argument("--metrics", help="analyze_code_metrics.py JSON output to serve.")
+    serve_source.add_argument("--root", default=".", help="Project root to analyze when --metrics is not given.")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765).")
+    serve.add_argument("--poll", type=float, default=2.0, help="Seconds between change checks (default: 2).")
+    serve.set_defaults(handler=run_serve)
+
+    bench = subparsers.add_parser("regex-bench", help="Time the C# scanners on pathological inputs.")
+    bench.add_argument("--size", type=int, default=64 * 1024, help="Base input size in bytes (default: 64 KiB).")
+    bench.add_argument("--limit", type=float, default=2.0, help="Seconds allowed per input (default: 2).")
+    bench.add_argument("--markdown", action="store_true", help="Render a markdown table.")
+    bench.add_argument("--output", help="Optional JSON output file.")
+    bench.set_defaults(handler=run_regex_bench)
+
+    readme = subparsers.add_parser("readme", help="Rewrite marked README sections from saved JSON reports.")
+    readme.add_argument("--readme", default="README.md", help="Markdown file to update (default: README.md).")
+    readme.add_argument("--metrics-dir", default="metrics", help="Directory of JSON reports (default: metrics).")
+    readme.add_argument("--top", type=int, default=5, help="Top N functions to list (default: 5).")
+    readme.add_argument("--force", action="store_true", help="Re-render sections even when inputs are unchanged.")
+    readme.add_argument("--check", action="store_true", help="Exit 1 if any section is stale instead of writing.")
+    readme.set_defaults(handler=run_readme)
+
+    full = subparsers.add_parser("full", help="LOC, function, class and asset reports from a single project walk.")
+    add_common(full)
+    full.add_argument("--output-dir", help="Directory to write the four JSON reports into.")
+    full.add_argument("--top", type=int, default=5, help="Top N functions in markdown output (default: 5).")
+    full.add_argument(
+        "--summary-only", action="store_true", help="Keep only the summary and top N functions (bounded memory)."
+    )
+    full.set_defaults(handler=run_full)
+
+    startup = subparsers.add_parser("startup", help="Measure cold start time of the CLI and legacy scripts.")
+    startup.add_argument("--runs", type=int, default=5, help="Runs per command (default: 5).")
+    startup.add_argument("--markdown", action="store_true", help="Render a markdown table.")
+    startup.set_defaults(handler=run_startup)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    timings = Timings(args.timings)
+    args.handler(args, timings)
+
+
+if __name__ == "__main__":
+    main()